@@ -1,6 +1,7 @@
 "use server";
 
 import { createClient } from "@/lib/supabase/server";
+import { removeDocumentFile } from "@/lib/storage/documents";
 import { revalidatePath } from "next/cache";
 
 /**
@@ -418,16 +419,9 @@ export async function deleteDocument(
         .eq("id", candidate.id);
     }
   } else {
-    // Delete from storage
+    // Delete from storage (kept if shared); soft delete even if that fails
     if (doc.file_path) {
-      const { error: storageError } = await supabase.storage
-        .from("documents")
-        .remove([doc.file_path]);
-
-      if (storageError) {
-        console.error("Storage delete error:", storageError);
-        // Continue with soft delete even if storage fails
-      }
+      await removeDocumentFile(supabase, doc.file_path, documentId);
     }
 
     // Soft delete the document
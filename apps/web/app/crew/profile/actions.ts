@@ -1,6 +1,7 @@
 "use server";
 
 import { createClient } from "@/lib/supabase/server";
+import { removeDocumentFile } from "@/lib/storage/documents";
 import { revalidatePath } from "next/cache";
 import { syncCandidateUpdate, syncDocumentUpload } from "@/lib/vincere/sync-service";
 import type { Candidate } from "../../../../../packages/database/types";
@@ -1101,9 +1102,9 @@ export async function deleteTattooImage(documentId: string): Promise<{
     return { success: false, error: "Not a tattoo image document" };
   }
 
-  // Delete from storage
+  // Delete from storage (kept if another document shares the file)
   if (doc.file_path) {
-    await supabase.storage.from("documents").remove([doc.file_path]);
+    await removeDocumentFile(supabase, doc.file_path, doc.id);
   }
 
   // Delete from database
@@ -1,3 +1,4 @@
+import type { SupabaseClient } from "@supabase/supabase-js";
 import { createClient } from "@/lib/supabase/server";
 
 // Document types
@@ -253,6 +254,44 @@ export async function getDocuments(
   }
 }
 
+/**
+ * Remove a document's file from storage, unless another live document
+ * points at the same object (imports dedupe identical files into one).
+ *
+ * If the shared-file check fails (e.g. migration 081 not applied) the file
+ * is kept: a leftover object is harmless, deleting a shared one breaks the
+ * other documents. Callers still delete the record either way.
+ */
+export async function removeDocumentFile(
+  supabase: SupabaseClient,
+  filePath: string,
+  documentId: string
+): Promise<void> {
+  const { data: isShared, error: sharedError } = await supabase.rpc(
+    "is_document_file_shared",
+    {
+      p_file_path: filePath,
+      p_document_id: documentId,
+    }
+  );
+
+  if (sharedError) {
+    console.error("Shared file check error, keeping storage object:", sharedError);
+    return;
+  }
+  if (isShared !== false) {
+    return;
+  }
+
+  const { error: storageError } = await supabase.storage
+    .from(BUCKET_NAME)
+    .remove([filePath]);
+
+  if (storageError) {
+    console.error("Storage delete error:", storageError);
+  }
+}
+
 /**
  * Delete a document
  */
@@ -273,15 +312,8 @@ export async function deleteDocument(
       return { success: false, error: "Document not found" };
     }
 
-    // Delete from storage
-    const { error: storageError } = await supabase.storage
-      .from(BUCKET_NAME)
-      .remove([doc.file_path]);
-
-    if (storageError) {
-      console.error("Storage delete error:", storageError);
-      // Continue to soft delete the record even if storage fails
-    }
+    // Delete from storage (kept if shared); soft delete the record even if that fails
+    await removeDocumentFile(supabase, doc.file_path, doc.id);
 
     // Soft delete the record
     const { error: dbError } = await supabase
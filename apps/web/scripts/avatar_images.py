@@ -0,0 +1,72 @@
+"""
+Avatar image normalization for the Bubble avatars import
+
+Bubble avatars are often multi-megabyte camera originals. normalize_avatar()
+decodes one, applies and then drops its EXIF data (orientation, GPS, camera
+details), and re-encodes it as WebP at a few fixed sizes:
+
+    AVATAR_SIZES = {"": 512, "256": 256, "128": 128}
+
+The "" variant is the one stored as photo_url; the others are uploaded next
+to it with the size as a suffix (avatar_256.webp, avatar_128.webp). Images
+are only ever shrunk, never enlarged.
+
+Decoding and resizing are CPU-bound, so the import runs normalize_avatar() on
+a process pool (it is a plain module-level function of bytes, so it pickles).
+
+Pillow is optional: when it is not installed, images_available() returns
+False and the import uploads originals unchanged, as before.
+"""
+
+import io
+from typing import Dict
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional dependency
+    Image = None
+    ImageOps = None
+
+AVATAR_SIZES = {"": 512, "256": 256, "128": 128}  # Variant suffix → longest side in px
+AVATAR_FORMAT = "WEBP"
+AVATAR_CONTENT_TYPE = "image/webp"
+AVATAR_EXTENSION = ".webp"
+WEBP_QUALITY = 80
+
+
+def images_available() -> bool:
+    return Image is not None
+
+
+def variant_path(storage_path: str, suffix: str) -> str:
+    """'abc/avatar.webp' + '256' → 'abc/avatar_256.webp'"""
+    if not suffix:
+        return storage_path
+    stem, dot, extension = storage_path.rpartition(".")
+    return f"{stem}_{suffix}{dot}{extension}"
+
+
+def normalize_avatar(data: bytes) -> Dict[str, bytes]:
+    """Decode an image and re-encode it as WebP at each of AVATAR_SIZES
+
+    Returns {variant suffix: encoded bytes}. Raises on data Pillow can't
+    decode; callers fall back to uploading the original.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed (pip install Pillow)")
+
+    largest = max(AVATAR_SIZES.values())
+    with Image.open(io.BytesIO(data)) as img:
+        # JPEGs can be decoded at a reduced scale, far cheaper than a full decode
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+    variants = {}
+    for suffix, size in sorted(AVATAR_SIZES.items(), key=lambda item: -item[1]):
+        img.thumbnail((size, size), Image.LANCZOS)  # Successive shrinks, largest first
+        out = io.BytesIO()
+        # No exif= argument: the encoded file carries no metadata
+        img.save(out, AVATAR_FORMAT, quality=WEBP_QUALITY, method=4)
+        variants[suffix] = out.getvalue()
+    return variants
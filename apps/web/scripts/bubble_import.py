@@ -10,7 +10,7 @@ Run: cd apps/web && python3 scripts/bubble_import.py
 Features:
 - Checkpoint-based resumability (saves progress every 100 candidates)
 - Loads Vincere email→ID mapping from CSV + API
-- Batch upserts to Supabase
+- Batch upserts to Supabase (bulk_upsert_bubble_candidates, migration 080)
 - Detailed progress logging
 
 Requirements:
@@ -37,22 +37,33 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("ERROR: requests package not installed. Run: pip install requests")
     sys.exit(1)
 
+# Shared Vincere helpers live in the repo-level scripts/ folder
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from vincere_client import AUTH_URL, AdaptiveRateLimiter, MAX_RATE_LIMIT_RETRIES, get_token_store  # noqa: E402
+from candidate_index import CandidateIndex  # noqa: E402
+from csv_resume import ResumableCSVReader  # noqa: E402
+from profiling import AUTH, DB_READ, DB_WRITE, MAPPING, SEARCH, add_profile_argument, phase, start_profile  # noqa: E402
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / "data"
-CHECKPOINT_FILE = SCRIPT_DIR / ".bubble-import-checkpoint.json"
-VINCERE_MAP_FILE = SCRIPT_DIR / ".bubble-import-vincere-map.json"
-ERROR_LOG_FILE = SCRIPT_DIR / ".bubble-import-errors.json"
+# Checkpoint, Vincere map and error log go here (BUBBLE_IMPORT_STATE_DIR to relocate)
+STATE_DIR = Path(os.getenv("BUBBLE_IMPORT_STATE_DIR") or SCRIPT_DIR)
+CHECKPOINT_FILE = STATE_DIR / ".bubble-import-checkpoint.json"
+VINCERE_MAP_FILE = STATE_DIR / ".bubble-import-vincere-map.json"
+ERROR_LOG_FILE = STATE_DIR / ".bubble-import-errors.json"
 
-BATCH_SIZE = 100
+BATCH_SIZE = 100  # Candidates per bulk_upsert_bubble_candidates call
 CHECKPOINT_INTERVAL = 100  # Save checkpoint every N candidates
+VINCERE_POOL_MAXSIZE = 10  # Keep-alive connections per Vincere host
 
 # Default paths
 DEFAULT_CANDIDATES_CSV = DATA_DIR / "bubble-candidates.csv"
@@ -96,13 +107,19 @@ def get_supabase_client() -> Client:
 # ============================================================================
 
 class VincereClient:
-    def __init__(self):
+    def __init__(self, pool_maxsize: int = VINCERE_POOL_MAXSIZE, rate_limiter: Optional[AdaptiveRateLimiter] = None):
         self.client_id = os.getenv("VINCERE_CLIENT_ID")
         self.api_key = os.getenv("VINCERE_API_KEY")
         self.domain_id = os.getenv("VINCERE_DOMAIN_ID", "lighthousecrew")
-        self.base_url = f"https://{self.domain_id}.vincere.io/api/v2"
-        self.access_token = None
-        self.token_expires = 0
+        self.base_url = os.getenv("VINCERE_API_BASE_URL") or f"https://{self.domain_id}.vincere.io/api/v2"
+        # Shared, disk-cached token so concurrent callers and reruns refresh once
+        self.tokens = get_token_store(self.client_id or "", os.getenv("VINCERE_REFRESH_TOKEN") or "", "access_token")
+
+        # Persistent session so paginated API calls reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
 
         if not self.client_id or not self.api_key:
             print("WARNING: Vincere credentials not set, API fetch will be skipped")
@@ -113,37 +130,54 @@ class VincereClient:
         if not refresh_token:
             raise Exception("VINCERE_REFRESH_TOKEN not set")
 
-        url = f"https://id.vincere.io/oauth2/token"
+        url = AUTH_URL
         data = {
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
             "client_id": self.client_id,
         }
 
-        resp = requests.post(url, data=data)
+        with phase(AUTH):
+            resp = self.session.post(url, data=data)
         resp.raise_for_status()
 
         result = resp.json()
-        self.access_token = result["access_token"]
-        self.token_expires = time.time() + result.get("expires_in", 3600) - 60
+        self.tokens.set(result["access_token"], result.get("expires_in", 3600))
+        return result["access_token"]
 
-    def _ensure_token(self):
-        if not self.access_token or time.time() >= self.token_expires:
-            self._refresh_token()
+    def _ensure_token(self) -> str:
+        token = self.tokens.valid_token()
+        if token:
+            return token
+        with self.tokens.lock:
+            # Another thread may have refreshed while we waited
+            return self.tokens.valid_token() or self._refresh_token()
 
-    def get(self, endpoint: str) -> dict:
-        self._ensure_token()
+    def get(self, endpoint: str, retry_on_auth_error: bool = True) -> dict:
+        access_token = self._ensure_token()
 
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {access_token}",
             "x-api-key": self.api_key,
-            "id-token": self.access_token,
+            "id-token": access_token,
             "Content-Type": "application/json",
         }
 
         url = f"{self.base_url}{endpoint}"
-        resp = requests.get(url, headers=headers)
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            resp = self.session.get(url, headers=headers)
+            if resp.status_code != 429:
+                break
+            self.rate_limiter.on_throttle(resp.headers)
+
+        # Token expired or revoked - retry once with a fresh one
+        if resp.status_code == 401 and retry_on_auth_error:
+            self.tokens.invalidate(access_token)
+            return self.get(endpoint, retry_on_auth_error=False)
+
         resp.raise_for_status()
+        self.rate_limiter.on_success(resp.headers)
         return resp.json()
 
 # ============================================================================
@@ -242,7 +276,6 @@ def fetch_recent_vincere_candidates(client: VincereClient, existing_map: dict) -
                     new_this_batch += 1
 
             offset += PAGE_SIZE
-            time.sleep(1)  # Rate limit
 
             if offset % 1000 == 0:
                 print(f"  API progress: offset={offset}, added {added} new emails")
@@ -282,7 +315,8 @@ def build_vincere_email_map(vincere_csv_path: Optional[Path], skip_api: bool = F
             try:
                 client = VincereClient()
                 if client.client_id and client.api_key:
-                    fetch_recent_vincere_candidates(client, email_map)
+                    with phase(SEARCH):
+                        fetch_recent_vincere_candidates(client, email_map)
             except Exception as e:
                 print(f"Warning: Could not fetch from Vincere API: {e}")
 
@@ -577,14 +611,7 @@ def map_bubble_to_candidate(row: dict, vincere_id: Optional[str]) -> dict:
 # MAIN IMPORT LOGIC
 # ============================================================================
 
-def count_csv_rows(csv_path: Path) -> int:
-    """Count rows in CSV file"""
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        next(reader)  # Skip header
-        return sum(1 for _ in reader)
-
-def upsert_candidate(supabase: Client, candidate: dict) -> tuple:
+def upsert_candidate(supabase: Client, candidate: dict, candidate_index: CandidateIndex) -> tuple:
     """
     Insert or update a candidate. Returns (action, error).
     action: 'inserted', 'updated', 'skipped', or 'error'
@@ -594,12 +621,11 @@ def upsert_candidate(supabase: Client, candidate: dict) -> tuple:
         return ("skipped", "No email")
 
     try:
-        # Check if candidate exists (case-insensitive)
-        result = supabase.table("candidates").select("id, vincere_id").ilike("email", email).execute()
+        # Check if candidate exists (case-insensitive, from the preloaded index)
+        existing = candidate_index.get(email)
 
-        if result.data and len(result.data) > 0:
+        if existing:
             # Update existing candidate
-            existing = result.data[0]
             candidate_id = existing["id"]
 
             # Don't overwrite vincere_id if already set
@@ -610,15 +636,59 @@ def upsert_candidate(supabase: Client, candidate: dict) -> tuple:
             update_data = {k: v for k, v in candidate.items() if k != "email"}
 
             supabase.table("candidates").update(update_data).eq("id", candidate_id).execute()
+            candidate_index.add(email, candidate_id, candidate.get("vincere_id"), existing.get("photo_url"))
             return ("updated", None)
         else:
             # Insert new candidate
-            supabase.table("candidates").insert(candidate).execute()
+            result = supabase.table("candidates").insert(candidate).execute()
+            if result.data:
+                candidate_index.add(email, result.data[0]["id"], candidate.get("vincere_id"))
             return ("inserted", None)
 
     except Exception as e:
         return ("error", str(e))
 
+def upsert_candidate_batch(supabase: Client, batch: list, candidate_index: CandidateIndex) -> list:
+    """
+    Insert or update a batch of (row_num, candidate) pairs with a single
+    bulk_upsert_bubble_candidates call (ON CONFLICT on candidates_email_unique_idx).
+    Returns a list of (row_num, email, action, error) in batch order.
+
+    If the batch statement fails, it is retried row by row with
+    upsert_candidate() so each error is attributed to the row that caused it.
+    """
+    try:
+        result = supabase.rpc(
+            "bulk_upsert_bubble_candidates",
+            {"p_rows": [candidate for _, candidate in batch]},
+        ).execute()
+    except Exception as e:
+        print(f"  Batch upsert failed, retrying {len(batch)} rows individually: {e}", flush=True)
+        return [
+            (row_num, candidate["email"], *upsert_candidate(supabase, candidate, candidate_index))
+            for row_num, candidate in batch
+        ]
+
+    written = {r["candidate_email"]: r for r in result.data or []}
+    results = []
+    for row_num, candidate in batch:
+        email = candidate["email"]
+        row = written.get(email)
+        if not row:
+            results.append((row_num, email, "error", "No result returned by bulk upsert"))
+            continue
+
+        # Mirror the upsert into the index (an existing vincere_id is kept)
+        existing = candidate_index.get(email) or {}
+        candidate_index.add(
+            email,
+            row["candidate_id"],
+            candidate.get("vincere_id") or existing.get("vincere_id"),
+            existing.get("photo_url"),
+        )
+        results.append((row_num, email, row["operation"], None))
+    return results
+
 def import_candidates(
     candidates_csv: Path,
     vincere_csv: Optional[Path],
@@ -657,8 +727,10 @@ def import_candidates(
     start_row = checkpoint["last_processed_row"]
 
     # Count total rows
-    total_rows = count_csv_rows(candidates_csv)
-    print(f"Total rows in CSV: {total_rows}", flush=True)
+    # Seek straight to the saved resume point instead of re-reading processed rows
+    reader = ResumableCSVReader(candidates_csv, checkpoint.get("resume") if start_row else None)
+    total_rows = reader.estimated_rows
+    print(f"Estimated rows in CSV: ~{total_rows}", flush=True)
     print(f"Starting from row: {start_row}", flush=True)
 
     if limit:
@@ -667,17 +739,44 @@ def import_candidates(
     # Get Supabase client
     if not dry_run:
         supabase = get_supabase_client()
+        with phase(DB_READ):
+            candidate_index = CandidateIndex.load(supabase)
     else:
         supabase = None
+        candidate_index = None
 
     # Process CSV
-    row_num = 0
+    row_num = reader.start_row
     vincere_linked = 0
     vincere_not_linked = 0
 
-    with open(candidates_csv, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
+    # Candidates waiting for the next bulk upsert, as (row_num, candidate)
+    batch = []
+    batch_emails = set()
+
+    def flush_batch():
+        if not batch:
+            return
+        with phase(DB_WRITE):
+            results = upsert_candidate_batch(supabase, batch, candidate_index)
+        for batch_row, batch_email, action, error in results:
+            if action == "inserted":
+                checkpoint["imported_count"] += 1
+            elif action == "updated":
+                checkpoint["updated_count"] += 1
+            elif action == "skipped":
+                checkpoint["skipped_count"] += 1
+            else:  # error
+                checkpoint["error_count"] += 1
+                errors.append({
+                    "row": batch_row,
+                    "email": batch_email,
+                    "error": error,
+                })
+        batch.clear()
+        batch_emails.clear()
 
+    with reader:
         for row in reader:
             row_num += 1
 
@@ -704,7 +803,8 @@ def import_candidates(
 
             # Map to candidate record
             try:
-                candidate = map_bubble_to_candidate(row, vincere_id)
+                with phase(MAPPING):
+                    candidate = map_bubble_to_candidate(row, vincere_id)
             except Exception as e:
                 checkpoint["error_count"] += 1
                 errors.append({
@@ -714,38 +814,36 @@ def import_candidates(
                 })
                 continue
 
-            # Insert or update candidate
+            # Queue for the next bulk insert/update
             if not dry_run:
-                action, error = upsert_candidate(supabase, candidate)
-                if action == "inserted":
-                    checkpoint["imported_count"] += 1
-                elif action == "updated":
-                    checkpoint["updated_count"] += 1
-                elif action == "skipped":
-                    checkpoint["skipped_count"] += 1
-                else:  # error
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": error,
-                    })
+                # ON CONFLICT can't touch the same row twice in one statement
+                if email in batch_emails:
+                    flush_batch()
+                batch.append((row_num, candidate))
+                batch_emails.add(email)
+                if len(batch) >= BATCH_SIZE:
+                    flush_batch()
             else:
                 checkpoint["imported_count"] += 1
 
             checkpoint["last_processed_row"] = row_num
 
-            # Save checkpoint and print progress
+            # Save checkpoint and print progress (only once queued rows are written)
             if row_num % CHECKPOINT_INTERVAL == 0:
+                flush_batch()
+                checkpoint["resume"] = reader.resume_point(row_num)
                 save_checkpoint(checkpoint)
                 save_errors(errors)
 
-                progress = (row_num / total_rows) * 100
-                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/{total_rows} ({progress:.1f}%) - "
+                progress = (row_num / total_rows) * 100 if limit else reader.progress() * 100
+                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/~{total_rows} ({progress:.1f}%) - "
                       f"Inserted: {checkpoint['imported_count']}, Updated: {checkpoint['updated_count']}, "
                       f"Errors: {checkpoint['error_count']}, Vincere linked: {vincere_linked}", flush=True)
 
     # Final save
+    flush_batch()
+    if checkpoint["last_processed_row"] == row_num:
+        checkpoint["resume"] = reader.resume_point(row_num)
     checkpoint["completed_at"] = datetime.now().isoformat()
     save_checkpoint(checkpoint)
     save_errors(errors)
@@ -789,8 +887,10 @@ def main():
                         help="Limit number of candidates to process")
     parser.add_argument("--reset", action="store_true",
                         help="Reset checkpoint and start fresh")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profile(args.profile)
 
     # Reset if requested
     if args.reset:
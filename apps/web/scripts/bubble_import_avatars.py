@@ -12,21 +12,25 @@ Features:
 - Downloads from Bubble CDN
 - Uploads to Supabase Storage (avatars bucket)
 - Updates candidate photo_url
+- Pipelined: downloads, uploads and DB updates run on separate worker pools
+- Normalizes avatars to EXIF-free WebP at standard sizes on a process pool
 
 Requirements:
     pip install supabase python-dotenv requests
+    pip install Pillow  # Optional: without it originals are uploaded unchanged
 """
 
 import os
 import sys
-import csv
 import json
 import uuid
 import argparse
 import mimetypes
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse, unquote
 from dotenv import load_dotenv
 
@@ -38,22 +42,51 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("ERROR: requests package not installed. Run: pip install requests")
     sys.exit(1)
 
+from avatar_images import (
+    AVATAR_CONTENT_TYPE,
+    AVATAR_EXTENSION,
+    images_available,
+    normalize_avatar,
+    variant_path,
+)
+from candidate_index import CandidateIndex
+from csv_resume import ResumableCSVReader
+from storage_manifest import BucketManifest
+from streamed_download import DownloadedFile, stream_download
+from transfer_pipeline import Pipeline, RowWatermark, Stage
+
+# Profiling hooks are shared with the Vincere pull scripts in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from profiling import (  # noqa: E402
+    DB_READ, DB_WRITE, DOWNLOAD, NORMALIZE, UPLOAD, add_profile_argument, phase, start_profile,
+)
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / "data"
-CHECKPOINT_FILE = SCRIPT_DIR / ".bubble-avatars-checkpoint.json"
-ERROR_LOG_FILE = SCRIPT_DIR / ".bubble-avatars-errors.json"
+# Checkpoint and error log (BUBBLE_IMPORT_STATE_DIR to relocate)
+STATE_DIR = Path(os.getenv("BUBBLE_IMPORT_STATE_DIR") or SCRIPT_DIR)
+CHECKPOINT_FILE = STATE_DIR / ".bubble-avatars-checkpoint.json"
+ERROR_LOG_FILE = STATE_DIR / ".bubble-avatars-errors.json"
 
 CHECKPOINT_INTERVAL = 50  # Save checkpoint every N candidates
 REQUEST_TIMEOUT = 30  # Timeout for downloading files
 
+# Pipeline concurrency per stage (see transfer_pipeline.py)
+DEFAULT_DOWNLOAD_WORKERS = 8  # Bubble CDN downloads
+DEFAULT_UPLOAD_WORKERS = 4  # Supabase Storage uploads
+DEFAULT_DB_WORKERS = 2  # photo_url updates
+DEFAULT_IMAGE_WORKERS = os.cpu_count() or 2  # Image normalization processes
+PIPELINE_QUEUE_SIZE = 16  # Avatars buffered between two stages
+
 DEFAULT_CANDIDATES_CSV = DATA_DIR / "bubble-candidates.csv"
 
 # ============================================================================
@@ -162,65 +195,43 @@ def sanitize_filename(filename: str) -> str:
         safe += ".jpg"
     return safe
 
-# ============================================================================
-# CANDIDATE LOOKUP CACHE
-# ============================================================================
-
-_candidate_cache = {}
-
-def get_candidate_by_email(supabase: Client, email: str) -> Optional[dict]:
-    """Get candidate ID by email (cached)"""
-    email_lower = email.lower().strip()
-
-    if email_lower in _candidate_cache:
-        return _candidate_cache[email_lower]
-
-    try:
-        result = supabase.table("candidates").select("id,photo_url").ilike("email", email_lower).execute()
-        if result.data and len(result.data) > 0:
-            _candidate_cache[email_lower] = result.data[0]
-            return result.data[0]
-    except Exception as e:
-        print(f"  Error looking up candidate {email}: {e}", flush=True)
-
-    _candidate_cache[email_lower] = None
-    return None
-
 # ============================================================================
 # AVATAR UPLOAD
 # ============================================================================
 
-def download_file(url: str) -> Optional[bytes]:
-    """Download file from URL"""
+def download_file(url: str, http=requests) -> Optional[DownloadedFile]:
+    """Stream a file from URL (pass a Session as `http` to reuse connections)
+
+    Bodies above SPOOL_THRESHOLD are spooled to a temp file; close the result.
+    """
     try:
-        resp = requests.get(url, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.content
+        body = stream_download(url, http, timeout=REQUEST_TIMEOUT)
     except Exception as e:
         print(f"  Download error: {e}", flush=True)
         return None
+    if not body.size:
+        body.close()
+        print(f"  Download error: empty file at {url}", flush=True)
+        return None
+    return body
 
-def upload_to_storage(supabase: Client, bucket: str, path: str, content: bytes, content_type: str) -> bool:
-    """Upload file to Supabase Storage"""
+def upload_to_storage(supabase: Client, manifest: BucketManifest, path: str, body: DownloadedFile, content_type: str) -> bool:
+    """Upload file to Supabase Storage (skipped if the manifest already has it)"""
     try:
-        # Check if file already exists
-        try:
-            folder = path.rsplit("/", 1)[0] if "/" in path else ""
-            filename = path.rsplit("/", 1)[-1] if "/" in path else path
-            existing = supabase.storage.from_(bucket).list(folder)
-            if any(f["name"] == filename for f in existing):
-                return True  # Already exists
-        except:
-            pass
-
-        supabase.storage.from_(bucket).upload(
+        if manifest.exists(path):
+            return True  # Already exists
+
+        supabase.storage.from_(manifest.bucket).upload(
             path,
-            content,
+            body.upload_source(),
             {"content-type": content_type}
         )
+        manifest.add(path, body.size)
         return True
     except Exception as e:
         if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
+            # Uploaded by someone else since the folder was listed; list it again
+            manifest.refresh(path.rpartition("/")[0])
             return True
         print(f"  Upload error: {e}", flush=True)
         return False
@@ -240,18 +251,136 @@ def update_candidate_photo_url(supabase: Client, candidate_id: str, photo_url: s
 # MAIN IMPORT LOGIC
 # ============================================================================
 
-def count_csv_rows(csv_path: Path) -> int:
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        next(reader)
-        return sum(1 for _ in reader)
+class AvatarJob:
+    """One avatar moving through the download → upload → update pipeline"""
+
+    def __init__(self, row_num: int, email: str, candidate_id: str, avatar_url: str):
+        self.row_num = row_num
+        self.email = email
+        self.candidate_id = candidate_id
+        self.avatar_url = avatar_url
+        self.body: Optional[DownloadedFile] = None
+        self.storage_path: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.thumbnails: List[Tuple[str, DownloadedFile]] = []
+        self.already_stored = False
+        self.original_size = 0
+        self.stored_size = 0
+        self.error: Optional[str] = None
+
+    def release(self):
+        if self.body is not None:
+            self.body.close()
+            self.body = None
+        for _, thumbnail in self.thumbnails:
+            thumbnail.close()
+        self.thumbnails = []
+
+def build_avatar_pipeline(
+    supabase: Client,
+    supabase_url: str,
+    candidate_index: CandidateIndex,
+    manifest: BucketManifest,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+    db_workers: int = DEFAULT_DB_WORKERS,
+    image_pool: Optional[ProcessPoolExecutor] = None,
+    image_workers: int = DEFAULT_IMAGE_WORKERS,
+) -> Pipeline:
+    """Bubble CDN downloads, Storage uploads and photo_url updates, each on its own pool
+
+    With an `image_pool`, a normalize stage between download and upload
+    re-encodes each avatar (see avatar_images.py) in those processes.
+    """
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=download_workers)
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+
+    def original_path(job: AvatarJob) -> str:
+        return f"{job.candidate_id}/{sanitize_filename(get_filename_from_url(job.avatar_url))}"
+
+    def download(job: AvatarJob):
+        job.storage_path = original_path(job)
+        if image_pool:
+            job.storage_path = os.path.splitext(job.storage_path)[0] + AVATAR_EXTENSION
+        # Uploaded by an earlier run: skip straight to the photo_url update
+        if manifest.exists(job.storage_path):
+            job.already_stored = True
+            return
+        with phase(DOWNLOAD):
+            job.body = download_file(job.avatar_url, http)
+        if not job.body:
+            job.error = "Failed to download avatar"
+            return
+        job.original_size = job.body.size
+
+    def normalize(job: AvatarJob):
+        if job.already_stored:
+            return
+        # These threads only wait; decoding and encoding run in the process pool
+        try:
+            with phase(NORMALIZE):
+                variants = image_pool.submit(normalize_avatar, job.body.read_bytes()).result()
+        except Exception as e:
+            # Not an image Pillow can read (or a broken one): keep the original
+            print(f"  Image normalization failed for {job.email}, uploading original: {e}", flush=True)
+            job.storage_path = original_path(job)
+            return
+        job.release()
+        job.body = DownloadedFile.from_bytes(variants.pop(""))
+        job.content_type = AVATAR_CONTENT_TYPE
+        job.thumbnails = [
+            (variant_path(job.storage_path, suffix), DownloadedFile.from_bytes(data))
+            for suffix, data in variants.items()
+        ]
+
+    def upload(job: AvatarJob):
+        if job.already_stored:
+            return
+        content_type = job.content_type or get_content_type(get_filename_from_url(job.avatar_url))
+        # Thumbnails first: once the main image exists, later runs skip the avatar
+        files = job.thumbnails + [(job.storage_path, job.body)]
+        with phase(UPLOAD):
+            uploaded = all(upload_to_storage(supabase, manifest, path, body, content_type) for path, body in files)
+        job.stored_size = sum(body.size for _, body in files)
+        job.release()  # Don't hold the file while waiting for the DB stage
+        if not uploaded:
+            job.error = "Failed to upload to storage"
+
+    def update(job: AvatarJob):
+        photo_url = f"{supabase_url}/storage/v1/object/public/avatars/{job.storage_path}"
+        with phase(DB_WRITE):
+            updated = update_candidate_photo_url(supabase, job.candidate_id, photo_url)
+        if not updated:
+            job.error = "Failed to update candidate photo_url"
+            return
+        candidate_index.set_photo_url(job.email, photo_url)
+
+    stages = [Stage("download", download, workers=download_workers)]
+    if image_pool:
+        stages.append(Stage("normalize", normalize, workers=image_workers))
+    stages += [
+        Stage("upload", upload, workers=upload_workers),
+        Stage("update", update, workers=db_workers),
+    ]
+    return Pipeline(stages, queue_size=PIPELINE_QUEUE_SIZE)
 
 def import_avatars(
     candidates_csv: Path,
     dry_run: bool = False,
     resume: bool = True,
     limit: Optional[int] = None,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+    db_workers: int = DEFAULT_DB_WORKERS,
+    normalize_images: bool = True,
+    image_workers: int = DEFAULT_IMAGE_WORKERS,
 ):
+    if normalize_images and not images_available():
+        print("WARNING: Pillow not installed (pip install Pillow); uploading original images", flush=True)
+        normalize_images = False
+
     print("=" * 60, flush=True)
     print("BUBBLE AVATARS IMPORT", flush=True)
     print("=" * 60, flush=True)
@@ -259,6 +388,8 @@ def import_avatars(
     print(f"Dry run: {dry_run}", flush=True)
     print(f"Resume: {resume}", flush=True)
     print(f"Limit: {limit}", flush=True)
+    print(f"Workers: {download_workers} download / {upload_workers} upload / {db_workers} DB", flush=True)
+    print(f"Normalize images: {f'{image_workers} processes' if normalize_images else 'no'}", flush=True)
     print("=" * 60, flush=True)
 
     checkpoint = load_checkpoint() if resume else {
@@ -272,24 +403,72 @@ def import_avatars(
     errors = load_errors() if resume else []
     start_row = checkpoint["last_processed_row"]
 
-    total_rows = count_csv_rows(candidates_csv)
-    print(f"Total rows in CSV: {total_rows}", flush=True)
+    # Seek straight to the saved resume point instead of re-reading processed rows
+    reader = ResumableCSVReader(candidates_csv, checkpoint.get("resume") if start_row else None)
+    total_rows = reader.estimated_rows
+    print(f"Estimated rows in CSV: ~{total_rows}", flush=True)
     print(f"Starting from row: {start_row}", flush=True)
 
     if limit:
         total_rows = min(total_rows, start_row + limit)
 
     supabase = get_supabase_client() if not dry_run else None
+    with phase(DB_READ):
+        candidate_index = CandidateIndex.load(supabase) if not dry_run else None
     supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 
-    row_num = 0
+    # Spawned, not forked: by now the Supabase client (and the profiler) may
+    # have threads running, and forking a threaded process can deadlock the child
+    image_pool = (
+        ProcessPoolExecutor(image_workers, mp_context=multiprocessing.get_context("spawn"))
+        if normalize_images and not dry_run else None
+    )
+
+    if dry_run:
+        pipeline = None
+    else:
+        manifest = BucketManifest(supabase, "avatars")
+        pipeline = build_avatar_pipeline(
+            supabase, supabase_url, candidate_index, manifest,
+            download_workers, upload_workers, db_workers, image_pool, image_workers,
+        )
+        pipeline.start()
+
+    # Rows finish out of order; the checkpoint only advances past rows that
+    # are done along with every row before them
+    watermark = RowWatermark(start_row, checkpoint.get("resume"))
+    queued_candidates = set()
+    stats = {"already_stored": 0, "original_bytes": 0, "stored_bytes": 0}
+
+    def finish_row(row: int):
+        checkpoint["last_processed_row"], resume_point = watermark.finish(row)
+        if resume_point:
+            checkpoint["resume"] = resume_point
+
+    def record(job: AvatarJob):
+        job.release()  # A failed job may still hold its download
+        if job.error:
+            checkpoint["error_count"] += 1
+            errors.append({
+                "row": job.row_num,
+                "email": job.email,
+                "url": job.avatar_url,
+                "error": job.error,
+            })
+        else:
+            checkpoint["uploaded_count"] += 1
+            if job.already_stored:
+                stats["already_stored"] += 1
+            stats["original_bytes"] += job.original_size
+            stats["stored_bytes"] += job.stored_size
+        finish_row(job.row_num)
+
+    row_num = reader.start_row
     no_avatar = 0
     no_email = 0
     already_has_photo = 0
 
-    with open(candidates_csv, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
+    with reader:
         for row in reader:
             row_num += 1
 
@@ -299,12 +478,14 @@ def import_avatars(
             if limit and row_num > start_row + limit:
                 break
 
+            watermark.add(row_num, reader.resume_point(row_num))
+
             # Get candidate email
             candidate_email = row.get("email", "").strip()
             if not candidate_email:
                 no_email += 1
                 checkpoint["skipped_count"] += 1
-                checkpoint["last_processed_row"] = row_num
+                finish_row(row_num)
                 continue
 
             # Get avatar URL
@@ -312,15 +493,16 @@ def import_avatars(
             if not avatar_url:
                 no_avatar += 1
                 checkpoint["skipped_count"] += 1
-                checkpoint["last_processed_row"] = row_num
+                finish_row(row_num)
                 continue
 
             if dry_run:
                 print(f"[DRY RUN] Would upload avatar for {candidate_email}", flush=True)
                 checkpoint["uploaded_count"] += 1
+                finish_row(row_num)
             else:
                 # Look up candidate
-                candidate = get_candidate_by_email(supabase, candidate_email)
+                candidate = candidate_index.get(candidate_email)
                 if not candidate:
                     checkpoint["skipped_count"] += 1
                     errors.append({
@@ -328,71 +510,40 @@ def import_avatars(
                         "email": candidate_email,
                         "error": "Candidate not found in database",
                     })
-                    checkpoint["last_processed_row"] = row_num
+                    finish_row(row_num)
                     continue
 
                 candidate_id = candidate["id"]
 
-                # Skip if candidate already has a photo_url
-                if candidate.get("photo_url"):
+                # Skip if candidate already has a photo_url (or one is on its way)
+                if candidate.get("photo_url") or candidate_id in queued_candidates:
                     already_has_photo += 1
                     checkpoint["skipped_count"] += 1
-                    checkpoint["last_processed_row"] = row_num
-                    continue
-
-                # Download avatar
-                content = download_file(avatar_url)
-                if not content:
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "url": avatar_url,
-                        "error": "Failed to download avatar",
-                    })
-                    checkpoint["last_processed_row"] = row_num
+                    finish_row(row_num)
                     continue
 
-                # Upload to storage
-                original_filename = get_filename_from_url(avatar_url)
-                safe_filename = sanitize_filename(original_filename)
-                storage_path = f"{candidate_id}/{safe_filename}"
-                content_type = get_content_type(original_filename)
-
-                if not upload_to_storage(supabase, "avatars", storage_path, content, content_type):
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "error": "Failed to upload to storage",
-                    })
-                    checkpoint["last_processed_row"] = row_num
-                    continue
-
-                # Update candidate photo_url
-                photo_url = f"{supabase_url}/storage/v1/object/public/avatars/{storage_path}"
-                if not update_candidate_photo_url(supabase, candidate_id, photo_url):
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "error": "Failed to update candidate photo_url",
-                    })
-                    checkpoint["last_processed_row"] = row_num
-                    continue
-
-                checkpoint["uploaded_count"] += 1
-
-            checkpoint["last_processed_row"] = row_num
+                # Download, upload and update happen in the pipeline; blocks
+                # here while the download queue is full
+                queued_candidates.add(candidate_id)
+                pipeline.submit(AvatarJob(row_num, candidate_email, candidate_id, avatar_url))
+                for job in pipeline.completed():
+                    record(job)
 
             if row_num % CHECKPOINT_INTERVAL == 0:
                 save_checkpoint(checkpoint)
                 save_errors(errors)
 
-                progress = (row_num / total_rows) * 100
-                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/{total_rows} ({progress:.1f}%) - "
+                progress = (row_num / total_rows) * 100 if limit else reader.progress() * 100
+                in_flight = pipeline.in_flight if pipeline else 0
+                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/~{total_rows} ({progress:.1f}%) - "
                       f"Uploaded: {checkpoint['uploaded_count']}, Skipped: {checkpoint['skipped_count']}, "
-                      f"Errors: {checkpoint['error_count']}", flush=True)
+                      f"Errors: {checkpoint['error_count']}, In flight: {in_flight}", flush=True)
+
+    if pipeline:
+        for job in pipeline.drain():
+            record(job)
+    if image_pool:
+        image_pool.shutdown()
 
     checkpoint["completed_at"] = datetime.now().isoformat()
     save_checkpoint(checkpoint)
@@ -407,6 +558,10 @@ def import_avatars(
     print(f"  - No email: {no_email}", flush=True)
     print(f"  - No avatar URL: {no_avatar}", flush=True)
     print(f"  - Already has photo: {already_has_photo}", flush=True)
+    print(f"Already in storage (download skipped): {stats['already_stored']}", flush=True)
+    if stats["original_bytes"]:
+        print(f"Image bytes: {stats['original_bytes'] / 1e6:.1f} MB downloaded, "
+              f"{stats['stored_bytes'] / 1e6:.1f} MB stored", flush=True)
     print(f"Errors: {checkpoint['error_count']}", flush=True)
     print("=" * 60, flush=True)
 
@@ -431,8 +586,20 @@ def main():
                         help="Limit number of candidates to process")
     parser.add_argument("--reset", action="store_true",
                         help="Reset checkpoint and start fresh")
+    parser.add_argument("--download-workers", type=int, default=DEFAULT_DOWNLOAD_WORKERS,
+                        help=f"Concurrent Bubble CDN downloads (default: {DEFAULT_DOWNLOAD_WORKERS})")
+    parser.add_argument("--upload-workers", type=int, default=DEFAULT_UPLOAD_WORKERS,
+                        help=f"Concurrent Storage uploads (default: {DEFAULT_UPLOAD_WORKERS})")
+    parser.add_argument("--db-workers", type=int, default=DEFAULT_DB_WORKERS,
+                        help=f"Concurrent photo_url updates (default: {DEFAULT_DB_WORKERS})")
+    parser.add_argument("--image-workers", type=int, default=DEFAULT_IMAGE_WORKERS,
+                        help=f"Image normalization processes (default: {DEFAULT_IMAGE_WORKERS})")
+    parser.add_argument("--keep-originals", action="store_true",
+                        help="Upload images unchanged instead of normalized WebP")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profile(args.profile)
 
     if args.reset:
         if CHECKPOINT_FILE.exists():
@@ -453,6 +620,11 @@ def main():
         dry_run=args.dry_run,
         resume=not args.no_resume,
         limit=args.limit,
+        download_workers=args.download_workers,
+        upload_workers=args.upload_workers,
+        db_workers=args.db_workers,
+        normalize_images=not args.keep_originals,
+        image_workers=args.image_workers,
     )
 
 if __name__ == "__main__":
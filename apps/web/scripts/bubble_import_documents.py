@@ -12,6 +12,8 @@ Features:
 - Downloads from Bubble CDN
 - Uploads to Supabase Storage
 - Links documents to candidates
+- SHA-256 dedupe: identical files are stored once and shared by their records
+- Resumable chunked uploads for large files (sessions saved in the checkpoint)
 
 Requirements:
     pip install supabase python-dotenv requests
@@ -19,15 +21,13 @@ Requirements:
 
 import os
 import sys
-import csv
 import json
-import time
 import uuid
 import argparse
 import mimetypes
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse, unquote
 from dotenv import load_dotenv
 
@@ -43,17 +43,31 @@ except ImportError:
     print("ERROR: requests package not installed. Run: pip install requests")
     sys.exit(1)
 
+from candidate_index import CandidateIndex
+from csv_resume import ResumableCSVReader
+from resumable_upload import RESUMABLE_UPLOAD_THRESHOLD, ResumableUploader, UploadExistsError
+from storage_manifest import BucketManifest
+from streamed_download import DownloadedFile, stream_download
+
+# scripts/ at the repo root holds the profiling module the Vincere pullers use too
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from profiling import DB_READ, DB_WRITE, DOWNLOAD, UPLOAD, add_profile_argument, phase, start_profile  # noqa: E402
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / "data"
-CHECKPOINT_FILE = SCRIPT_DIR / ".bubble-docs-checkpoint.json"
-ERROR_LOG_FILE = SCRIPT_DIR / ".bubble-docs-errors.json"
+# Checkpoint and error log (BUBBLE_IMPORT_STATE_DIR to relocate)
+STATE_DIR = Path(os.getenv("BUBBLE_IMPORT_STATE_DIR") or SCRIPT_DIR)
+CHECKPOINT_FILE = STATE_DIR / ".bubble-docs-checkpoint.json"
+ERROR_LOG_FILE = STATE_DIR / ".bubble-docs-errors.json"
 
 CHECKPOINT_INTERVAL = 50  # Save checkpoint every N documents
+RECORD_BATCH_SIZE = 50  # Document records written per insert
 REQUEST_TIMEOUT = 30  # Timeout for downloading files
+SIGNED_URL_TTL = 600  # Seconds a signed URL for hashing a stored file stays valid
 
 DEFAULT_DOCUMENTS_CSV = DATA_DIR / "bubble-documents.csv"
 
@@ -194,6 +208,7 @@ def load_checkpoint() -> dict:
         "uploaded_count": 0,
         "skipped_count": 0,
         "error_count": 0,
+        "deduplicated_count": 0,
         "started_at": datetime.now().isoformat(),
     }
 
@@ -282,97 +297,157 @@ def normalize_document_type(doc_type: str) -> str:
     return DOCUMENT_TYPE_MAP.get(doc_type.lower().strip(), "other")
 
 # ============================================================================
-# CANDIDATE LOOKUP CACHE
+# DOCUMENT UPLOAD
 # ============================================================================
 
-_candidate_cache = {}
+def download_file(url: str, http=requests) -> Optional[DownloadedFile]:
+    """Stream a file from URL (pass a Session as `http` to reuse connections)
 
-def get_candidate_by_email(supabase: Client, email: str) -> Optional[dict]:
-    """Get candidate ID by email (cached)"""
-    email_lower = email.lower().strip()
+    Bodies above SPOOL_THRESHOLD are spooled to a temp file; close the result.
+    """
+    try:
+        body = stream_download(url, http, timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        print(f"  Download error: {e}", flush=True)
+        return None
+    if not body.size:
+        body.close()
+        print(f"  Download error: empty file at {url}", flush=True)
+        return None
+    return body
 
-    if email_lower in _candidate_cache:
-        return _candidate_cache[email_lower]
+def upload_to_storage(supabase: Client, manifest: BucketManifest, uploader: ResumableUploader, path: str, body: DownloadedFile, content_type: str) -> bool:
+    """Upload file to Supabase Storage (skipped if the manifest already has it)
 
+    Files over RESUMABLE_UPLOAD_THRESHOLD go up in resumable chunks.
+    """
     try:
-        result = supabase.table("candidates").select("id").ilike("email", email_lower).execute()
-        if result.data and len(result.data) > 0:
-            _candidate_cache[email_lower] = result.data[0]
-            return result.data[0]
+        if manifest.exists(path):
+            return True  # Already exists
+
+        if body.size > RESUMABLE_UPLOAD_THRESHOLD:
+            uploader.upload(path, body, content_type)
+        else:
+            supabase.storage.from_(manifest.bucket).upload(
+                path,
+                body.upload_source(),
+                {"content-type": content_type}
+            )
+        manifest.add(path, body.size)
+        return True
+    except UploadExistsError:
+        # Uploaded by someone else since the folder was listed; list it again
+        manifest.refresh(path.rpartition("/")[0])
+        return True
     except Exception as e:
-        print(f"  Error looking up candidate {email}: {e}", flush=True)
+        if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
+            manifest.refresh(path.rpartition("/")[0])
+            return True
+        print(f"  Upload error: {e}", flush=True)
+        return False
 
-    _candidate_cache[email_lower] = None
-    return None
+def load_content_hashes(supabase: Client, page_size: int = 1000) -> Tuple[dict, dict]:
+    """Map SHA-256 → storage path for files imported by earlier runs
+
+    Lets identical bytes (re-exported CVs, shared certificate templates) be
+    uploaded once; later rows get a documents record pointing at that object.
+    Also returns storage path → SHA-256, to tell which stored files still
+    need hashing (see hash_stored_file).
+    """
+    content_hashes = {}
+    hashed_paths = {}
+    last_id = None
+    while True:
+        query = (
+            supabase.table("documents")
+            .select("id,file_path,content_sha256:metadata->>content_sha256")
+            .eq("metadata->>source", "bubble_import")
+            .not_.is_("metadata->>content_sha256", "null")
+            .is_("deleted_at", "null")
+            .order("id")
+            .limit(page_size)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.execute().data or []
+        for row in rows:
+            content_hashes.setdefault(row["content_sha256"], row["file_path"])
+            hashed_paths[row["file_path"]] = row["content_sha256"]
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]["id"]
 
-# ============================================================================
-# DOCUMENT UPLOAD
-# ============================================================================
+    print(f"Loaded {len(content_hashes)} content hashes from earlier imports", flush=True)
+    return content_hashes, hashed_paths
+
+def hash_stored_file(supabase: Client, path: str) -> Optional[str]:
+    """SHA-256 of a file already in the documents bucket, recorded on its import rows
 
-def download_file(url: str) -> Optional[bytes]:
-    """Download file from URL"""
+    Files uploaded before content hashes were recorded have none, so copies
+    of them elsewhere in the export couldn't be deduped against them. This
+    streams the stored object once (through a signed URL) and writes the
+    hash into the metadata of the import records that use it, so later runs
+    find it in load_content_hashes().
+    """
     try:
-        resp = requests.get(url, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        return resp.content
+        signed = supabase.storage.from_("documents").create_signed_url(path, SIGNED_URL_TTL)
+        url = signed["signedURL"]
     except Exception as e:
-        print(f"  Download error: {e}", flush=True)
+        print(f"  Could not sign {path} for hashing: {e}", flush=True)
+        return None
+    body = download_file(url)
+    if not body:
         return None
+    with body:
+        content_sha256 = body.sha256
 
-def upload_to_storage(supabase: Client, bucket: str, path: str, content: bytes, content_type: str) -> bool:
-    """Upload file to Supabase Storage"""
     try:
-        # Check if file already exists
-        try:
-            existing = supabase.storage.from_(bucket).list(path.rsplit("/", 1)[0] if "/" in path else "")
-            filename = path.rsplit("/", 1)[-1] if "/" in path else path
-            if any(f["name"] == filename for f in existing):
-                return True  # Already exists
-        except:
-            pass
-
-        supabase.storage.from_(bucket).upload(
-            path,
-            content,
-            {"content-type": content_type}
+        (
+            supabase.table("documents")
+            .update({"metadata": {"source": "bubble_import", "content_sha256": content_sha256}})
+            .eq("file_path", path)
+            .eq("metadata->>source", "bubble_import")
+            .is_("metadata->>content_sha256", "null")
+            .execute()
         )
-        return True
     except Exception as e:
-        if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
-            return True
-        print(f"  Upload error: {e}", flush=True)
-        return False
+        print(f"  DB error recording content hash for {path}: {e}", flush=True)
+    return content_sha256
+
+def build_document_record(candidate_id: str, doc_type: str, storage_path: str, original_filename: str, file_size: int, mime_type: str, content_sha256: Optional[str] = None) -> dict:
+    """Row for the existing documents table"""
+    # Get storage URL - use file_path for authenticated access (bucket is private)
+    # The file_url points to the storage path, actual access requires signed URLs or auth
+    supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+    file_url = f"{supabase_url}/storage/v1/object/documents/{storage_path}"
+
+    return {
+        "entity_type": "candidate",
+        "entity_id": candidate_id,
+        "organization_id": "00000000-0000-0000-0000-000000000001",  # Lighthouse Careers
+        "type": doc_type,
+        "name": original_filename,
+        "file_url": file_url,
+        "file_path": storage_path,
+        "file_size": file_size,
+        "mime_type": mime_type,
+        "status": "approved",  # Auto-approve imported docs
+        "is_processed": False,
+        "is_latest_version": True,
+        "version": 1,
+        "metadata": {"source": "bubble_import", "content_sha256": content_sha256},
+    }
 
-def create_document_record(supabase: Client, candidate_id: str, doc_type: str, storage_path: str, original_filename: str, file_size: int, mime_type: str) -> bool:
-    """Create document record in database using existing documents table"""
+def create_document_record(supabase: Client, record: dict) -> bool:
+    """Insert one document record (skipped if entity_id + file_path already exists)"""
     try:
         # Check if document record already exists (by entity_id + file_path)
-        existing = supabase.table("documents").select("id").eq("entity_id", candidate_id).eq("file_path", storage_path).execute()
+        existing = supabase.table("documents").select("id").eq("entity_id", record["entity_id"]).eq("file_path", record["file_path"]).execute()
         if existing.data and len(existing.data) > 0:
-            print(f"  Skipped (already exists): {original_filename}", flush=True)
+            print(f"  Skipped (already exists): {record['name']}", flush=True)
             return True  # Already exists
 
-        # Get storage URL - use file_path for authenticated access (bucket is private)
-        # The file_url points to the storage path, actual access requires signed URLs or auth
-        supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-        file_url = f"{supabase_url}/storage/v1/object/documents/{storage_path}"
-
-        supabase.table("documents").insert({
-            "entity_type": "candidate",
-            "entity_id": candidate_id,
-            "organization_id": "00000000-0000-0000-0000-000000000001",  # Lighthouse Careers
-            "type": doc_type,
-            "name": original_filename,
-            "file_url": file_url,
-            "file_path": storage_path,
-            "file_size": file_size,
-            "mime_type": mime_type,
-            "status": "approved",  # Auto-approve imported docs
-            "is_processed": False,
-            "is_latest_version": True,
-            "version": 1,
-            "metadata": {"source": "bubble_import"},
-        }).execute()
+        supabase.table("documents").insert(record).execute()
         return True
     except Exception as e:
         if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
@@ -380,16 +455,48 @@ def create_document_record(supabase: Client, candidate_id: str, doc_type: str, s
         print(f"  DB error: {e}", flush=True)
         return False
 
+def create_document_records(supabase: Client, records: List[dict]) -> List[bool]:
+    """Insert a batch of document records, skipping ones that already exist
+
+    One query finds which (entity_id, file_path) pairs already exist and one
+    multi-row insert writes the rest. If the insert fails, the new records
+    are retried one at a time so a single bad row doesn't fail its batch.
+    Returns one success flag per record, in order.
+    """
+    try:
+        # Storage paths are sanitized to [A-Za-z0-9._-/], so they are safe in an in.() filter
+        paths = sorted({record["file_path"] for record in records})
+        existing = supabase.table("documents").select("entity_id,file_path").in_("file_path", paths).execute()
+        seen = {(row["entity_id"], row["file_path"]) for row in existing.data or []}
+    except Exception as e:
+        print(f"  DB error checking existing documents: {e}", flush=True)
+        return [create_document_record(supabase, record) for record in records]
+
+    new_indexes = []
+    for i, record in enumerate(records):
+        key = (record["entity_id"], record["file_path"])
+        if key in seen:
+            print(f"  Skipped (already exists): {record['name']}", flush=True)
+            continue
+        seen.add(key)  # The same file twice in one batch is inserted once
+        new_indexes.append(i)
+
+    results = [True] * len(records)
+    if not new_indexes:
+        return results
+
+    try:
+        supabase.table("documents").insert([records[i] for i in new_indexes]).execute()
+    except Exception as e:
+        print(f"  Batch insert failed ({e}); inserting {len(new_indexes)} records one at a time", flush=True)
+        for i in new_indexes:
+            results[i] = create_document_record(supabase, records[i])
+    return results
+
 # ============================================================================
 # MAIN IMPORT LOGIC
 # ============================================================================
 
-def count_csv_rows(csv_path: Path) -> int:
-    with open(csv_path, "r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        next(reader)
-        return sum(1 for _ in reader)
-
 def import_documents(
     documents_csv: Path,
     dry_run: bool = False,
@@ -410,29 +517,73 @@ def import_documents(
         "uploaded_count": 0,
         "skipped_count": 0,
         "error_count": 0,
+        "deduplicated_count": 0,
         "started_at": datetime.now().isoformat(),
     }
 
+    checkpoint.setdefault("deduplicated_count", 0)  # Missing from checkpoints of older runs
     errors = load_errors() if resume else []
     start_row = checkpoint["last_processed_row"]
 
-    total_rows = count_csv_rows(documents_csv)
-    print(f"Total rows in CSV: {total_rows}", flush=True)
+    # Seek straight to the saved resume point instead of re-reading processed rows
+    reader = ResumableCSVReader(documents_csv, checkpoint.get("resume") if start_row else None)
+    total_rows = reader.estimated_rows
+    print(f"Estimated rows in CSV: ~{total_rows}", flush=True)
     print(f"Starting from row: {start_row}", flush=True)
 
     if limit:
         total_rows = min(total_rows, start_row + limit)
 
     supabase = get_supabase_client() if not dry_run else None
-
-    row_num = 0
+    with phase(DB_READ):
+        candidate_index = CandidateIndex.load(supabase) if not dry_run else None
+        manifest = BucketManifest(supabase, "documents") if not dry_run else None
+        content_hashes, hashed_paths = load_content_hashes(supabase) if not dry_run else ({}, {})
+
+    # Document records waiting for the next batch insert: (row, email, record, deduplicated)
+    pending_records = []
+
+    def flush_records():
+        if not pending_records:
+            return
+        with phase(DB_WRITE):
+            results = create_document_records(supabase, [record for _, _, record, _ in pending_records])
+        for (pending_row, email, _, deduplicated), created in zip(pending_records, results):
+            if created:
+                checkpoint["uploaded_count"] += 1
+                if deduplicated:
+                    checkpoint["deduplicated_count"] += 1
+            else:
+                checkpoint["error_count"] += 1
+                errors.append({
+                    "row": pending_row,
+                    "email": email,
+                    "error": "Failed to create document record",
+                })
+        pending_records.clear()
+
+    def save_progress():
+        # The checkpoint covers pending rows, so their records must be written first
+        flush_records()
+        save_checkpoint(checkpoint)
+        save_errors(errors)
+
+    # Sessions of large uploads in progress, saved after every chunk
+    uploader = ResumableUploader(
+        os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_ROLE_KEY"),
+        "documents",
+        checkpoint.setdefault("uploads", {}),
+        on_progress=save_progress,
+    ) if not dry_run else None
+
+    row_num = reader.start_row
     no_candidate = 0
     no_url = 0
     expired_s3_urls = 0
+    already_stored = 0
 
-    with open(documents_csv, "r", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-
+    with reader:
         for row in reader:
             row_num += 1
 
@@ -473,7 +624,7 @@ def import_documents(
                 checkpoint["uploaded_count"] += 1
             else:
                 # Look up candidate
-                candidate = get_candidate_by_email(supabase, candidate_email)
+                candidate = candidate_index.get(candidate_email)
                 if not candidate:
                     checkpoint["skipped_count"] += 1
                     errors.append({
@@ -485,58 +636,82 @@ def import_documents(
 
                 candidate_id = candidate["id"]
 
-                # Download file
-                content = download_file(doc_url)
-                if not content:
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "url": doc_url,
-                        "error": "Failed to download file",
-                    })
-                    continue
-
-                # Upload to storage
                 storage_path = f"{candidate_id}/{doc_type}/{original_filename}"
                 content_type = get_content_type(original_filename)
 
-                if not upload_to_storage(supabase, "documents", storage_path, content, content_type):
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "error": "Failed to upload to storage",
-                    })
-                    continue
-
-                # Create document record
-                file_size = len(content)
-                if not create_document_record(supabase, candidate_id, doc_type, storage_path, original_filename, file_size, content_type):
-                    checkpoint["error_count"] += 1
-                    errors.append({
-                        "row": row_num,
-                        "email": candidate_email,
-                        "error": "Failed to create document record",
-                    })
-                    continue
-
-                checkpoint["uploaded_count"] += 1
+                content_sha256 = None
+                deduplicated = False
+                if manifest.exists(storage_path):
+                    # Uploaded by an earlier run: skip the transfer, the record may still be missing
+                    already_stored += 1
+                    file_size = manifest.size(storage_path)
+                    content_sha256 = hashed_paths.get(storage_path)
+                    if content_sha256 is None:
+                        # Stored before hashes were recorded: hash it once, so copies can share it
+                        with phase(DOWNLOAD):
+                            content_sha256 = hash_stored_file(supabase, storage_path)
+                        if content_sha256:
+                            hashed_paths[storage_path] = content_sha256
+                            content_hashes.setdefault(content_sha256, storage_path)
+                else:
+                    # Download file (streamed; large files are spooled to disk)
+                    with phase(DOWNLOAD):
+                        body = download_file(doc_url)
+                    if not body:
+                        checkpoint["error_count"] += 1
+                        errors.append({
+                            "row": row_num,
+                            "email": candidate_email,
+                            "url": doc_url,
+                            "error": "Failed to download file",
+                        })
+                        continue
+
+                    with body:
+                        file_size = body.size
+                        content_sha256 = body.sha256
+
+                        if content_sha256 in content_hashes:
+                            # Same bytes already imported: point this record at that object
+                            deduplicated = True
+                            storage_path = content_hashes[content_sha256]
+                        else:
+                            # Upload to storage
+                            with phase(UPLOAD):
+                                uploaded = upload_to_storage(supabase, manifest, uploader, storage_path, body, content_type)
+                            if not uploaded:
+                                checkpoint["error_count"] += 1
+                                errors.append({
+                                    "row": row_num,
+                                    "email": candidate_email,
+                                    "error": "Failed to upload to storage",
+                                })
+                                continue
+                            content_hashes[content_sha256] = storage_path
+                            hashed_paths[storage_path] = content_sha256
+
+                # Queue the document record for the next batch insert
+                pending_records.append((row_num, candidate_email, build_document_record(
+                    candidate_id, doc_type, storage_path, original_filename, file_size, content_type, content_sha256
+                ), deduplicated))
+                if len(pending_records) >= RECORD_BATCH_SIZE:
+                    flush_records()
 
             checkpoint["last_processed_row"] = row_num
 
             if row_num % CHECKPOINT_INTERVAL == 0:
-                save_checkpoint(checkpoint)
-                save_errors(errors)
+                checkpoint["resume"] = reader.resume_point(row_num)
+                save_progress()
 
-                progress = (row_num / total_rows) * 100
-                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/{total_rows} ({progress:.1f}%) - "
+                progress = (row_num / total_rows) * 100 if limit else reader.progress() * 100
+                print(f"[{datetime.now().isoformat()}] Progress: {row_num}/~{total_rows} ({progress:.1f}%) - "
                       f"Uploaded: {checkpoint['uploaded_count']}, Skipped: {checkpoint['skipped_count']}, "
                       f"Errors: {checkpoint['error_count']}", flush=True)
 
+    if checkpoint["last_processed_row"] == row_num:
+        checkpoint["resume"] = reader.resume_point(row_num)
     checkpoint["completed_at"] = datetime.now().isoformat()
-    save_checkpoint(checkpoint)
-    save_errors(errors)
+    save_progress()
 
     print("\n" + "=" * 60, flush=True)
     print("DOCUMENTS IMPORT COMPLETE", flush=True)
@@ -547,6 +722,9 @@ def import_documents(
     print(f"  - No candidate email: {no_candidate}", flush=True)
     print(f"  - No document URL: {no_url}", flush=True)
     print(f"  - Expired Vincere S3 URLs: {expired_s3_urls}", flush=True)
+    print(f"Already in storage (download skipped): {already_stored}", flush=True)
+    print(f"Duplicate content (upload skipped, record shares an existing file): "
+          f"{checkpoint['deduplicated_count']}", flush=True)
     print(f"Errors: {checkpoint['error_count']}", flush=True)
     print("=" * 60, flush=True)
 
@@ -571,8 +749,10 @@ def main():
                         help="Limit number of documents to process")
     parser.add_argument("--reset", action="store_true",
                         help="Reset checkpoint and start fresh")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profile(args.profile)
 
     if args.reset:
         if CHECKPOINT_FILE.exists():
@@ -0,0 +1,89 @@
+"""
+Candidate email index shared by the Bubble import scripts
+
+Pages through `candidates` once (id, email, vincere_id, photo_url) and keeps a
+lowercased email → candidate hash in memory, so per-row lookups in
+bubble_import.py, bubble_import_avatars.py and bubble_import_documents.py are
+local dict probes instead of one `ilike` query per email.
+
+Soft-deleted candidates are left out, matching candidates_email_unique_idx
+(migration 023). Importers keep the index current with add() /
+set_photo_url() as they write.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+PAGE_SIZE = 1000  # PostgREST's default max rows per request
+
+# email → (id, vincere_id, photo_url); tuples keep the index compact
+IndexEntry = Tuple[str, Optional[str], Optional[str]]
+
+
+def normalize_email(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
+
+
+class CandidateIndex:
+    """In-memory lowercased email → candidate index"""
+
+    def __init__(self):
+        self._by_email: Dict[str, IndexEntry] = {}
+
+    @classmethod
+    def load(cls, supabase, page_size: int = PAGE_SIZE) -> "CandidateIndex":
+        """Build the index by keyset-paging through all candidates with an email"""
+        index = cls()
+        started = datetime.now()
+        last_id = None
+        pages = 0
+
+        while True:
+            query = (
+                supabase.table("candidates")
+                .select("id,email,vincere_id,photo_url")
+                .is_("deleted_at", "null")
+                .not_.is_("email", "null")
+                .order("id")
+                .limit(page_size)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.execute().data or []
+            pages += 1
+
+            for row in rows:
+                index.add(row["email"], row["id"], row.get("vincere_id"), row.get("photo_url"))
+
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"Loaded candidate index: {len(index)} emails in {pages} pages ({elapsed:.1f}s)", flush=True)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_email)
+
+    def __contains__(self, email: str) -> bool:
+        return normalize_email(email) in self._by_email
+
+    def get(self, email: str) -> Optional[dict]:
+        """Return {id, vincere_id, photo_url} for an email, or None"""
+        entry = self._by_email.get(normalize_email(email))
+        if entry is None:
+            return None
+        candidate_id, vincere_id, photo_url = entry
+        return {"id": candidate_id, "vincere_id": vincere_id, "photo_url": photo_url}
+
+    def add(self, email: str, candidate_id: str, vincere_id: Optional[str] = None, photo_url: Optional[str] = None):
+        email = normalize_email(email)
+        if email:
+            self._by_email[email] = (candidate_id, vincere_id, photo_url)
+
+    def set_photo_url(self, email: str, photo_url: str):
+        email = normalize_email(email)
+        entry = self._by_email.get(email)
+        if entry is not None:
+            self._by_email[email] = (entry[0], entry[1], photo_url)
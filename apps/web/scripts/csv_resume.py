@@ -0,0 +1,124 @@
+"""
+Resumable CSV reading for the Bubble import scripts
+
+ResumableCSVReader yields rows like csv.DictReader but tracks the byte offset
+after each row. The importers store that offset, with a fingerprint of the
+header line, in their checkpoint as a "resume" point:
+
+    {"row": 1200, "byte_offset": 5242880, "header_fingerprint": "3f2a..."}
+
+On restart the reader seeks straight to that offset instead of re-parsing
+every processed row. If the header changed, or the file is now shorter than
+the offset, it warns and falls back to reading from the top (the importers
+then skip rows by count, as before).
+
+estimated_rows is extrapolated from the first MiB of data, so large exports
+don't need a full counting pass before work starts.
+"""
+
+import csv
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ENCODING = "utf-8"
+BOM = b"\xef\xbb\xbf"
+ESTIMATE_SAMPLE_BYTES = 1 << 20  # 1 MiB
+
+
+class ResumableCSVReader:
+    """csv.DictReader equivalent that can start from a saved byte offset"""
+
+    def __init__(self, path: Path, resume: Optional[dict] = None):
+        self.path = Path(path)
+        self.file_size = os.path.getsize(self.path)
+        self._file = open(self.path, "rb")
+        self.offset = 0
+
+        header_reader = csv.reader(self._lines())
+        self.fieldnames: List[str] = next(header_reader, [])
+        self.header_end = self.offset
+        self._file.seek(0)
+        header_bytes = self._file.read(self.header_end)
+        self.header_fingerprint = hashlib.sha256(header_bytes.removeprefix(BOM)).hexdigest()[:16]
+
+        self.start_row = 0
+        self.offset = self.header_end
+        if resume:
+            self._seek_to(resume)
+        self._file.seek(self.offset)
+
+        self.estimated_rows = self._estimate_rows()
+
+    def _seek_to(self, resume: dict):
+        byte_offset = resume.get("byte_offset", 0)
+        if resume.get("header_fingerprint") != self.header_fingerprint:
+            print("  CSV header changed since the checkpoint; re-reading from the top", flush=True)
+        elif not self.header_end <= byte_offset <= self.file_size:
+            print("  CSV is shorter than the checkpoint offset; re-reading from the top", flush=True)
+        else:
+            self.offset = byte_offset
+            self.start_row = resume.get("row", 0)
+
+    def _lines(self) -> Iterator[str]:
+        """Decoded lines (endings kept, as csv expects) that advance self.offset"""
+        for raw in self._file:
+            self.offset += len(raw)
+            if self.offset == len(raw):
+                raw = raw.removeprefix(BOM)
+            yield raw.decode(ENCODING)
+
+    def _estimate_rows(self) -> int:
+        """Estimate the data row count from the average row size of a sample"""
+        data_bytes = self.file_size - self.header_end
+        if data_bytes <= 0:
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(self.header_end)
+            sample = f.read(ESTIMATE_SAMPLE_BYTES)
+        lines = sample.decode(ENCODING, errors="replace").splitlines(keepends=True)
+        if len(sample) < data_bytes:
+            lines = lines[:-1]  # The last sampled line is probably cut short
+        sampled_rows = sum(1 for row in csv.reader(lines) if row)
+        if len(sample) >= data_bytes:
+            return sampled_rows
+        sampled_bytes = sum(len(line.encode(ENCODING, errors="replace")) for line in lines)
+        if not sampled_rows or not sampled_bytes:
+            return 0
+        return round(data_bytes * sampled_rows / sampled_bytes)
+
+    def __iter__(self) -> Iterator[Dict[str, Optional[str]]]:
+        field_count = len(self.fieldnames)
+        for row in csv.reader(self._lines()):
+            if not row:
+                continue
+            record = dict(zip(self.fieldnames, row))
+            if len(row) > field_count:
+                record[None] = row[field_count:]
+            elif len(row) < field_count:
+                for name in self.fieldnames[len(row):]:
+                    record[name] = None
+            yield record
+
+    def progress(self) -> float:
+        """Fraction of the file read so far (0.0 - 1.0)"""
+        return self.offset / self.file_size if self.file_size else 1.0
+
+    def resume_point(self, row_num: int) -> dict:
+        """Checkpoint entry for resuming after `row_num` (the row just read)"""
+        return {
+            "row": row_num,
+            "byte_offset": self.offset,
+            "header_fingerprint": self.header_fingerprint,
+        }
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "ResumableCSVReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,180 @@
+"""
+Resumable (TUS) uploads to Supabase Storage for the Bubble import scripts
+
+Large files go to {SUPABASE_URL}/storage/v1/upload/resumable in fixed-size
+chunks instead of one upload() call. Each chunk is acknowledged by the server
+with the new Upload-Offset, so a dropped connection only costs the chunk in
+flight: the uploader asks the server for its offset (HEAD) and carries on.
+
+Upload sessions are kept in a dict the caller persists in its checkpoint:
+
+    "uploads": {
+        "<storage path>": {
+            "url": "https://.../storage/v1/upload/resumable/...",
+            "size": 20971520,
+            "sha256": "9b1c...",
+            "offset": 12582912,
+            "created_at": "2025-01-01T12:00:00"
+        }
+    }
+
+so an upload interrupted by a crash or Ctrl-C continues from the last
+acknowledged chunk on the next run. A session is only reused for the same
+bytes (size and SHA-256 must match); Supabase expires sessions after 24h, in
+which case a new one is started.
+"""
+
+import base64
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import requests
+
+from streamed_download import DownloadedFile
+
+TUS_VERSION = "1.0.0"
+CHUNK_SIZE = 6 * 1024 * 1024  # Supabase requires 6 MiB chunks (except the last)
+RESUMABLE_UPLOAD_THRESHOLD = CHUNK_SIZE  # Smaller files use a single upload() call
+MAX_CHUNK_RETRIES = 5
+REQUEST_TIMEOUT = 60
+
+
+class UploadExistsError(Exception):
+    """The object is already in the bucket"""
+
+
+def _metadata_header(metadata: dict) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()
+    )
+
+
+class ResumableUploader:
+    """Chunked TUS uploads into one bucket, with sessions kept in `sessions`"""
+
+    def __init__(
+        self,
+        supabase_url: str,
+        service_key: str,
+        bucket: str,
+        sessions: dict,
+        on_progress: Optional[Callable[[], None]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        http=requests,
+    ):
+        self.endpoint = f"{supabase_url.rstrip('/')}/storage/v1/upload/resumable"
+        self.bucket = bucket
+        self.sessions = sessions
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.http = http
+        self.headers = {
+            "Authorization": f"Bearer {service_key}",
+            "apikey": service_key,
+            "Tus-Resumable": TUS_VERSION,
+        }
+
+    def _saved(self):
+        if self.on_progress:
+            self.on_progress()
+
+    def _create(self, path: str, body: DownloadedFile, content_type: str) -> dict:
+        resp = self.http.post(
+            self.endpoint,
+            headers={
+                **self.headers,
+                "Upload-Length": str(body.size),
+                "Upload-Metadata": _metadata_header({
+                    "bucketName": self.bucket,
+                    "objectName": path,
+                    "contentType": content_type,
+                }),
+                "x-upsert": "false",
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        if resp.status_code == 409:
+            raise UploadExistsError(f"{path} already exists")
+        resp.raise_for_status()
+
+        session = {
+            "url": resp.headers["Location"],
+            "size": body.size,
+            "sha256": body.sha256,
+            "offset": 0,
+            "created_at": datetime.now().isoformat(),
+        }
+        self.sessions[path] = session
+        self._saved()
+        return session
+
+    def _server_offset(self, session: dict) -> Optional[int]:
+        """Bytes the server has acknowledged (None if the session is gone)"""
+        resp = self.http.head(session["url"], headers=self.headers, timeout=REQUEST_TIMEOUT)
+        if resp.status_code in (404, 410):
+            return None
+        resp.raise_for_status()
+        return int(resp.headers["Upload-Offset"])
+
+    def _session_for(self, path: str, body: DownloadedFile, content_type: str) -> dict:
+        """Saved session for these bytes, re-synced with the server, or a new one"""
+        session = self.sessions.get(path)
+        if session and session["size"] == body.size and session["sha256"] == body.sha256:
+            offset = self._server_offset(session)
+            if offset is not None:
+                if offset:
+                    print(f"  Resuming upload of {path} at {offset}/{body.size} bytes", flush=True)
+                session["offset"] = offset
+                return session
+        self.sessions.pop(path, None)
+        return self._create(path, body, content_type)
+
+    def upload(self, path: str, body: DownloadedFile, content_type: str):
+        """Upload `body` to `path`, resuming a saved session when there is one
+
+        Raises UploadExistsError if the object is already in the bucket, and
+        the last error if a chunk still fails after MAX_CHUNK_RETRIES; the
+        session is kept so a later run can pick it up.
+        """
+        session = self._session_for(path, body, content_type)
+        retries = 0
+
+        with body.open() as stream:
+            while session["offset"] < body.size:
+                stream.seek(session["offset"])
+                chunk = stream.read(self.chunk_size)
+                try:
+                    resp = self.http.patch(
+                        session["url"],
+                        headers={
+                            **self.headers,
+                            "Upload-Offset": str(session["offset"]),
+                            "Content-Type": "application/offset+octet-stream",
+                        },
+                        data=chunk,
+                        timeout=REQUEST_TIMEOUT,
+                    )
+                    resp.raise_for_status()
+                    session["offset"] = int(resp.headers["Upload-Offset"])
+                    retries = 0
+                except (requests.RequestException, KeyError, ValueError) as e:
+                    retries += 1
+                    if retries > MAX_CHUNK_RETRIES:
+                        raise
+                    print(f"  Chunk upload failed ({e}); retrying {retries}/{MAX_CHUNK_RETRIES}", flush=True)
+                    time.sleep(2 ** retries)
+                    try:
+                        offset = self._server_offset(session)
+                    except requests.RequestException:
+                        continue  # Still unreachable: retry from the offset we have
+                    if offset is None:
+                        # Session expired: start again from scratch
+                        self.sessions.pop(path, None)
+                        session = self._create(path, body, content_type)
+                    else:
+                        session["offset"] = offset
+                self._saved()
+
+        self.sessions.pop(path, None)
+        self._saved()
@@ -0,0 +1,94 @@
+"""
+Supabase Storage bucket manifest for the Bubble import scripts
+
+Answers "does this object already exist?" from local listings instead of
+calling storage.list(folder) before every upload. Each prefix is listed once,
+with pagination, the first time a path under it is checked. A folder missing
+from its parent's listing is known to be empty, so on a fresh import most
+checks need no API call at all.
+
+Uploads made through the manifest are added to it, so the cached listings
+stay current for the rest of the run. refresh() drops one prefix's listing
+so it is re-listed on next use; the importers call it when an upload finds
+an object the listing missed, i.e. another run or process wrote to that
+folder after it was listed. Safe to share between pipeline threads.
+"""
+
+import threading
+from typing import Dict, Optional
+
+LIST_PAGE_SIZE = 1000  # Entries per storage.list() call
+
+
+class BucketManifest:
+    """Lazily listed view of the object paths in one Storage bucket"""
+
+    def __init__(self, supabase, bucket: str, page_size: int = LIST_PAGE_SIZE):
+        self.supabase = supabase
+        self.bucket = bucket
+        self.page_size = page_size
+        self.list_calls = 0
+        # prefix → {name: size in bytes (None for folders)}
+        self._listings: Dict[str, Dict[str, Optional[int]]] = {}
+        self._lock = threading.RLock()
+
+    def _list_prefix(self, prefix: str) -> Dict[str, Optional[int]]:
+        entries: Dict[str, Optional[int]] = {}
+        offset = 0
+        while True:
+            page = self.supabase.storage.from_(self.bucket).list(
+                prefix, {"limit": self.page_size, "offset": offset, "sortBy": {"column": "name", "order": "asc"}}
+            )
+            self.list_calls += 1
+            for entry in page or []:
+                metadata = entry.get("metadata") or {}
+                # Folders come back without an id
+                entries[entry["name"]] = metadata.get("size") if entry.get("id") else None
+            if not page or len(page) < self.page_size:
+                return entries
+            offset += len(page)
+
+    def _listing(self, prefix: str) -> Dict[str, Optional[int]]:
+        """Listing for a prefix, fetched on first use"""
+        listing = self._listings.get(prefix)
+        if listing is not None:
+            return listing
+        if prefix:
+            parent, _, name = prefix.rpartition("/")
+            if name not in self._listing(parent):
+                # Folder doesn't exist yet, so it is empty
+                listing = {}
+        if listing is None:
+            listing = self._list_prefix(prefix)
+        self._listings[prefix] = listing
+        return listing
+
+    def exists(self, path: str) -> bool:
+        with self._lock:
+            prefix, _, name = path.rpartition("/")
+            return name in self._listing(prefix)
+
+    def size(self, path: str) -> Optional[int]:
+        """Stored size of an existing object (None if unknown or missing)"""
+        with self._lock:
+            prefix, _, name = path.rpartition("/")
+            return self._listing(prefix).get(name)
+
+    def add(self, path: str, size: Optional[int] = None):
+        """Record an object we just uploaded"""
+        with self._lock:
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                prefix = "/".join(parts[:depth - 1])
+                if prefix in self._listings:
+                    self._listings[prefix].setdefault(parts[depth - 1], None)
+            prefix = "/".join(parts[:-1])
+            if prefix in self._listings:
+                self._listings[prefix][parts[-1]] = size
+
+    def refresh(self, prefix: str = ""):
+        """Forget a prefix's listing (and those below it) so it is listed again"""
+        with self._lock:
+            for cached in list(self._listings):
+                if cached == prefix or not prefix or cached.startswith(prefix + "/"):
+                    del self._listings[cached]
@@ -0,0 +1,103 @@
+"""
+Streamed downloads with bounded memory for the Bubble import scripts
+
+stream_download() reads the response in chunks, hashing and counting bytes
+as they arrive. Small bodies stay in memory; once a body passes
+SPOOL_THRESHOLD it is spooled to a temp file, so each transfer holds at most
+SPOOL_THRESHOLD bytes in RAM however large the file is.
+
+DownloadedFile.upload_source() hands Storage either the bytes or the temp
+file path; storage3 streams a path from disk in chunks. Always close() the
+result (or use it as a context manager) to remove the temp file.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO, Optional, Union
+
+SPOOL_THRESHOLD = 1 << 20  # 1 MiB kept in memory before spooling to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 16  # 64 KiB
+
+
+class DownloadedFile:
+    """A downloaded body: bytes when small, a temp file when large"""
+
+    def __init__(self, content: Optional[bytes], path: Optional[str], size: int, sha256: str):
+        self.content = content
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    @classmethod
+    def from_bytes(cls, content: bytes) -> "DownloadedFile":
+        """Wrap bytes produced locally (e.g. a re-encoded image)"""
+        return cls(content, None, len(content), hashlib.sha256(content).hexdigest())
+
+    def upload_source(self) -> Union[bytes, str]:
+        """What to pass to storage upload(): bytes, or a path it streams from"""
+        return self.content if self.path is None else self.path
+
+    def read_bytes(self) -> bytes:
+        if self.path is None:
+            return self.content
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def open(self) -> BinaryIO:
+        """A fresh binary stream over the body, for reading it in chunks"""
+        if self.path is None:
+            return io.BytesIO(self.content)
+        return open(self.path, "rb")
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self.content = None
+
+    def __enter__(self) -> "DownloadedFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def stream_download(url: str, http, timeout: float, spool_threshold: int = SPOOL_THRESHOLD) -> DownloadedFile:
+    """Download `url` with `http` (requests or a Session), computing size and SHA-256 on the fly"""
+    hasher = hashlib.sha256()
+    buffer = bytearray()
+    spool = None
+    size = 0
+
+    try:
+        with http.get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                hasher.update(chunk)
+                size += len(chunk)
+                if spool is None and size > spool_threshold:
+                    spool = tempfile.NamedTemporaryFile(prefix="bubble-import-", delete=False)
+                    spool.write(buffer)
+                    buffer = None
+                if spool is None:
+                    buffer.extend(chunk)
+                else:
+                    spool.write(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.remove(spool.name)
+        raise
+
+    if spool is None:
+        return DownloadedFile(bytes(buffer), None, size, hasher.hexdigest())
+    spool.close()
+    return DownloadedFile(None, spool.name, size, hasher.hexdigest())
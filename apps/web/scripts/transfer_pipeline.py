@@ -0,0 +1,171 @@
+"""
+Staged transfer pipeline for the Bubble import scripts
+
+Items flow through a chain of stages (e.g. download → upload → DB update).
+Each stage has its own thread pool, and stages are connected by bounded
+queues, so a slow stage applies backpressure upstream instead of letting work
+pile up in memory. Throughput is limited by the slowest stage rather than by
+the sum of all of them.
+
+Items are plain objects with an `error` attribute. A stage that fails an
+item sets `item.error` (or raises); the item then skips the remaining stages
+and comes out of the pipeline with the error attached.
+
+    pipeline = Pipeline([
+        Stage("download", download, workers=8),
+        Stage("upload", upload, workers=4),
+    ])
+    with pipeline:
+        for item in items:
+            pipeline.submit(item)
+            for done in pipeline.completed():
+                ...
+        pipeline.close()
+        for done in pipeline.drain():
+            ...
+
+RowWatermark turns out-of-order completions back into a checkpointable
+"every row up to N is done" position.
+"""
+
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+DEFAULT_QUEUE_SIZE = 32  # Items buffered between two stages
+
+_DONE = object()
+
+
+class Stage:
+    """One pipeline stage: a function applied to each item by `workers` threads"""
+
+    def __init__(self, name: str, func: Callable[[Any], None], workers: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """Run items through stages connected by bounded queues"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.stages = stages
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        # Bounded implicitly: at most the items in flight in the stages above
+        self._completed = queue.Queue()
+        self._remaining = [stage.workers for stage in stages]
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.in_flight = 0
+
+    def start(self):
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self, index: int):
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        last_stage = index == len(self.stages) - 1
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if item.error is None:
+                try:
+                    stage.func(item)
+                except Exception as e:
+                    item.error = f"{stage.name} failed: {e}"
+            if last_stage:
+                self._completed.put(item)
+            else:
+                self._queues[index + 1].put(item)
+
+        # The last worker out of a stage shuts down the next one
+        with self._lock:
+            self._remaining[index] -= 1
+            finished = self._remaining[index] == 0
+        if finished:
+            if last_stage:
+                self._completed.put(_DONE)
+            else:
+                for _ in range(self.stages[index + 1].workers):
+                    self._queues[index + 1].put(_DONE)
+
+    def submit(self, item: Any):
+        """Queue an item for the first stage (blocks while that queue is full)"""
+        self.in_flight += 1
+        self._queues[0].put(item)
+
+    def completed(self) -> Iterator[Any]:
+        """Yield items that have finished all stages, without blocking"""
+        while True:
+            try:
+                item = self._completed.get_nowait()
+            except queue.Empty:
+                return
+            if item is _DONE:
+                self._completed.put(_DONE)
+                return
+            self.in_flight -= 1
+            yield item
+
+    def close(self):
+        """Stop accepting items; workers exit once the queues are drained"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self.stages[0].workers):
+            self._queues[0].put(_DONE)
+
+    def drain(self) -> Iterator[Any]:
+        """Close the pipeline and yield every remaining item as it finishes"""
+        self.close()
+        while True:
+            item = self._completed.get()
+            if item is _DONE:
+                self._completed.put(_DONE)
+                return
+            self.in_flight -= 1
+            yield item
+
+    def __enter__(self) -> "Pipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class RowWatermark:
+    """Track the highest row number N such that every row up to N is done
+
+    Rows must be added in increasing order. Each row carries an opaque
+    resume point (e.g. a CSV byte offset) returned with the watermark.
+    """
+
+    def __init__(self, start_row: int = 0, resume_point: Optional[dict] = None):
+        self.row = start_row
+        self.resume_point = resume_point
+        self._pending: deque = deque()  # (row, resume_point), in row order
+        self._done = set()
+
+    def add(self, row: int, resume_point: Optional[dict] = None, done: bool = False):
+        self._pending.append((row, resume_point))
+        if done:
+            self.finish(row)
+
+    def finish(self, row: int) -> Tuple[int, Optional[dict]]:
+        self._done.add(row)
+        while self._pending and self._pending[0][0] in self._done:
+            self.row, self.resume_point = self._pending.popleft()
+            self._done.discard(self.row)
+        return self.row, self.resume_point
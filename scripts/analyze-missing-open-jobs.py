@@ -8,9 +8,11 @@ import json
 import csv
 import os
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set
 from supabase import create_client, Client
 
+from raw_records import iter_records
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', 'apps', 'web', '.env.local'))
@@ -57,20 +59,11 @@ def determine_if_open(job_data: Dict) -> bool:
     
     return is_open
 
-def load_vincere_jobs() -> Dict[str, Dict]:
-    """Load jobs from the Python script output"""
-    output_file = os.path.join(os.path.dirname(__file__), 'output', 'vincere-jobs-raw.json')
-    
-    if not os.path.exists(output_file):
-        print(f"❌ Output file not found: {output_file}")
-        print("   Run pull-vincere-jobs.py first!")
-        return {}
-    
-    with open(output_file, 'r') as f:
-        jobs = json.load(f)
-    
-    print(f"✓ Loaded {len(jobs)} jobs from Python script output")
-    return {str(job['job']['id']): job for job in jobs}
+VINCERE_JOBS_FILE = os.path.join(os.path.dirname(__file__), 'output', 'vincere-jobs-raw.json')
+
+def iter_vincere_jobs() -> Iterator[Dict]:
+    """Stream jobs from the Python script output, one record at a time"""
+    return (job for job in iter_records(VINCERE_JOBS_FILE) if job)
 
 def get_db_jobs(supabase: Client) -> Dict[str, Dict]:
     """Get all Vincere jobs from database"""
@@ -91,8 +84,9 @@ def analyze_missing_open_jobs():
     print()
     
     # Load data
-    vincere_jobs = load_vincere_jobs()
-    if not vincere_jobs:
+    if not os.path.exists(VINCERE_JOBS_FILE):
+        print(f"❌ Output file not found: {VINCERE_JOBS_FILE}")
+        print("   Run pull-vincere-jobs.py first!")
         return
     
     supabase = get_supabase_client()
@@ -102,9 +96,14 @@ def analyze_missing_open_jobs():
     print("Analyzing open jobs...")
     print()
     
-    # Find jobs that should be open
+    # Find jobs that should be open, keeping only those out of the streamed records
     should_be_open = []
-    for vincere_id, job_data in vincere_jobs.items():
+    seen_ids = set()
+    for job_data in iter_vincere_jobs():
+        vincere_id = str(job_data['job']['id'])
+        if vincere_id in seen_ids:
+            continue
+        seen_ids.add(vincere_id)
         if determine_if_open(job_data):
             should_be_open.append({
                 'vincere_id': vincere_id,
@@ -115,6 +114,9 @@ def analyze_missing_open_jobs():
                 'status': job_data['job'].get('job_status') or job_data['job'].get('status', 'N/A'),
             })
     
+    print(f"✓ Loaded {len(seen_ids)} jobs from Python script output")
+    if not seen_ids:
+        return
     print(f"✓ Found {len(should_be_open)} jobs that SHOULD be open in Vincere")
     print()
     
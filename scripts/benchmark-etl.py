@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for the Vincere pull scripts and Bubble importers
+
+Each benchmark runs the real script as a subprocess against a fresh
+standin_server.py backend, on a synthetic dataset of each --sizes row count:
+
+    jobs        pull-vincere-jobs.py          search pagination + detail fetch, N jobs
+    placements  pull-vincere-placements.py    placements of N jobs
+    candidates  bubble_import.py              N Bubble candidates into an empty table
+    avatars     bubble_import_avatars.py      N avatars for N existing candidates
+    documents   bubble_import_documents.py    N documents for N existing candidates
+
+and records per run:
+
+    records/sec      input rows / wall time of the script
+    p50/p99 latency  per-request time at the stand-in, injected latency included
+                     (client-side waits, e.g. rate limiting, show in records/sec)
+    peak RSS         max resident set size of the script's process
+    bytes written    files the script wrote + bytes it sent to the backend
+
+Results are saved as JSON in --output-dir. --compare loads an earlier result
+file and prints the change per benchmark and size, exiting non-zero when
+throughput drops (or p99 / peak RSS grow) by more than --threshold percent:
+
+    python scripts/benchmark-etl.py --sizes 1000,10000 --latency 20
+    python scripts/benchmark-etl.py --only candidates,documents --compare output/benchmarks/etl-benchmark-20261001-020000.json
+
+Scripts get BUBBLE_IMPORT_STATE_DIR and their own working directory, so a
+benchmark never touches real checkpoints; VINCERE_HTTP_CACHE is unset so
+every request reaches the backend.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from raw_records import iter_records, write_records
+from standin_server import Database, Faults, StandinServer, SyntheticVincere, jpeg_available, synthetic_email
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+IMPORT_SCRIPTS_DIR = REPO_ROOT / 'apps' / 'web' / 'scripts'
+
+BENCHMARKS = ['jobs', 'placements', 'candidates', 'avatars', 'documents']
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_THRESHOLD = 10.0  # Percent change that counts as a regression
+DEFAULT_TIMEOUT = 4 * 60 * 60  # Seconds per script run
+
+# Synthetic file sizes
+AVATAR_JPEG_SIZE = (1600, 1200)  # Served as a real JPEG when Pillow is installed
+AVATAR_FILLER_BYTES = 250_000  # ... otherwise as filler bytes
+DOCUMENT_BYTES = 60_000
+LARGE_DOCUMENT_BYTES = 7 * 1024 * 1024  # Above the resumable upload threshold
+LARGE_DOCUMENT_EVERY = 500
+DUPLICATE_DOCUMENT_EVERY = 10  # Every Nth document repeats the previous file's bytes
+
+CANDIDATE_POSITIONS = ['Captain', 'Chief Stewardess', 'Deckhand', 'Second Engineer', 'Head Chef', 'Bosun', 'Purser']
+CANDIDATE_SALARIES = ['€4000 - €5000', '5k-6k EUR', '$7,500', '3500', '']
+DOCUMENT_TYPES = ['CV/Resume', 'Passport/ID', 'ENG1', 'STCW', 'Reference', 'Other']
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+
+def write_csv(path: Path, fieldnames: List[str], rows) -> Path:
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def bubble_candidate_rows(size: int, seed: int):
+    """Bubble export rows shaped like bubble-candidates.csv, emails from synthetic_email()"""
+    rng = random.Random(seed)
+    for i in range(1, size + 1):
+        yield {
+            'email': synthetic_email(i).upper() if i % 7 == 0 else synthetic_email(i),
+            'Name First': f'First{i}',
+            'Name Last': f'Last{i}',
+            'Phone Number': f'+33 6 {i:08d}',
+            'DOB': rng.choice([f'Sep {1 + i % 28}, 19{70 + i % 30} 8:30 PM', f'19{70 + i % 30}-0{1 + i % 9}-15', '']),
+            'Gender': rng.choice(['Male', 'Female', '']),
+            'Nationality': rng.choice(['British', 'French', 'South African', 'Australian']),
+            'Positions': rng.choice(CANDIDATE_POSITIONS),
+            'Desired Monthly Salary': rng.choice(CANDIDATE_SALARIES),
+            'Prefered Yacht Size': rng.choice(['40m - 60m', '80 meters', '']),
+            'Desired Location': rng.choice(['Mediterranean, Caribbean', 'Worldwide', '']),
+            'Prefered Contract Type': rng.choice(['Permanent', 'Rotational, Seasonal', '']),
+            'Prefered Yacht Type': rng.choice(['Motor', 'Sail', 'Motor, Catamaran']),
+            'STCW': rng.choice(['yes', 'no']),
+            'ENG 1': rng.choice(['yes', 'no']),
+            'Highest Licence': rng.choice(['Master 3000GT', 'Yachtmaster Offshore', 'None', '']),
+            'Candidate Status': rng.choice(['Available', 'Employed', 'Not available']),
+            'Start Date': rng.choice(['Jun 1, 2026 12:00 AM', '']),
+        }
+
+
+def prepare_jobs(workdir: Path, size: int, server: StandinServer) -> List[str]:
+    return ['--output-dir', 'out', '--workers', '8']
+
+
+def prepare_placements(workdir: Path, size: int, server: StandinServer) -> List[str]:
+    # The jobs file a jobs pull would have written, without spending the requests on it
+    vincere = server.vincere
+    jobs = ({'job': vincere.job(i), 'custom_fields': {}, 'custom_fields_list': []} for i in range(1, size + 1))
+    write_records(str(workdir / 'vincere-jobs-raw.json'), jobs)
+    return ['--output-dir', 'out', '--jobs-file', 'vincere-jobs-raw.json', '--workers', '8']
+
+
+def prepare_candidates(workdir: Path, size: int, server: StandinServer) -> List[str]:
+    rows = list(bubble_candidate_rows(size, server.vincere.seed))
+    candidates_csv = write_csv(workdir / 'bubble-candidates.csv', list(rows[0]), rows)
+    # Half the candidates are already known to Vincere
+    vincere_csv = write_csv(workdir / 'vincere-candidates.csv', ['candidate_id', 'primary_email'], (
+        {'candidate_id': str(i), 'primary_email': synthetic_email(i)} for i in range(1, size + 1, 2)
+    ))
+    return ['--candidates', str(candidates_csv), '--vincere-csv', str(vincere_csv), '--skip-vincere-api', '--no-resume']
+
+
+def prepare_avatars(workdir: Path, size: int, server: StandinServer) -> List[str]:
+    server.database.seed_candidates(size)
+    if jpeg_available():
+        width, height = AVATAR_JPEG_SIZE
+        url = lambda i: f'{server.url}/cdn/jpeg/{width}x{height}/avatar{i}.jpg'
+    else:
+        url = lambda i: f'{server.url}/cdn/{AVATAR_FILLER_BYTES}/avatar{i}.jpg'
+    candidates_csv = write_csv(workdir / 'bubble-candidates.csv', ['email', 'Avatar'], (
+        {'email': synthetic_email(i), 'Avatar': url(i)} for i in range(1, size + 1)
+    ))
+    return ['--candidates', str(candidates_csv), '--no-resume']
+
+
+def prepare_documents(workdir: Path, size: int, server: StandinServer) -> List[str]:
+    server.database.seed_candidates(size)
+
+    def row(i: int) -> Dict[str, str]:
+        file_number = i - 1 if i % DUPLICATE_DOCUMENT_EVERY == 0 else i
+        file_bytes = LARGE_DOCUMENT_BYTES if file_number % LARGE_DOCUMENT_EVERY == 1 else DOCUMENT_BYTES
+        return {
+            'Candidate': synthetic_email(i),
+            'Document File': f'{server.url}/cdn/{file_bytes}/document{file_number}.pdf',
+            'Document Type': DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+        }
+
+    documents_csv = write_csv(workdir / 'bubble-documents.csv', ['Candidate', 'Document File', 'Document Type'],
+                              (row(i) for i in range(1, size + 1)))
+    return ['--documents', str(documents_csv), '--no-resume']
+
+
+def count_raw_records(path: Path) -> int:
+    return sum(1 for _ in iter_records(str(path))) if path.exists() else 0
+
+
+# name → (script, prepare(workdir, size, server) -> script args, rows of output produced)
+BENCHMARK_SPECS: Dict[str, tuple] = {
+    'jobs': (SCRIPTS_DIR / 'pull-vincere-jobs.py', prepare_jobs,
+             lambda workdir, server: count_raw_records(workdir / 'out' / 'vincere-jobs-raw.json')),
+    'placements': (SCRIPTS_DIR / 'pull-vincere-placements.py', prepare_placements,
+                   lambda workdir, server: count_raw_records(workdir / 'out' / 'vincere-placements-raw.json')),
+    'candidates': (IMPORT_SCRIPTS_DIR / 'bubble_import.py', prepare_candidates,
+                   lambda workdir, server: len(server.database.tables['candidates'].rows)),
+    'avatars': (IMPORT_SCRIPTS_DIR / 'bubble_import_avatars.py', prepare_avatars,
+                lambda workdir, server: sum(1 for row in server.database.tables['candidates'].rows.values()
+                                            if row.get('photo_url'))),
+    'documents': (IMPORT_SCRIPTS_DIR / 'bubble_import_documents.py', prepare_documents,
+                  lambda workdir, server: len(server.database.tables['documents'].rows)),
+}
+
+
+# ============================================================================
+# RUNNING
+# ============================================================================
+
+def directory_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def peak_rss_mb(usage) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_benchmark(name: str, size: int, args, workroot: Path) -> Dict[str, Any]:
+    script, prepare, count_output = BENCHMARK_SPECS[name]
+    workdir = workroot / f'{name}-{size}'
+    state_dir = workdir / 'state'
+    state_dir.mkdir(parents=True)
+
+    faults = Faults(args.latency, args.jitter, args.rate_429, args.rate_401, seed=args.seed)
+    with StandinServer(SyntheticVincere(jobs=size, candidates=size, seed=args.seed), Database(),
+                       faults=faults, port=0) as server:
+        script_args = prepare(workdir, size, server)
+        input_bytes = directory_bytes(workdir)
+
+        env = {k: v for k, v in os.environ.items() if k != 'VINCERE_HTTP_CACHE'}
+        env.update(server.env(), BUBBLE_IMPORT_STATE_DIR=str(state_dir), PYTHONUNBUFFERED='1')
+
+        log_path = workdir / 'script.log'
+        print(f"  {name} × {size:,}: running {script.name}...", flush=True)
+        started = time.perf_counter()
+        with open(log_path, 'w') as log:
+            proc = subprocess.Popen([sys.executable, str(script), *script_args],
+                                    cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+            timer = threading.Timer(args.timeout, proc.kill)
+            timer.start()
+            try:
+                # Reaped here rather than by proc.wait() to get the child's own resource usage
+                _, status, usage = os.wait4(proc.pid, 0)
+            finally:
+                timer.cancel()
+        seconds = time.perf_counter() - started
+        exit_code = proc.returncode = os.waitstatus_to_exitcode(status)
+
+        stats = server.stats()
+        output_records = count_output(workdir, server)
+
+    result = {
+        'benchmark': name,
+        'size': size,
+        'ok': exit_code == 0 and output_records > 0,
+        'exit_code': exit_code,
+        'seconds': round(seconds, 3),
+        'records': size,
+        'records_per_sec': round(size / seconds, 2) if seconds else None,
+        'output_records': output_records,
+        'latency_ms': {
+            service: {'count': s['count'], 'p50': round(s['p50_ms'], 2), 'p99': round(s['p99_ms'], 2)}
+            for service, s in stats['latency'].items()
+        },
+        'peak_rss_mb': round(peak_rss_mb(usage), 1),
+        'bytes_written': {
+            'files': directory_bytes(workdir) - input_bytes - log_path.stat().st_size,
+            'uploaded': stats['bytes_in'],
+        },
+        'requests': stats['requests'],
+        'injected': stats['injected'],
+        'log': str(log_path),
+    }
+    latency = result['latency_ms'].get('all', {})
+    print(f"    {'✓' if result['ok'] else '✗'} {seconds:.1f}s, {result['records_per_sec'] or 0:,.1f} rows/s, "
+          f"p50 {latency.get('p50', 0):.1f}ms / p99 {latency.get('p99', 0):.1f}ms, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB, "
+          f"wrote {result['bytes_written']['files'] / 1e6:.1f} MB + uploaded {result['bytes_written']['uploaded'] / 1e6:.1f} MB",
+          flush=True)
+    if not result['ok']:
+        print(f"    exit code {exit_code}, {output_records} output rows; see {log_path}", flush=True)
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+
+# metric → (how to read it from a result, True if higher is better)
+COMPARED_METRICS: Dict[str, tuple] = {
+    'records/sec': (lambda r: r.get('records_per_sec'), True),
+    'p99 ms': (lambda r: r.get('latency_ms', {}).get('all', {}).get('p99'), False),
+    'peak RSS MB': (lambda r: r.get('peak_rss_mb'), False),
+}
+
+
+def compare_results(previous: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the change per benchmark/size; return the regressions beyond `threshold` percent"""
+    baseline = {(r['benchmark'], r['size']): r for r in previous.get('results', [])}
+    regressions = []
+
+    print(f"\nCompared with {previous.get('git_commit') or 'unknown commit'} "
+          f"({previous.get('created_at', '?')}):")
+    for result in current['results']:
+        key = (result['benchmark'], result['size'])
+        before = baseline.get(key)
+        if not before or not before.get('ok') or not result['ok']:
+            continue
+        changes = []
+        for metric, (read, higher_is_better) in COMPARED_METRICS.items():
+            old, new = read(before), read(result)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            flag = ''
+            if worse > threshold:
+                flag = ' ⚠'
+                regressions.append(f"{key[0]} × {key[1]:,}: {metric} {old:g} → {new:g} ({change:+.1f}%)")
+            changes.append(f"{metric} {change:+.1f}%{flag}")
+        print(f"  {key[0]:<11} {key[1]:>9,}  " + ', '.join(changes))
+    return regressions
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def parse_list(value: str, cast: Callable = str) -> list:
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ETL scripts against the local stand-in backend')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help=f'Comma-separated dataset sizes in rows (default: {",".join(str(s) for s in DEFAULT_SIZES)})')
+    parser.add_argument('--only', default=','.join(BENCHMARKS),
+                        help=f'Comma-separated benchmarks to run (default: all of {",".join(BENCHMARKS)})')
+    parser.add_argument('--output-dir', default='output/benchmarks', help='Where result JSON files are written')
+    parser.add_argument('--compare', metavar='FILE', help='Earlier result file to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Percent change counted as a regression with --compare (default: {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic data and injected faults')
+    parser.add_argument('--latency', type=float, default=0, metavar='MS', help='Latency added to every backend request')
+    parser.add_argument('--jitter', type=float, default=0, metavar='MS', help='Extra random backend latency, up to MS')
+    parser.add_argument('--rate-429', type=float, default=0, metavar='P', help='Fraction of Vincere requests answered 429')
+    parser.add_argument('--rate-401', type=float, default=0, metavar='P', help='Fraction of Vincere requests answered 401')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Seconds before a script run is killed')
+    parser.add_argument('--keep-workdir', action='store_true', help='Keep datasets, outputs and logs (always kept on failure)')
+    args = parser.parse_args()
+
+    try:
+        sizes = parse_list(args.sizes, int)
+    except ValueError:
+        parser.error(f'--sizes must be comma-separated integers, got {args.sizes!r}')
+    benchmarks = parse_list(args.only)
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'Unknown benchmark(s): {", ".join(sorted(unknown))}')
+
+    print("=" * 60)
+    print("ETL BENCHMARKS")
+    print("=" * 60)
+    print(f"Benchmarks: {', '.join(benchmarks)}")
+    print(f"Sizes: {', '.join(f'{s:,}' for s in sizes)}")
+    print(f"Backend: {args.latency:g}ms + up to {args.jitter:g}ms latency, "
+          f"429 {args.rate_429:.1%}, 401 {args.rate_401:.1%}\n")
+
+    workroot = Path(tempfile.mkdtemp(prefix='etl-benchmark-'))
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            'latency_ms': args.latency, 'jitter_ms': args.jitter,
+            'rate_429': args.rate_429, 'rate_401': args.rate_401, 'seed': args.seed,
+        },
+        'results': [],
+    }
+    for size in sizes:
+        for name in benchmarks:
+            report['results'].append(run_benchmark(name, size, args, workroot))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    result_file = os.path.join(args.output_dir, f"etl-benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(result_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {result_file}")
+
+    failed = [r for r in report['results'] if not r['ok']]
+    if failed or args.keep_workdir:
+        print(f"Kept work directory: {workroot}")
+    else:
+        shutil.rmtree(workroot, ignore_errors=True)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\n⚠ {len(regressions)} regression(s) beyond {args.threshold:g}%:")
+            for line in regressions:
+                print(f"  {line}")
+
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
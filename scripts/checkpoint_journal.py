@@ -0,0 +1,121 @@
+"""
+Append-only checkpoint journal for the pull scripts
+
+Each fetched record is written once, as one JSON line, to `<name>.jsonl`,
+and fsynced in batches. That replaces rewriting the whole checkpoint every N
+records, which costs O(n^2) bytes over a run.
+
+Resume streams the journal with replay(). A torn final line left by a crash
+mid-write is truncated away, so appends continue from the last complete
+entry.
+
+The journal doubles as on-disk storage for the records it holds: callers
+remember each entry's byte offset (last_offset after append(), or scan()
+on resume) and read_at() it back when writing output, instead of keeping
+every record in memory.
+"""
+
+import os
+import json
+from typing import Dict, Iterator, Tuple
+
+DEFAULT_FSYNC_EVERY = 50  # Entries per fsync batch (0: only on close)
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal, fsynced in batches"""
+
+    def __init__(self, path: str, fsync_every: int = DEFAULT_FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.entries = 0
+        self.last_offset = 0  # Byte offset of the most recently appended entry
+        self._file = None
+        self._reader = None
+        self._pending = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def replay(self) -> Iterator[Dict]:
+        """Stream every complete entry in the journal
+
+        A torn last line (crash mid-write) is truncated so later appends
+        start on a clean line.
+        """
+        for _, entry in self.scan():
+            yield entry
+
+    def scan(self) -> Iterator[Tuple[int, Dict]]:
+        """Like replay(), but yields (byte offset, entry) pairs for read_at()"""
+        if not self.exists():
+            return
+        good_offset = 0
+        self.entries = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                offset = good_offset
+                good_offset += len(line)
+                self.entries += 1
+                yield offset, entry
+        if good_offset < os.path.getsize(self.path):
+            print(f"  ⚠ Truncating torn entry at end of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def open(self):
+        """Open the journal for appending"""
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._file = open(self.path, 'ab')
+
+    def append(self, entry: Dict) -> bool:
+        """Append one entry. Returns True if this append triggered an fsync."""
+        if self._file is None:
+            self.open()
+        self.last_offset = self._file.tell()
+        self._file.write((json.dumps(entry, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+        self.entries += 1
+        self._pending += 1
+        if self.fsync_every and self._pending >= self.fsync_every:
+            self.sync()
+            return True
+        return False
+
+    def sync(self):
+        """Flush and fsync pending entries"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def read_at(self, offset: int) -> Dict:
+        """Read back the entry starting at byte `offset`"""
+        if self._file is not None:
+            self._file.flush()
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def remove(self):
+        """Delete the journal (after a successful run)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
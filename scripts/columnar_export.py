@@ -0,0 +1,174 @@
+"""
+Columnar (Parquet) export for the Vincere pull scripts
+
+Writes typed, zstd-compressed Parquet files next to the summary CSVs so
+analysis tools (pandas, DuckDB, Polars, ...) can read only the columns and
+row groups they need instead of re-parsing the raw JSON dumps.
+
+Columns are declared as (name, kind) pairs; values are coerced per kind as
+rows are written, so callers can pass raw Vincere values (numeric strings,
+ISO dates, ...). Rows are buffered and flushed as one row group per batch.
+
+pyarrow is optional: when it is not installed, columnar_available() returns
+False and the pull scripts skip this export.
+"""
+
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency
+    pa = None
+    pq = None
+
+PARQUET_COMPRESSION = 'zstd'
+DEFAULT_BATCH_ROWS = 5000  # Rows per Parquet row group
+
+Columns = Sequence[Tuple[str, str]]
+
+
+def columnar_available() -> bool:
+    return pa is not None
+
+
+def column_name(label: str) -> str:
+    """Turn a display label like 'Holiday Package' into 'holiday_package'"""
+    return re.sub(r'[^0-9a-z]+', '_', label.lower()).strip('_')
+
+
+def to_int(value: Any) -> Optional[int]:
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+def to_float(value: Any) -> Optional[float]:
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_bool(value: Any) -> Optional[bool]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1')
+    return bool(value)
+
+
+def to_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def to_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a Vincere date/timestamp (ISO string or epoch millis) as UTC"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def to_int_list(value: Any) -> Optional[List[int]]:
+    if value is None:
+        return None
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [v for v in (to_int(item) for item in values) if v is not None]
+
+
+CONVERTERS = {
+    'int': to_int,
+    'float': to_float,
+    'bool': to_bool,
+    'str': to_str,
+    'timestamp': to_timestamp,
+    'int_list': to_int_list,
+}
+
+
+def arrow_type(kind: str):
+    return {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'str': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'int_list': pa.list_(pa.int64()),
+    }[kind]
+
+
+class ColumnarWriter:
+    """Stream rows into a Parquet file
+
+    Writes go to a temp file, which replaces the target on a clean close.
+
+        with ColumnarWriter(path, [('id', 'int'), ('created', 'timestamp')]) as writer:
+            writer.write({'id': '42', 'created': '2024-01-01T00:00:00Z'})
+    """
+
+    def __init__(self, path: str, columns: Columns, batch_rows: int = DEFAULT_BATCH_ROWS):
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed (pip install pyarrow)")
+        self.path = path
+        self.temp_path = path + '.tmp'
+        self.columns = list(columns)
+        self.batch_rows = batch_rows
+        self.schema = pa.schema([(name, arrow_type(kind)) for name, kind in self.columns])
+        self.count = 0
+        self._buffers: Dict[str, List[Any]] = {name: [] for name, _ in self.columns}
+        self._buffered = 0
+        self._writer = None
+
+    def __enter__(self) -> 'ColumnarWriter':
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._writer = pq.ParquetWriter(self.temp_path, self.schema, compression=PARQUET_COMPRESSION)
+        return self
+
+    def write(self, row: Dict[str, Any]):
+        for name, kind in self.columns:
+            self._buffers[name].append(CONVERTERS[kind](row.get(name)))
+        self._buffered += 1
+        self.count += 1
+        if self._buffered >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._buffers, schema=self.schema)
+        self._writer.write_table(table)
+        self._buffers = {name: [] for name, _ in self.columns}
+        self._buffered = 0
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._writer.close()
+            os.remove(self.temp_path)
+            return False
+        self._flush()
+        self._writer.close()
+        os.replace(self.temp_path, self.path)
+        return False
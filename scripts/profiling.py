@@ -0,0 +1,324 @@
+"""
+Built-in profiling for the pull and import scripts (--profile)
+
+Every ETL script accepts `--profile [DIR]` (default dir: profiles/). A
+profiled run writes three files named after the script and start time:
+
+- <script>-<ts>.pstats       cProfile data, merged across threads; open with
+                             `python -m pstats`, snakeviz, etc.
+- <script>-<ts>.folded       Sampled stacks in folded format, one line per
+                             distinct stack; feed to flamegraph.pl, inferno
+                             or speedscope for a flame graph
+- <script>-<ts>-phases.json  Wall time per phase (auth, search pagination,
+                             detail fetch, CSV mapping, upload, DB write, ...)
+
+and prints the phase table and the top functions when the process exits.
+
+The sampler records wall-clock stacks of every thread, so time spent
+blocked on a socket shows up under the call that made the request, next to
+CPU-bound code such as the CSV mapping regexes. The phase table gives the
+same split per phase: `cpu` is thread CPU time inside the phase, `wait` is
+the rest (network, disk, locks).
+
+Phases are marked in code with `with phase(AUTH): ...`. When profiling is
+off phase() returns a shared no-op context manager, so the markers can stay
+in hot paths. Phases may nest or run on several threads at once; `wall`
+counts each moment once, `thread` sums over threads.
+
+Work done in child processes (e.g. the avatar image workers) is not
+profiled.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import cProfile
+import pstats
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_SAMPLE_INTERVAL = 0.01  # Seconds between stack samples
+TOP_FUNCTIONS = 15  # Rows of the cumulative-time listing printed at exit
+
+# Phase names shared by the scripts, so reports line up across them
+AUTH = 'auth'
+SEARCH = 'search pagination'
+DETAIL = 'detail fetch'
+MAPPING = 'CSV mapping'
+DOWNLOAD = 'download'
+NORMALIZE = 'image normalize'
+UPLOAD = 'upload'
+DB_READ = 'DB read'
+DB_WRITE = 'DB write'
+
+_NULL_PHASE = nullcontext()
+_active: Optional['Profiler'] = None
+
+
+class PhaseTotals:
+    """Accumulated timings for one phase"""
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0  # Time with at least one thread inside the phase
+        self.thread_seconds = 0.0  # Summed over threads
+        self.cpu_seconds = 0.0  # Thread CPU time inside the phase
+        self.active = 0
+        self.opened_at = 0.0
+
+    def to_dict(self, total_wall: float) -> Dict:
+        return {
+            'calls': self.calls,
+            'wall_seconds': round(self.wall, 4),
+            'wall_percent': round(100 * self.wall / total_wall, 2) if total_wall else 0.0,
+            'thread_seconds': round(self.thread_seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'wait_seconds': round(max(self.thread_seconds - self.cpu_seconds, 0.0), 4),
+        }
+
+
+class _Phase:
+    """Context manager timing one pass through a phase"""
+
+    __slots__ = ('profiler', 'name', 'started', 'cpu_started')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.profiler._phase_opened(self.name, self.started)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._phase_closed(self.name, self.started, self.cpu_started)
+        return False
+
+
+def _frame_label(code) -> str:
+    label = f'{os.path.basename(code.co_filename)}:{code.co_name}'
+    return label.replace(' ', '_').replace(';', '_')
+
+
+def _thread_label(name: str) -> str:
+    """'ThreadPoolExecutor-0_3' → 'ThreadPoolExecutor', 'upload-2' → 'upload'"""
+    return re.sub(r'[-_]\d+', '', name).replace(' ', '_').replace(';', '_') or 'thread'
+
+
+class Profiler:
+    """cProfile per thread, a wall-clock stack sampler and phase timers for one run"""
+
+    def __init__(self, directory: str, name: str, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.directory = directory
+        self.name = name
+        self.interval = interval
+        self.phases: Dict[str, PhaseTotals] = {}
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stop_sampling = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+
+        # Threads started from here on each get their own profile (see _profile_thread)
+        threading.setprofile(self._profile_thread)
+        main_profile = cProfile.Profile()
+        self._profiles.append(main_profile)
+        main_profile.enable()
+        os.register_at_fork(after_in_child=self._forked)
+
+    def _profile_thread(self, frame, event, arg):
+        """Installed by threading.setprofile; swaps itself for a cProfile profiler on a thread's first event"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles through sys.monitoring, where the main
+            # thread's profiler already sees every thread
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._profiles.append(profile)
+
+    def _forked(self):
+        """A forked worker (e.g. a process pool) inherits the forking thread's profiler; turn it off"""
+        global _active
+        self._stopped = True
+        threading.setprofile(None)
+        for profile in self._profiles:
+            profile.disable()
+        sys.setprofile(None)
+        _active = None
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop_sampling.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(_thread_label(names.get(ident, 'thread')))
+                self.samples[';'.join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def _phase_opened(self, name: str, now: float):
+        with self._lock:
+            totals = self.phases.get(name)
+            if totals is None:
+                totals = self.phases[name] = PhaseTotals()
+            if totals.active == 0:
+                totals.opened_at = now
+            totals.active += 1
+            totals.calls += 1
+
+    def _phase_closed(self, name: str, started: float, cpu_started: float):
+        now = time.perf_counter()
+        cpu = time.thread_time() - cpu_started
+        with self._lock:
+            totals = self.phases[name]
+            totals.active -= 1
+            totals.thread_seconds += now - started
+            totals.cpu_seconds += cpu
+            if totals.active == 0:
+                totals.wall += now - totals.opened_at
+
+    def stop(self):
+        """Stop collecting, write the profile files and print the report (once)"""
+        if self._stopped:
+            return
+        self._stopped = True
+        wall = time.perf_counter() - self._wall_started
+        cpu = time.process_time() - self._cpu_started
+
+        threading.setprofile(None)
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+        # Phases still open (e.g. the run was interrupted) count up to now
+        now = time.perf_counter()
+        for totals in self.phases.values():
+            if totals.active:
+                totals.wall += now - totals.opened_at
+
+        stats = self._merged_stats()
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{self.name}-{self.started_at.strftime('%Y%m%d-%H%M%S')}")
+        paths = []
+
+        if stats is not None:
+            stats.dump_stats(f'{base}.pstats')
+            paths.append(f'{base}.pstats')
+
+        with open(f'{base}.folded', 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+        paths.append(f'{base}.folded')
+
+        report = {
+            'script': self.name,
+            'argv': sys.argv[1:],
+            'started_at': self.started_at.isoformat(),
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(cpu, 4),
+            'sample_interval': self.interval,
+            'samples': self.sample_count,
+            'phases': {name: totals.to_dict(wall) for name, totals in self.phases.items()},
+        }
+        with open(f'{base}-phases.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        paths.append(f'{base}-phases.json')
+
+        self._print_report(report, stats, paths)
+
+    def _merged_stats(self) -> Optional[pstats.Stats]:
+        stats = None
+        for profile in self._profiles:
+            profile.disable()
+            try:
+                thread_stats = pstats.Stats(profile)
+            except TypeError:  # Thread never ran any profiled code
+                continue
+            if stats is None:
+                stats = thread_stats
+            else:
+                stats.add(thread_stats)
+        return stats
+
+    def _print_report(self, report: Dict, stats: Optional[pstats.Stats], paths: List[str]):
+        print("\n" + "="*60)
+        print(f"PROFILE: {self.name}")
+        print("="*60)
+        print(f"Wall time: {report['wall_seconds']:.2f}s, process CPU: {report['cpu_seconds']:.2f}s")
+        if report['phases']:
+            print(f"\n{'Phase':<20} {'wall s':>9} {'% wall':>7} {'thread s':>9} {'cpu s':>9} {'wait s':>9} {'calls':>8}")
+            ordered = sorted(report['phases'].items(), key=lambda item: -item[1]['wall_seconds'])
+            for name, phase_report in ordered:
+                print(f"{name:<20} {phase_report['wall_seconds']:>9.2f} {phase_report['wall_percent']:>6.1f}% "
+                      f"{phase_report['thread_seconds']:>9.2f} {phase_report['cpu_seconds']:>9.2f} "
+                      f"{phase_report['wait_seconds']:>9.2f} {phase_report['calls']:>8}")
+            print("(phases can nest or overlap, so % wall need not add up to 100)")
+        if stats is not None:
+            print(f"\nTop {TOP_FUNCTIONS} functions by cumulative time:")
+            stats.stream = sys.stdout
+            stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        print("Profile written to:")
+        for path in paths:
+            print(f"  {path}")
+        sys.stdout.flush()
+
+
+def add_profile_argument(parser):
+    """Add the shared --profile [DIR] option to a script's argument parser"""
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, metavar='DIR',
+                        help=f'Profile the run: write cProfile stats, sampled stacks for a flame graph and '
+                             f'per-phase wall times to DIR (default: {DEFAULT_PROFILE_DIR})')
+
+
+def start_profile(directory: Optional[str], name: Optional[str] = None) -> Optional[Profiler]:
+    """Start profiling for the rest of the process when --profile was given
+
+    Returns None (profiling off) when `directory` is empty. The report is
+    written at interpreter exit, so early returns and Ctrl-C are covered.
+    """
+    global _active
+    if not directory or _active is not None:
+        return _active
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+    _active = Profiler(directory, name)
+    atexit.register(_active.stop)
+    _active.start()
+    return _active
+
+
+def phase(name: str):
+    """Context manager attributing the enclosed time to `name` (no-op when not profiling)"""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name)
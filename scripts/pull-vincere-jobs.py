@@ -18,12 +18,25 @@ import os
 import json
 import csv
 import argparse
+import asyncio
 import urllib.parse
-from typing import Dict, List, Optional, Any
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
-import requests
 from dotenv import load_dotenv
 
+from checkpoint_journal import CheckpointJournal
+from columnar_export import ColumnarWriter, column_name, columnar_available
+from profiling import DB_READ, DETAIL, MAPPING, SEARCH, add_profile_argument, phase, start_profile
+from raw_records import RawRecordWriter, iter_records
+from response_cache import DEFAULT_RESPONSE_CACHE, ResponseCache, open_response_cache
+from vincere_client import (
+    VincereClient, AsyncVincereClient, AdaptiveRateLimiter, url_for,
+    DEFAULT_POOL_MAXSIZE, DEFAULT_MAX_IN_FLIGHT, DEFAULT_INITIAL_RATE, DEFAULT_MAX_RATE,
+)
+
 # Load environment variables from multiple possible locations
 # Try current directory, parent directory, and apps/web directory
 env_paths = [
@@ -40,10 +53,6 @@ else:
     # Fallback to default dotenv behavior
     load_dotenv()
 
-# Vincere API URLs
-AUTH_URL = 'https://id.vincere.io/oauth2/token'
-API_BASE_URL = 'https://lighthouse-careers.vincere.io/api/v2'
-
 # Known custom field keys (from apps/web/lib/vincere/constants.ts)
 KNOWN_JOB_FIELD_KEYS = {
     'f8b2c1ddc995fb699973598e449193c3': 'Yacht',
@@ -57,130 +66,61 @@ KNOWN_JOB_FIELD_KEYS = {
 }
 
 
-class VincereClient:
-    """Vincere API client with authentication"""
-    
-    def __init__(self, client_id: Optional[str] = None, api_key: Optional[str] = None, refresh_token: Optional[str] = None):
-        self.client_id = client_id or os.getenv('VINCERE_CLIENT_ID')
-        self.api_key = api_key or os.getenv('VINCERE_API_KEY')
-        self.refresh_token = refresh_token or os.getenv('VINCERE_REFRESH_TOKEN')
-        
-        if not self.client_id or not self.api_key or not self.refresh_token:
-            raise ValueError(
-                'Missing required Vincere configuration. '
-                'Ensure VINCERE_CLIENT_ID, VINCERE_API_KEY, and VINCERE_REFRESH_TOKEN are set.'
-            )
-        
-        self.id_token: Optional[str] = None
-        self.token_expires_at: int = 0
-    
-    def authenticate(self) -> str:
-        """Authenticate with Vincere using OAuth2 refresh token flow"""
-        data = {
-            'client_id': self.client_id,
-            'grant_type': 'refresh_token',
-            'refresh_token': self.refresh_token,
-        }
-        
-        response = requests.post(AUTH_URL, data=data)
-        
-        if not response.ok:
-            raise Exception(f'Vincere authentication failed: {response.status_code} {response.text}')
-        
-        result = response.json()
-        
-        if 'id_token' not in result:
-            raise Exception('No id_token returned from Vincere authentication')
-        
-        self.id_token = result['id_token']
-        # Token expires in 1 hour, but refresh 5 minutes early
-        expires_in = result.get('expires_in', 3600)
-        self.token_expires_at = int(datetime.now().timestamp() * 1000) + ((expires_in - 300) * 1000)
-        
-        return self.id_token
-    
-    def _get_token(self) -> str:
-        """Get a valid token, refreshing if necessary"""
-        current_time = int(datetime.now().timestamp() * 1000)
-        if not self.id_token or current_time >= self.token_expires_at:
-            self.authenticate()
-        return self.id_token
-    
-    def request(self, method: str, endpoint: str, data: Optional[Dict] = None, retry_on_auth_error: bool = True) -> Any:
-        """Make an authenticated request to the Vincere API"""
-        token = self._get_token()
-        
-        url = endpoint if endpoint.startswith('http') else f'{API_BASE_URL}{endpoint}'
-        
-        headers = {
-            'accept': 'application/json',
-            'id-token': token,
-            'x-api-key': self.api_key,
-        }
-        
-        if data and method in ('POST', 'PUT', 'PATCH'):
-            headers['Content-Type'] = 'application/json'
-            response = requests.request(method, url, headers=headers, json=data)
-        else:
-            response = requests.request(method, url, headers=headers)
-        
-        # Handle token expiration - retry once with fresh token
-        if response.status_code == 401 and retry_on_auth_error:
-            self.id_token = None
-            self.token_expires_at = 0
-            return self.request(method, endpoint, data, retry_on_auth_error=False)
-        
-        if not response.ok:
-            raise Exception(f'Vincere API error: {response.status_code} {response.reason} - {response.text}')
-        
-        # Handle empty responses
-        text = response.text
-        if not text:
-            return {}
-        
-        return response.json()
-    
-    def get(self, endpoint: str) -> Any:
-        """GET request helper"""
-        return self.request('GET', endpoint)
-    
-    def post(self, endpoint: str, data: Optional[Dict] = None) -> Any:
-        """POST request helper"""
-        return self.request('POST', endpoint, data)
+SYNC_STATE_FILE = '.vincere-jobs-state.json'  # (id, last_update) from the last run, for --incremental
+PREVIOUS_JOBS_SPOOL = '.vincere-jobs-previous.jsonl'  # Last run's raw records, indexed for the --incremental merge
+
+SEARCH_FIELDS = 'id,job_title,company_name,created_date,last_update,job_status'
+SEARCH_PAGE_SIZE = 25  # Vincere's default/max page size
+
+# Vincere search requires a query - try different approaches
+# Based on TypeScript code, we can use industry_id filters, but we want ALL jobs
+# Let's try a query that matches all jobs by using a very broad range
+SEARCH_QUERY_ATTEMPTS = [
+    ("id:[1 TO *]", "Broad ID range query"),
+    ("*:*", "Match all query"),
+    ("job_title:*", "Any job title"),
+]
+
+
+def build_search_url(query: Optional[str], start: int, page_size: int = SEARCH_PAGE_SIZE) -> str:
+    """Build a /position/search URL. An empty query searches without a q parameter."""
+    if query:
+        encoded_query = urllib.parse.quote(query)
+        return (
+            f'/position/search'
+            f'/fl={SEARCH_FIELDS}'
+            f'?q={encoded_query}'
+            f'&start={start}'
+            f'&limit={page_size}'
+        )
+    return (
+        f'/position/search'
+        f'/fl={SEARCH_FIELDS}'
+        f'?start={start}&limit={page_size}'
+    )
 
 
-def fetch_all_jobs(client: VincereClient) -> List[Dict]:
-    """Fetch ALL jobs from Vincere with NO filters"""
+def fetch_all_jobs(client: VincereClient) -> Tuple[List[Dict], int]:
+    """Fetch ALL jobs from Vincere with NO filters
+
+    Returns (jobs, total reported by the search). Pagination stops at the
+    first failed page, so fewer jobs than the total means the list is
+    truncated.
+    """
     print("Fetching all jobs from Vincere (no filters)...")
     
     all_jobs = []
     start = 0
-    page_size = 25  # Vincere's default/max page size
+    page_size = SEARCH_PAGE_SIZE
     total = None
     
-    # Vincere search requires a query - try different approaches
-    # Based on TypeScript code, we can use industry_id filters, but we want ALL jobs
-    # Let's try a query that matches all jobs by using a very broad range
-    query_attempts = [
-        ("id:[1 TO *]", "Broad ID range query"),
-        ("*:*", "Match all query"),
-        ("job_title:*", "Any job title"),
-    ]
-    
     query = None
     query_description = None
     
-    for query_str, desc in query_attempts:
+    for query_str, desc in SEARCH_QUERY_ATTEMPTS:
         try:
             print(f"  Trying query: {desc} ({query_str})...")
-            encoded_query = urllib.parse.quote(query_str)
-            search_url = (
-                f'/position/search'
-                f'/fl=id,job_title,company_name,created_date,last_update,job_status'
-                f'?q={encoded_query}'
-                f'&start=0'
-                f'&limit={page_size}'
-            )
+            search_url = build_search_url(query_str, 0, page_size)
             
             print(f"  URL: {search_url}")
             result = client.get(search_url)
@@ -201,19 +141,16 @@ def fetch_all_jobs(client: VincereClient) -> List[Dict]:
     if not query:
         print("  ERROR: Could not find a working query. Trying without query parameter...")
         try:
-            search_url = (
-                f'/position/search'
-                f'/fl=id,job_title,company_name,created_date,last_update,job_status'
-                f'?start=0&limit={page_size}'
-            )
+            search_url = build_search_url("", 0, page_size)
             result = client.get(search_url)
             if result and 'result' in result:
                 query = ""  # Empty string to indicate no query needed
+                total = result['result'].get('total', 0)
                 print("  ✓ Success without query parameter!")
         except Exception as e:
             print(f"  ✗ Also failed: {e}")
             print("  ERROR: Cannot fetch jobs - all query attempts failed")
-            return []
+            return [], 0
     
     # Now paginate through all results
     print(f"\n  Using query: {query_description or 'no query'}")
@@ -221,22 +158,7 @@ def fetch_all_jobs(client: VincereClient) -> List[Dict]:
     
     while True:
         try:
-            if query:
-                encoded_query = urllib.parse.quote(query)
-                search_url = (
-                    f'/position/search'
-                    f'/fl=id,job_title,company_name,created_date,last_update,job_status'
-                    f'?q={encoded_query}'
-                    f'&start={start}'
-                    f'&limit={page_size}'
-                )
-            else:
-                search_url = (
-                    f'/position/search'
-                    f'/fl=id,job_title,company_name,created_date,last_update,job_status'
-                    f'?start={start}&limit={page_size}'
-                )
-            
+            search_url = build_search_url(query, start, page_size)
             result = client.get(search_url)
             
             if not result or 'result' not in result:
@@ -268,7 +190,31 @@ def fetch_all_jobs(client: VincereClient) -> List[Dict]:
             break
     
     print(f"\n✓ Total jobs found: {len(all_jobs)}")
-    return all_jobs
+    return all_jobs, total or 0
+
+
+def normalize_custom_fields(custom_fields_response: Any) -> List[Dict]:
+    """Extract the custom field list from a /customfields response"""
+    if isinstance(custom_fields_response, list):
+        return custom_fields_response
+    if isinstance(custom_fields_response, dict) and 'data' in custom_fields_response:
+        return custom_fields_response['data']
+    return []
+
+
+def build_job_record(job: Dict, custom_fields: List[Dict]) -> Dict:
+    """Build the raw job record stored in vincere-jobs-raw.json"""
+    # Index custom fields by key for easy lookup
+    custom_fields_dict = {}
+    for field in custom_fields:
+        if 'key' in field:
+            custom_fields_dict[field['key']] = field
+    
+    return {
+        'job': job,
+        'custom_fields': custom_fields_dict,
+        'custom_fields_list': custom_fields,
+    }
 
 
 def fetch_job_with_custom_fields(client: VincereClient, job_id: int) -> Dict:
@@ -280,31 +226,144 @@ def fetch_job_with_custom_fields(client: VincereClient, job_id: int) -> Dict:
         # Fetch all custom fields
         custom_fields = []
         try:
-            custom_fields_response = client.get(f'/position/{job_id}/customfields')
-            if isinstance(custom_fields_response, list):
-                custom_fields = custom_fields_response
-            elif isinstance(custom_fields_response, dict) and 'data' in custom_fields_response:
-                custom_fields = custom_fields_response['data']
+            custom_fields = normalize_custom_fields(client.get(f'/position/{job_id}/customfields'))
         except Exception as e:
             # Some jobs might not have custom fields
             print(f"  Warning: Could not fetch custom fields for job {job_id}: {e}")
         
-        # Index custom fields by key for easy lookup
-        custom_fields_dict = {}
-        for field in custom_fields:
-            if 'key' in field:
-                custom_fields_dict[field['key']] = field
-        
-        return {
-            'job': job,
-            'custom_fields': custom_fields_dict,
-            'custom_fields_list': custom_fields,
-        }
+        return build_job_record(job, custom_fields)
     except Exception as e:
         print(f"Error fetching job {job_id}: {e}")
         return None
 
 
+def iter_jobs_with_custom_fields(
+    client: VincereClient,
+    pending: List[Tuple[int, Any]],
+    workers: int = 1,
+) -> Iterator[Tuple[int, Any, Optional[Dict]]]:
+    """Fetch details for (index, job_id) pairs, yielding results in input order.
+
+    With workers > 1 the fetches run on a bounded thread pool. At most
+    workers * 2 requests are in flight at once, and results are yielded in the
+    same order as `pending` so checkpoints stay deterministic.
+    """
+    if workers <= 1:
+        for i, job_id in pending:
+            yield i, job_id, fetch_job_with_custom_fields(client, job_id)
+        return
+
+    max_in_flight = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for i, job_id in pending:
+            in_flight.append((i, job_id, executor.submit(fetch_job_with_custom_fields, client, job_id)))
+            if len(in_flight) >= max_in_flight:
+                head_i, head_id, future = in_flight.popleft()
+                yield head_i, head_id, future.result()
+        while in_flight:
+            head_i, head_id, future = in_flight.popleft()
+            yield head_i, head_id, future.result()
+
+
+async def fetch_all_jobs_async(client: AsyncVincereClient) -> Tuple[List[Dict], int]:
+    """Async variant of fetch_all_jobs
+
+    Finds a working query the same way, then requests the remaining pages
+    concurrently once the total is known from the first page, with at most
+    client.max_in_flight pages scheduled at a time.
+    """
+    print("Fetching all jobs from Vincere (no filters, async)...")
+    
+    first_page = None
+    query = None
+    for query_str, desc in SEARCH_QUERY_ATTEMPTS + [("", "No query parameter")]:
+        try:
+            print(f"  Trying query: {desc} ({query_str})...")
+            result = await client.get(build_search_url(query_str, 0))
+            if result and 'result' in result:
+                first_page = result['result']
+                query = query_str
+                print(f"  ✓ Success! Found {first_page.get('total', 0)} total jobs")
+                break
+            print(f"  ✗ Unexpected response format")
+        except Exception as e:
+            print(f"  ✗ Failed: {e}")
+    
+    if first_page is None:
+        print("  ERROR: Cannot fetch jobs - all query attempts failed")
+        return [], 0
+    
+    all_jobs = list(first_page.get('items', []))
+    total = first_page.get('total', 0)
+    starts = list(range(SEARCH_PAGE_SIZE, total, SEARCH_PAGE_SIZE))
+    
+    async def fetch_page(start: int) -> List[Dict]:
+        try:
+            result = await client.get(build_search_url(query, start))
+            return result.get('result', {}).get('items', []) if result else []
+        except Exception as e:
+            print(f"  Error fetching jobs at start={start}: {e}")
+            return []
+    
+    # Bounded look-ahead; pages are collected in order
+    in_flight = deque()
+    for start in starts:
+        in_flight.append(asyncio.ensure_future(fetch_page(start)))
+        if len(in_flight) >= client.max_in_flight:
+            all_jobs.extend(await in_flight.popleft())
+    while in_flight:
+        all_jobs.extend(await in_flight.popleft())
+    
+    print(f"\n✓ Total jobs found: {len(all_jobs)}")
+    return all_jobs, total
+
+
+async def fetch_job_with_custom_fields_async(client: AsyncVincereClient, job_id: int) -> Optional[Dict]:
+    """Async variant of fetch_job_with_custom_fields (both calls run concurrently)"""
+    job_result, custom_fields_result = await asyncio.gather(
+        client.get(f'/position/{job_id}'),
+        client.get(f'/position/{job_id}/customfields'),
+        return_exceptions=True,
+    )
+    
+    if isinstance(job_result, Exception):
+        print(f"Error fetching job {job_id}: {job_result}")
+        return None
+    
+    custom_fields = []
+    if isinstance(custom_fields_result, Exception):
+        # Some jobs might not have custom fields
+        print(f"  Warning: Could not fetch custom fields for job {job_id}: {custom_fields_result}")
+    else:
+        custom_fields = normalize_custom_fields(custom_fields_result)
+    
+    return build_job_record(job_result, custom_fields)
+
+
+def iter_jobs_with_custom_fields_async(
+    loop: asyncio.AbstractEventLoop,
+    client: AsyncVincereClient,
+    pending: List[Tuple[int, Any]],
+    max_in_flight: int,
+) -> Iterator[Tuple[int, Any, Optional[Dict]]]:
+    """Async counterpart of iter_jobs_with_custom_fields
+
+    Drives `loop` from a plain generator so main() keeps a single checkpoint
+    loop. Up to max_in_flight jobs are scheduled ahead of the one being
+    yielded; results come back in input order.
+    """
+    in_flight = deque()
+    for i, job_id in pending:
+        in_flight.append((i, job_id, loop.create_task(fetch_job_with_custom_fields_async(client, job_id))))
+        if len(in_flight) >= max_in_flight:
+            head_i, head_id, task = in_flight.popleft()
+            yield head_i, head_id, loop.run_until_complete(task)
+    while in_flight:
+        head_i, head_id, task = in_flight.popleft()
+        yield head_i, head_id, loop.run_until_complete(task)
+
+
 def compare_with_database(vincere_jobs: List[Dict], supabase_url: Optional[str] = None, supabase_key: Optional[str] = None) -> Dict:
     """Compare Vincere jobs with database"""
     if not supabase_url or not supabase_key:
@@ -351,119 +410,233 @@ def compare_with_database(vincere_jobs: List[Dict], supabase_url: Optional[str]
         }
 
 
-def save_results(jobs: List[Dict], output_dir: str = 'output'):
-    """Save results to files"""
+def build_summary_row(job_data: Dict) -> Dict:
+    """Build one vincere-jobs-summary.csv row from a raw job record"""
+    job = job_data.get('job', {})
+    custom_fields = job_data.get('custom_fields', {})
+    
+    # Determine visibility status
+    closed_job = job.get('closed_job', False)
+    has_open_date = bool(job.get('open_date'))
+    close_date = job.get('close_date')
+    is_past_close_date = False
+    if close_date:
+        try:
+            close_dt = datetime.fromisoformat(close_date.replace('Z', '+00:00'))
+            is_past_close_date = close_dt < datetime.now(close_dt.tzinfo)
+        except:
+            pass
+    
+    is_open = has_open_date and not closed_job and not is_past_close_date
+    visibility_status = 'public' if is_open else ('private' if closed_job else 'draft')
+    
+    # Count mapped fields
+    mapped_fields_count = sum(1 for key in custom_fields.keys() if key in KNOWN_JOB_FIELD_KEYS)
+    
+    row = {
+        'vincere_id': str(job.get('id', '')),
+        'title': job.get('job_title', ''),
+        'company_name': job.get('company_name', ''),
+        'status': job.get('status', ''),
+        'job_status': job.get('job_status', ''),
+        'open_date': job.get('open_date', ''),
+        'close_date': job.get('close_date', ''),
+        'closed_job': 'Yes' if closed_job else 'No',
+        'private_job': 'Yes' if job.get('private_job') else 'No',
+        'industry_id': str(job.get('industry_id', '')),
+        'custom_field_count': len(custom_fields),
+        'mapped_fields_count': mapped_fields_count,
+        'visibility_status': visibility_status,
+        'created_date': job.get('created_date', ''),
+        'last_update': job.get('last_update', ''),
+    }
+    
+    # Add custom field values as columns (for known fields)
+    for key, name in KNOWN_JOB_FIELD_KEYS.items():
+        field = custom_fields.get(key, {})
+        if field.get('field_value'):
+            row[f'cf_{name}'] = field['field_value']
+        elif field.get('date_value'):
+            row[f'cf_{name}'] = field['date_value']
+        elif field.get('field_values'):
+            row[f'cf_{name}'] = ', '.join(str(v) for v in field['field_values'])
+        else:
+            row[f'cf_{name}'] = ''
+    
+    return row
+
+
+JOB_COLUMNS = [
+    ('vincere_id', 'int'),
+    ('title', 'str'),
+    ('company_id', 'int'),
+    ('company_name', 'str'),
+    ('status', 'str'),
+    ('status_id', 'int'),
+    ('job_status', 'str'),
+    ('open_date', 'timestamp'),
+    ('close_date', 'timestamp'),
+    ('closed_job', 'bool'),
+    ('private_job', 'bool'),
+    ('industry_id', 'int'),
+    ('custom_field_count', 'int'),
+    ('mapped_fields_count', 'int'),
+    ('visibility_status', 'str'),
+    ('created_date', 'timestamp'),
+    ('last_update', 'timestamp'),
+]
+# Each known custom field gets one typed column per value slot Vincere uses:
+# free text, a date, and option IDs for drop-downs/multi-selects
+JOB_COLUMNS += [
+    (f'cf_{column_name(name)}{suffix}', kind)
+    for name in KNOWN_JOB_FIELD_KEYS.values()
+    for suffix, kind in (('', 'str'), ('_date', 'timestamp'), ('_ids', 'int_list'))
+]
+
+JOB_CUSTOM_FIELD_COLUMNS = [
+    ('vincere_id', 'int'),
+    ('key', 'str'),
+    ('name', 'str'),
+    ('type', 'str'),
+    ('is_mapped', 'bool'),
+    ('field_value', 'str'),
+    ('date_value', 'timestamp'),
+    ('field_values', 'int_list'),
+]
+
+
+def build_columnar_row(job_data: Dict, summary_row: Dict) -> Dict:
+    """Build one vincere-jobs.parquet row (values are coerced by ColumnarWriter)"""
+    job = job_data.get('job', {})
+    custom_fields = job_data.get('custom_fields', {})
+    
+    row = {
+        'vincere_id': job.get('id'),
+        'title': job.get('job_title'),
+        'company_id': job.get('company_id'),
+        'company_name': job.get('company_name'),
+        'status': job.get('status'),
+        'status_id': job.get('status_id'),
+        'job_status': job.get('job_status'),
+        'open_date': job.get('open_date'),
+        'close_date': job.get('close_date'),
+        'closed_job': bool(job.get('closed_job')),
+        'private_job': bool(job.get('private_job')),
+        'industry_id': job.get('industry_id'),
+        'custom_field_count': summary_row['custom_field_count'],
+        'mapped_fields_count': summary_row['mapped_fields_count'],
+        'visibility_status': summary_row['visibility_status'],
+        'created_date': job.get('created_date'),
+        'last_update': job.get('last_update'),
+    }
+    
+    for key, name in KNOWN_JOB_FIELD_KEYS.items():
+        field = custom_fields.get(key, {})
+        column = f'cf_{column_name(name)}'
+        row[column] = field.get('field_value')
+        row[f'{column}_date'] = field.get('date_value')
+        row[f'{column}_ids'] = field.get('field_values')
+    
+    return row
+
+
+def build_custom_field_rows(job_data: Dict) -> Iterator[Dict]:
+    """Yield one vincere-job-custom-fields.parquet row per custom field (long format)"""
+    job_id = job_data.get('job', {}).get('id')
+    for key, field in job_data.get('custom_fields', {}).items():
+        yield {
+            'vincere_id': job_id,
+            'key': key,
+            'name': field.get('name'),
+            'type': field.get('type'),
+            'is_mapped': key in KNOWN_JOB_FIELD_KEYS,
+            'field_value': field.get('field_value'),
+            'date_value': field.get('date_value'),
+            'field_values': field.get('field_values'),
+        }
+
+
+def save_results(jobs: Iterable[Dict], output_dir: str = 'output'):
+    """Save results to files
+
+    Makes a single streaming pass over `jobs`: each record is written to the
+    raw JSON, the summary CSV and (with pyarrow) the Parquet tables as it
+    comes, and only per-field counts are kept for the analysis.
+    """
     os.makedirs(output_dir, exist_ok=True)
     
-    # 1. Save raw JSON
     raw_file = os.path.join(output_dir, 'vincere-jobs-raw.json')
-    with open(raw_file, 'w', encoding='utf-8') as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False, default=str)
-    print(f"\nSaved raw data to {raw_file}")
-    
-    # 2. Create summary CSV
     csv_file = os.path.join(output_dir, 'vincere-jobs-summary.csv')
+    parquet_file = os.path.join(output_dir, 'vincere-jobs.parquet')
+    custom_fields_parquet_file = os.path.join(output_dir, 'vincere-job-custom-fields.parquet')
     
-    if not jobs:
+    field_occurrences = {}
+    total_jobs_analyzed = 0
+    csv_writer = None
+    parquet_writer = None
+    custom_fields_writer = None
+    
+    with ExitStack() as outputs:
+        raw_writer = outputs.enter_context(RawRecordWriter(raw_file))
+        if columnar_available():
+            parquet_writer = outputs.enter_context(ColumnarWriter(parquet_file, JOB_COLUMNS))
+            custom_fields_writer = outputs.enter_context(
+                ColumnarWriter(custom_fields_parquet_file, JOB_CUSTOM_FIELD_COLUMNS)
+            )
+        
+        for job_data in jobs:
+            # 1. Raw JSON
+            raw_writer.write(job_data)
+            if not job_data:
+                continue
+            total_jobs_analyzed += 1
+            
+            # 2. Summary CSV
+            row = build_summary_row(job_data)
+            if csv_writer is None:
+                csv_handle = outputs.enter_context(open(csv_file, 'w', newline='', encoding='utf-8'))
+                csv_writer = csv.DictWriter(csv_handle, fieldnames=list(row.keys()))
+                csv_writer.writeheader()
+            csv_writer.writerow(row)
+            
+            # 3. Typed columnar tables
+            if parquet_writer is not None:
+                parquet_writer.write(build_columnar_row(job_data, row))
+                for field_row in build_custom_field_rows(job_data):
+                    custom_fields_writer.write(field_row)
+            
+            # 4. Count occurrences of each custom field
+            for key, field in job_data.get('custom_fields', {}).items():
+                if key not in field_occurrences:
+                    field_occurrences[key] = {
+                        'key': key,
+                        'name': field.get('name', 'Unknown'),
+                        'type': field.get('type', 'Unknown'),
+                        'occurrences': 0,
+                        'is_mapped': key in KNOWN_JOB_FIELD_KEYS,
+                        'mapped_name': KNOWN_JOB_FIELD_KEYS.get(key, ''),
+                    }
+                field_occurrences[key]['occurrences'] += 1
+    
+    print(f"\nSaved raw data to {raw_file}")
+    
+    if raw_writer.count == 0:
         print("No jobs to save")
         return
     
-    # Extract summary fields
-    summary_rows = []
-    all_custom_field_keys = set()
-    
-    for job_data in jobs:
-        if not job_data:
-            continue
-        
-        job = job_data.get('job', {})
-        custom_fields = job_data.get('custom_fields', {})
-        
-        # Collect all custom field keys
-        all_custom_field_keys.update(custom_fields.keys())
-        
-        # Determine visibility status
-        closed_job = job.get('closed_job', False)
-        has_open_date = bool(job.get('open_date'))
-        close_date = job.get('close_date')
-        is_past_close_date = False
-        if close_date:
-            try:
-                close_dt = datetime.fromisoformat(close_date.replace('Z', '+00:00'))
-                is_past_close_date = close_dt < datetime.now(close_dt.tzinfo)
-            except:
-                pass
-        
-        is_open = has_open_date and not closed_job and not is_past_close_date
-        visibility_status = 'public' if is_open else ('private' if closed_job else 'draft')
-        
-        # Count mapped fields
-        mapped_fields_count = sum(1 for key in custom_fields.keys() if key in KNOWN_JOB_FIELD_KEYS)
-        
-        row = {
-            'vincere_id': str(job.get('id', '')),
-            'title': job.get('job_title', ''),
-            'company_name': job.get('company_name', ''),
-            'status': job.get('status', ''),
-            'job_status': job.get('job_status', ''),
-            'open_date': job.get('open_date', ''),
-            'close_date': job.get('close_date', ''),
-            'closed_job': 'Yes' if closed_job else 'No',
-            'private_job': 'Yes' if job.get('private_job') else 'No',
-            'industry_id': str(job.get('industry_id', '')),
-            'custom_field_count': len(custom_fields),
-            'mapped_fields_count': mapped_fields_count,
-            'visibility_status': visibility_status,
-            'created_date': job.get('created_date', ''),
-            'last_update': job.get('last_update', ''),
-        }
-        
-        # Add custom field values as columns (for known fields)
-        for key, name in KNOWN_JOB_FIELD_KEYS.items():
-            field = custom_fields.get(key, {})
-            if field.get('field_value'):
-                row[f'cf_{name}'] = field['field_value']
-            elif field.get('date_value'):
-                row[f'cf_{name}'] = field['date_value']
-            elif field.get('field_values'):
-                row[f'cf_{name}'] = ', '.join(str(v) for v in field['field_values'])
-            else:
-                row[f'cf_{name}'] = ''
-        
-        summary_rows.append(row)
-    
-    # Write CSV
-    if summary_rows:
-        fieldnames = list(summary_rows[0].keys())
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(summary_rows)
+    if csv_writer is not None:
         print(f"Saved summary CSV to {csv_file}")
     
-    # 3. Create custom fields analysis
-    analysis_file = os.path.join(output_dir, 'custom-fields-analysis.json')
+    if parquet_writer is not None:
+        print(f"Saved Parquet tables to {parquet_file} and {custom_fields_parquet_file}")
+    else:
+        print("Skipped Parquet export (pip install pyarrow to enable)")
     
-    # Count occurrences of each custom field
-    field_occurrences = {}
-    for job_data in jobs:
-        if not job_data:
-            continue
-        custom_fields = job_data.get('custom_fields', {})
-        for key, field in custom_fields.items():
-            if key not in field_occurrences:
-                field_occurrences[key] = {
-                    'key': key,
-                    'name': field.get('name', 'Unknown'),
-                    'type': field.get('type', 'Unknown'),
-                    'occurrences': 0,
-                    'is_mapped': key in KNOWN_JOB_FIELD_KEYS,
-                    'mapped_name': KNOWN_JOB_FIELD_KEYS.get(key, ''),
-                }
-            field_occurrences[key]['occurrences'] += 1
+    # Custom fields analysis
+    analysis_file = os.path.join(output_dir, 'custom-fields-analysis.json')
     
     analysis = {
-        'total_jobs_analyzed': len([j for j in jobs if j]),
+        'total_jobs_analyzed': total_jobs_analyzed,
         'total_unique_custom_fields': len(field_occurrences),
         'mapped_fields': len([f for f in field_occurrences.values() if f['is_mapped']]),
         'unmapped_fields': len([f for f in field_occurrences.values() if not f['is_mapped']]),
@@ -477,15 +650,14 @@ def save_results(jobs: List[Dict], output_dir: str = 'output'):
     return analysis
 
 
-def print_summary(jobs: List[Dict], db_comparison: Dict, analysis: Dict):
-    """Print summary statistics"""
+def print_summary(jobs: Iterable[Dict], db_comparison: Dict, analysis: Dict):
+    """Print summary statistics (one pass, so `jobs` can be streamed)"""
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
     
-    print(f"\nTotal jobs found in Vincere: {len([j for j in jobs if j])}")
-    
     # Jobs by status
+    total_jobs = 0
     status_counts = {}
     visibility_counts = {'public': 0, 'private': 0, 'draft': 0}
     closed_count = 0
@@ -494,6 +666,7 @@ def print_summary(jobs: List[Dict], db_comparison: Dict, analysis: Dict):
     for job_data in jobs:
         if not job_data:
             continue
+        total_jobs += 1
         job = job_data.get('job', {})
         status = job.get('job_status') or job.get('status', 'UNKNOWN')
         status_counts[status] = status_counts.get(status, 0) + 1
@@ -514,6 +687,8 @@ def print_summary(jobs: List[Dict], db_comparison: Dict, analysis: Dict):
         else:
             visibility_counts['draft'] += 1
     
+    print(f"\nTotal jobs found in Vincere: {total_jobs}")
+    
     print(f"\nJobs by status:")
     for status, count in sorted(status_counts.items(), key=lambda x: x[1], reverse=True):
         print(f"  {status}: {count}")
@@ -545,127 +720,348 @@ def print_summary(jobs: List[Dict], db_comparison: Dict, analysis: Dict):
     print("\n" + "="*60)
 
 
-def main():
-    """Main execution"""
-    parser = argparse.ArgumentParser(description='Pull all jobs from Vincere with all custom fields')
-    parser.add_argument('--compare-db', action='store_true', help='Compare with Supabase database')
-    parser.add_argument('--output-dir', default='output', help='Output directory for results')
-    parser.add_argument('--resume', action='store_true', help='Resume from checkpoint if available')
-    parser.add_argument('--checkpoint-file', default='.vincere-checkpoint.json', help='Checkpoint file path')
-    args = parser.parse_args()
-    
-    print("="*60)
-    print("Vincere Job Pull Script")
-    print("="*60)
-    
-    # Initialize client
+def load_sync_state(output_dir: str) -> Dict[str, str]:
+    """Load the {job_id: last_update} map written by the previous run"""
+    state_file = os.path.join(output_dir, SYNC_STATE_FILE)
+    if not os.path.exists(state_file):
+        return {}
     try:
-        client = VincereClient()
-        print("\nAuthenticating with Vincere...")
-        client.authenticate()
-        print("Authenticated successfully!\n")
+        with open(state_file, 'r') as f:
+            return json.load(f).get('jobs', {})
     except Exception as e:
-        print(f"Error initializing Vincere client: {e}")
-        return
-    
-    # Fetch all jobs (search results)
-    search_results = fetch_all_jobs(client)
-    
-    if not search_results:
-        print("No jobs found")
-        return
-    
-    # Load checkpoint if resuming
-    checkpoint_file = os.path.join(args.output_dir, args.checkpoint_file)
-    processed_job_ids = set()
-    all_jobs_data = []
+        print(f"  ⚠ Error loading sync state: {e}")
+        return {}
+
+
+def build_sync_state(search_results: List[Dict], fetched_ids: Container[str], previous_state: Dict[str, str],
+                     search_complete: bool = True) -> Dict[str, str]:
+    """Build the {job_id: last_update} map to store after this run
+
+    Uses the search result's last_update (what the next run compares
+    against) for jobs fetched this run. Unchanged jobs keep their previous
+    entry. Jobs whose fetch failed get no new entry, so they count as changed
+    next time. When the search was truncated, jobs it didn't reach keep
+    their previous entry too.
+    """
+    state = {}
+    for item in search_results:
+        job_id = str(item.get('id'))
+        if job_id in fetched_ids:
+            state[job_id] = item.get('last_update')
+        elif job_id in previous_state:
+            state[job_id] = previous_state[job_id]
+    if not search_complete:
+        for job_id, last_update in previous_state.items():
+            state.setdefault(job_id, last_update)
+    return state
+
+
+def save_sync_state(output_dir: str, state: Dict[str, str]):
+    """Write the {job_id: last_update} map for the next --incremental run"""
+    os.makedirs(output_dir, exist_ok=True)
+    state_file = os.path.join(output_dir, SYNC_STATE_FILE)
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump({'last_sync': datetime.now().isoformat(), 'jobs': state}, f)
+    os.replace(temp_file, state_file)
+
+
+def load_existing_jobs(output_dir: str) -> Tuple[CheckpointJournal, Dict[str, int]]:
+    """Index the previous vincere-jobs-raw.json by job id
+
+    The records are copied one at a time into a spool journal (see
+    PREVIOUS_JOBS_SPOOL), so the merge can read any of them back while the
+    raw file is rewritten. Only {job_id: spool offset} is kept in memory.
+    Remove the spool once the merge is written.
+    """
+    spool = CheckpointJournal(os.path.join(output_dir, PREVIOUS_JOBS_SPOOL), fsync_every=0)
+    spool.remove()
+    offsets = {}
+    raw_file = os.path.join(output_dir, 'vincere-jobs-raw.json')
+    if os.path.exists(raw_file):
+        for job_data in iter_records(raw_file):
+            if job_data and job_data.get('job', {}).get('id'):
+                job_id = str(job_data['job']['id'])
+                spool.append({'job_id': job_id, 'data': job_data})
+                offsets[job_id] = spool.last_offset
+    spool.close()
+    return spool, offsets
+
+
+def select_changed_jobs(search_results: List[Dict], sync_state: Dict[str, str], existing_jobs: Container[str]) -> List[Dict]:
+    """Pick search results that are new, changed, or missing from the raw file"""
+    changed = []
+    for item in search_results:
+        job_id = str(item.get('id'))
+        if job_id not in existing_jobs or sync_state.get(job_id) != item.get('last_update'):
+            changed.append(item)
+    return changed
+
+
+def expire_changed_jobs(cache: ResponseCache, search_results: List[Dict], sync_state: Dict[str, str]) -> int:
+    """Make cached responses of jobs changed since the last run revalidate
+
+    Jobs whose search last_update differs from the previous sync state have
+    their detail, custom field and placement responses expired, so they are
+    never served stale from --http-cache. Returns the number of jobs expired.
+    """
+    expired = 0
+    for item in search_results:
+        job_id = str(item.get('id'))
+        if job_id in sync_state and sync_state[job_id] != item.get('last_update'):
+            for endpoint in (f'/position/{job_id}', f'/position/{job_id}/customfields', f'/position/{job_id}/placements'):
+                cache.expire(url_for(endpoint))
+            expired += 1
+    return expired
+
+
+def merge_jobs(search_results: List[Dict], journal: CheckpointJournal, fetched: Dict[str, int],
+               previous: Optional[CheckpointJournal] = None, existing_jobs: Optional[Dict[str, int]] = None,
+               search_complete: bool = True) -> Iterator[Dict]:
+    """Job records for the output, in search order, read back one at a time
+
+    Jobs fetched this run come from the checkpoint journal (see
+    fetch_details). With --incremental, `previous` / `existing_jobs` (see
+    load_existing_jobs) supply the last run's record for the rest: unchanged
+    jobs, and jobs whose detail fetch failed, which the next run retries
+    since their stored last_update stays stale. Jobs that no longer appear
+    in the search are dropped, unless the search was truncated
+    (`search_complete` False): then they are kept, after the searched jobs,
+    since they may still exist.
+    """
+    existing_jobs = existing_jobs or {}
+    written = set()
+    try:
+        for item in search_results:
+            job_id = str(item.get('id'))
+            if job_id in written:
+                continue
+            if job_id in fetched:
+                yield journal.read_at(fetched[job_id])['data']
+            elif job_id in existing_jobs:
+                yield previous.read_at(existing_jobs[job_id])['data']
+            else:
+                continue
+            written.add(job_id)
+        if not search_complete:
+            for job_id, offset in existing_jobs.items():
+                if job_id not in written:
+                    yield previous.read_at(offset)['data']
+    finally:
+        journal.close()
+        if previous is not None:
+            previous.close()
+
+
+def flag_in_database(jobs: Iterable[Dict], in_database: Dict[str, bool]) -> Iterator[Dict]:
+    """Add the in_database flag from compare_with_database() as jobs stream past"""
+    for job_data in jobs:
+        if job_data and 'job' in job_data:
+            job_id = str(job_data['job'].get('id', ''))
+            if job_id in in_database:
+                job_data['in_database'] = in_database[job_id]
+        yield job_data
+
+
+def fetch_details(args, client, loop: Optional[asyncio.AbstractEventLoop],
+                  search_results: List[Dict]) -> Tuple[CheckpointJournal, Dict[str, int]]:
+    """Fetch full details for the given search results, with checkpointing
+
+    Every fetched job is appended once to the checkpoint journal, which
+    also serves as their storage until the output is written: this returns
+    the journal and the {job_id: offset} of each fetched job, for
+    merge_jobs(). On --resume the journal is scanned to rebuild those
+    offsets and the index to continue from.
+    """
+    journal = CheckpointJournal(os.path.join(args.output_dir, args.checkpoint_file))
+    fetched: Dict[str, int] = {}
     start_index = 0
     
-    if args.resume and os.path.exists(checkpoint_file):
-        print(f"\nLoading checkpoint from {checkpoint_file}...")
+    if args.resume and journal.exists():
+        print(f"\nLoading checkpoint from {journal.path}...")
         try:
-            with open(checkpoint_file, 'r') as f:
-                checkpoint = json.load(f)
-                processed_job_ids = set(checkpoint.get('processed_job_ids', []))
-                start_index = checkpoint.get('last_index', 0)
-                all_jobs_data = checkpoint.get('jobs_data', [])
-                print(f"  ✓ Found checkpoint: {len(processed_job_ids)} jobs already processed")
-                print(f"  Resuming from job index {start_index}/{len(search_results)}")
+            for offset, entry in journal.scan():
+                fetched[str(entry['job_id'])] = offset
+                start_index = max(start_index, entry['index'])
+            print(f"  ✓ Found checkpoint: {len(fetched)} jobs already processed")
+            print(f"  Resuming from job index {start_index}/{len(search_results)}")
         except Exception as e:
             print(f"  ⚠ Error loading checkpoint: {e}")
             print(f"  Starting from beginning...")
-            processed_job_ids = set()
-            all_jobs_data = []
+            journal.remove()
+            fetched = {}
             start_index = 0
+    else:
+        # Stale journal from an earlier run
+        journal.remove()
     
     # Fetch full details and custom fields for each job
-    print(f"\nFetching full details and custom fields for {len(search_results)} jobs...")
+    workers = max(1, args.workers)
+    if loop:
+        print(f"\nFetching full details and custom fields for {len(search_results)} jobs (async, {args.concurrency} in flight)...")
+    else:
+        print(f"\nFetching full details and custom fields for {len(search_results)} jobs ({workers} worker(s))...")
     
+    pending = []
     for i, job_item in enumerate(search_results[start_index:], start_index + 1):
         job_id = job_item.get('id')
         if not job_id:
             continue
         
         # Skip if already processed
-        if str(job_id) in processed_job_ids:
+        if str(job_id) in fetched:
             if i % 100 == 1:
                 print(f"  [{i}/{len(search_results)}] Skipping already processed job {job_id}...")
             continue
         
+        pending.append((i, job_id))
+    
+    if loop:
+        results = iter_jobs_with_custom_fields_async(loop, client, pending, max(1, args.concurrency))
+    else:
+        results = iter_jobs_with_custom_fields(client, pending, workers)
+    
+    for i, job_id, job_data in results:
         # Print progress every 10 jobs or on first/last
         if i % 10 == 1 or i == len(search_results):
-            print(f"  [{i}/{len(search_results)}] Fetching job {job_id}...")
+            print(f"  [{i}/{len(search_results)}] Fetched job {job_id}")
         
-        job_data = fetch_job_with_custom_fields(client, job_id)
         if job_data:
-            all_jobs_data.append(job_data)
-            processed_job_ids.add(str(job_id))
-            
-            # Save checkpoint every 50 jobs
-            if len(all_jobs_data) % 50 == 0:
-                checkpoint = {
-                    'processed_job_ids': list(processed_job_ids),
-                    'last_index': i,
-                    'jobs_data': all_jobs_data,  # Save actual job data
-                    'total_jobs': len(search_results),
-                    'last_updated': datetime.now().isoformat()
-                }
-                os.makedirs(args.output_dir, exist_ok=True)
-                # Save to temp file first, then rename (atomic write)
-                temp_file = checkpoint_file + '.tmp'
-                with open(temp_file, 'w') as f:
-                    json.dump(checkpoint, f, indent=2, default=str)
-                os.rename(temp_file, checkpoint_file)
-                print(f"  💾 Checkpoint saved ({len(all_jobs_data)} jobs processed)")
+            # Each job is journaled once; fsync every 50 jobs
+            synced = journal.append({'index': i, 'job_id': job_id, 'data': job_data})
+            fetched[str(job_id)] = journal.last_offset
+            if synced:
+                print(f"  💾 Checkpoint saved ({len(fetched)} jobs processed)")
         else:
             print(f"  ⚠ Failed to fetch job {job_id}")
     
-    print(f"\n✓ Fetched {len(all_jobs_data)}/{len(search_results)} jobs with full details")
+    journal.close()
+    print(f"\n✓ Fetched {len(fetched)}/{len(search_results)} jobs with full details")
+    
+    return journal, fetched
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Pull all jobs from Vincere with all custom fields')
+    parser.add_argument('--compare-db', action='store_true', help='Compare with Supabase database')
+    parser.add_argument('--output-dir', default='output', help='Output directory for results')
+    parser.add_argument('--resume', action='store_true', help='Resume from checkpoint if available')
+    parser.add_argument('--checkpoint-file', default='.vincere-checkpoint.jsonl', help='Checkpoint journal path (JSONL)')
+    parser.add_argument('--workers', type=int, default=1, help='Number of concurrent detail fetches (default: 1)')
+    parser.add_argument('--pool-size', type=int, help=f'Max keep-alive connections per host (default: max(workers, {DEFAULT_POOL_MAXSIZE}))')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires aiohttp)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_IN_FLIGHT, help=f'Max in-flight requests in --async mode (default: {DEFAULT_MAX_IN_FLIGHT})')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch details for jobs new or changed since the last run (by last_update)')
+    parser.add_argument('--http-cache', nargs='?', const=DEFAULT_RESPONSE_CACHE, metavar='DIR',
+                        help=f'Cache GET responses on disk (default dir: {DEFAULT_RESPONSE_CACHE}; also enabled by VINCERE_HTTP_CACHE)')
+    parser.add_argument('--cache-ttl', action='append', metavar='PATTERN=SECONDS',
+                        help="Override how long responses whose URL matches PATTERN (regex) are served from the cache; 'none' disables caching for it. Repeatable")
+    parser.add_argument('--initial-rate', type=float, default=DEFAULT_INITIAL_RATE, help=f'Starting request rate, req/s; it doubles every second until the first 429 (default: {DEFAULT_INITIAL_RATE:g})')
+    parser.add_argument('--max-rate', type=float, default=DEFAULT_MAX_RATE, help=f'Upper bound for the adaptive request rate, req/s (default: {DEFAULT_MAX_RATE:g})')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile(args.profile)
+    
+    try:
+        cache = open_response_cache(args.http_cache, args.cache_ttl)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    print("="*60)
+    print("Vincere Job Pull Script")
+    print("="*60)
+    
+    # Initialize client
+    loop = asyncio.new_event_loop() if args.use_async else None
+    rate_limiter = AdaptiveRateLimiter(initial_rate=args.initial_rate, max_rate=args.max_rate)
+    try:
+        if args.use_async:
+            client = AsyncVincereClient(max_in_flight=args.concurrency, rate_limiter=rate_limiter, cache=cache)
+            print("\nAuthenticating with Vincere...")
+            loop.run_until_complete(client.get_token())
+        else:
+            pool_size = args.pool_size or max(args.workers, DEFAULT_POOL_MAXSIZE)
+            client = VincereClient(pool_maxsize=pool_size, rate_limiter=rate_limiter, cache=cache)
+            print("\nAuthenticating with Vincere...")
+            client.get_token()
+        print("Authenticated successfully!\n")
+    except Exception as e:
+        print(f"Error initializing Vincere client: {e}")
+        if loop:
+            loop.close()
+        return
+    
+    try:
+        # Fetch all jobs (search results)
+        with phase(SEARCH):
+            if loop:
+                search_results, search_total = loop.run_until_complete(fetch_all_jobs_async(client))
+            else:
+                search_results, search_total = fetch_all_jobs(client)
+        
+        if not search_results:
+            print("No jobs found")
+            return
+        
+        search_complete = len(search_results) >= search_total
+        if not search_complete:
+            print(f"\n⚠ Search returned only {len(search_results)} of {search_total} jobs "
+                  + ("(jobs it missed are kept from the previous run)" if args.incremental else "(output will be incomplete)"))
+        
+        if cache:
+            expired = expire_changed_jobs(cache, search_results, load_sync_state(args.output_dir))
+            print(f"HTTP cache: {expired} changed jobs will be revalidated")
+        
+        if args.incremental:
+            previous_state = load_sync_state(args.output_dir)
+            previous, existing_jobs = load_existing_jobs(args.output_dir)
+            to_fetch = select_changed_jobs(search_results, previous_state, existing_jobs)
+            print(f"\nIncremental sync: {len(to_fetch)} new or changed jobs "
+                  f"({len(search_results) - len(to_fetch)} unchanged)")
+            with phase(DETAIL):
+                journal, fetched = fetch_details(args, client, loop, to_fetch)
+        else:
+            previous_state = {}
+            previous, existing_jobs = None, {}
+            with phase(DETAIL):
+                journal, fetched = fetch_details(args, client, loop, search_results)
+    finally:
+        if loop:
+            loop.run_until_complete(client.close())
+            loop.close()
+    
+    if cache:
+        print(cache.summary())
+    
+    # Records are streamed from the checkpoint journal (and last run's data) into the outputs
+    jobs = merge_jobs(search_results, journal, fetched, previous, existing_jobs, search_complete)
     
     # Compare with database if requested
     db_comparison = {}
     if args.compare_db:
         supabase_url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
         supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-        db_comparison = compare_with_database(search_results, supabase_url, supabase_key)
+        with phase(DB_READ):
+            db_comparison = compare_with_database(search_results, supabase_url, supabase_key)
         
         # Add in_database flag to job data
-        for job_data in all_jobs_data:
-            if job_data and 'job' in job_data:
-                job_id = str(job_data['job'].get('id', ''))
-                if job_id in db_comparison.get('in_database', {}):
-                    job_data['in_database'] = db_comparison['in_database'][job_id]
+        jobs = flag_in_database(jobs, db_comparison.get('in_database', {}))
     
     # Save results
-    analysis = save_results(all_jobs_data, args.output_dir)
+    with phase(MAPPING):
+        analysis = save_results(jobs, args.output_dir)
+    save_sync_state(args.output_dir, build_sync_state(search_results, fetched, previous_state, search_complete))
+    if previous is not None:
+        previous.remove()
     
-    # Remove checkpoint file on successful completion
-    if os.path.exists(checkpoint_file):
-        os.remove(checkpoint_file)
+    # Remove checkpoint journal on successful completion
+    if journal.exists():
+        journal.remove()
         print(f"\n✓ Removed checkpoint file (completed successfully)")
     
-    # Print summary
-    print_summary(all_jobs_data, db_comparison, analysis)
+    # Print summary, reading the saved jobs back one at a time
+    print_summary(iter_records(os.path.join(args.output_dir, 'vincere-jobs-raw.json')), db_comparison, analysis)
     
     print("\nDone!")
 
@@ -8,18 +8,33 @@ For each filled job, it calls /position/{id}/placements, then fetches full detai
 Outputs:
 - vincere-placements-raw.json - Complete placement data
 - vincere-placements-summary.csv - Summary with key fields
+
+Every job whose placements were fetched without errors is journaled to a
+checkpoint (.vincere-placements-checkpoint.jsonl in the output directory).
+With --resume, journaled jobs are not fetched again; the checkpoint is
+removed once the results are saved.
 """
 
 import os
-import json
 import csv
 import argparse
-import time
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import requests
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from checkpoint_journal import CheckpointJournal
+from columnar_export import ColumnarWriter, columnar_available
+from profiling import DETAIL, MAPPING, add_profile_argument, phase, start_profile
+from raw_records import RawRecordWriter, iter_records
+from response_cache import DEFAULT_RESPONSE_CACHE, ResponseCache, open_response_cache
+from vincere_client import (
+    VincereClient, AsyncVincereClient, AdaptiveRateLimiter,
+    DEFAULT_POOL_MAXSIZE, DEFAULT_MAX_IN_FLIGHT, DEFAULT_INITIAL_RATE, DEFAULT_MAX_RATE,
+)
+
 # Load environment variables from multiple possible locations
 script_dir = os.path.dirname(os.path.abspath(__file__))
 env_paths = [
@@ -35,275 +50,494 @@ for env_path in env_paths:
 else:
     load_dotenv()
 
-# Vincere API URLs
-AUTH_URL = 'https://id.vincere.io/oauth2/token'
-API_BASE_URL = 'https://lighthouse-careers.vincere.io/api/v2'
 
+def load_jobs_to_check(jobs_file: str, limit: Optional[int] = None, all_jobs: bool = False) -> List[Dict]:
+    """Load raw jobs and pick the ones to check for placements
 
-class VincereClient:
-    """Vincere API client with authentication"""
+    Args:
+        all_jobs: If True, check ALL jobs for placements. If False, only check filled jobs (status_id=2).
+    """
+    print("Loading jobs from raw data...")
 
-    def __init__(self, client_id: Optional[str] = None, api_key: Optional[str] = None, refresh_token: Optional[str] = None):
-        self.client_id = client_id or os.getenv('VINCERE_CLIENT_ID')
-        self.api_key = api_key or os.getenv('VINCERE_API_KEY')
-        self.refresh_token = refresh_token or os.getenv('VINCERE_REFRESH_TOKEN')
+    if not os.path.exists(jobs_file):
+        print(f"  Jobs file not found: {jobs_file}")
+        return []
 
-        if not self.client_id or not self.api_key or not self.refresh_token:
-            raise ValueError(
-                'Missing required Vincere configuration. '
-                'Ensure VINCERE_CLIENT_ID, VINCERE_API_KEY, and VINCERE_REFRESH_TOKEN are set.'
-            )
+    # Stream the raw dump and keep only the job header of the selected jobs;
+    # custom fields are not needed here and dominate the file size.
+    jobs_to_check = []
+    total_jobs = 0
+    matching_jobs = 0
+    for job_data in iter_records(jobs_file):
+        if not job_data:
+            continue
+        total_jobs += 1
+        job = job_data.get('job', {})
+        if all_jobs or job.get('status_id') == 2:
+            matching_jobs += 1
+            if not limit or len(jobs_to_check) < limit:
+                jobs_to_check.append({'job': job})
 
-        self.id_token: Optional[str] = None
-        self.token_expires_at: int = 0
+    if all_jobs:
+        # Check ALL jobs for placements
+        print(f"  Checking ALL {total_jobs} jobs for placements")
+    else:
+        # Filter to filled jobs (status_id=2) only
+        print(f"  Found {matching_jobs} filled jobs out of {total_jobs} total")
 
-    def authenticate(self) -> str:
-        """Authenticate with Vincere using OAuth2 refresh token flow"""
-        data = {
-            'client_id': self.client_id,
-            'grant_type': 'refresh_token',
-            'refresh_token': self.refresh_token,
-        }
+    if limit:
+        print(f"  Limited to {len(jobs_to_check)} jobs")
 
-        response = requests.post(AUTH_URL, data=data, timeout=30)
+    return jobs_to_check
 
-        if not response.ok:
-            raise Exception(f'Vincere authentication failed: {response.status_code} {response.text}')
 
-        result = response.json()
+def enrich_placement(placement_details: Dict, job: Dict, placement_ref: Dict) -> Dict:
+    """Add job context to a placement detail record"""
+    placement_details['_job_id'] = job.get('id')
+    placement_details['_job_title'] = job.get('job_title')
+    placement_details['_company_id'] = job.get('company_id')
+    placement_details['_company_name'] = job.get('company_name')
+    placement_details['_contact_id'] = job.get('contact_id')
+    # IMPORTANT: Get candidate_id from placement reference, not full details
+    # The full details has application_source_id which is different
+    placement_details['_candidate_id'] = placement_ref.get('candidate_id')
+    return placement_details
 
-        if 'id_token' not in result:
-            raise Exception('No id_token returned from Vincere authentication')
 
-        self.id_token = result['id_token']
-        expires_in = result.get('expires_in', 3600)
-        self.token_expires_at = int(datetime.now().timestamp() * 1000) + ((expires_in - 300) * 1000)
+def print_fetch_stats(jobs_processed: int, jobs_with_placements: int, placements_found: int, errors: int):
+    """Print totals at the end of a placement fetch"""
+    print(f"\n{'='*60}")
+    print(f"FETCH COMPLETE")
+    print(f"{'='*60}")
+    print(f"Jobs processed: {jobs_processed}")
+    print(f"Jobs with placements: {jobs_with_placements}")
+    print(f"Total placements found: {placements_found}")
+    print(f"Errors: {errors}")
 
-        return self.id_token
 
-    def _get_token(self) -> str:
-        """Get a valid token, refreshing if necessary"""
-        current_time = int(datetime.now().timestamp() * 1000)
-        if not self.id_token or current_time >= self.token_expires_at:
-            self.authenticate()
-        return self.id_token
+# Where a checkpointed job's placements are: (journal byte offset, placement count)
+JournalLocation = Tuple[int, int]
 
-    def request(self, method: str, endpoint: str, data: Optional[Dict] = None, retry_on_auth_error: bool = True) -> Any:
-        """Make an authenticated request to the Vincere API"""
-        token = self._get_token()
 
-        url = endpoint if endpoint.startswith('http') else f'{API_BASE_URL}{endpoint}'
+def load_checkpoint(journal: CheckpointJournal, resume: bool) -> Dict[str, JournalLocation]:
+    """Journal locations of the jobs completed by an earlier run, by job ID
 
-        headers = {
-            'accept': 'application/json',
-            'id-token': token,
-            'x-api-key': self.api_key,
-        }
+    Only offsets and counts are kept; the placements stay on disk until
+    iter_placements() reads them back. Without `resume` any stale journal is
+    removed and nothing is loaded.
+    """
+    if not resume or not journal.exists():
+        # Stale journal from an earlier run
+        journal.remove()
+        return {}
 
-        if data and method in ('POST', 'PUT', 'PATCH'):
-            headers['Content-Type'] = 'application/json'
-            response = requests.request(method, url, headers=headers, json=data, timeout=30)
-        else:
-            response = requests.request(method, url, headers=headers, timeout=30)
+    print(f"\nLoading checkpoint from {journal.path}...")
+    completed = {}
+    try:
+        for offset, entry in journal.scan():
+            completed[str(entry['job_id'])] = (offset, len(entry['placements']))
+        print(f"  ✓ Found checkpoint: {len(completed)} jobs already processed")
+    except Exception as e:
+        print(f"  ⚠ Error loading checkpoint: {e}")
+        print(f"  Starting from beginning...")
+        journal.remove()
+        completed = {}
+    return completed
+
+
+def checkpoint_job(journal: CheckpointJournal, i: int, job: Dict, placements: List[Dict]) -> JournalLocation:
+    """Journal a job whose placements were all fetched, returning where they were written"""
+    # Each job is journaled once; fsync every 50 jobs
+    if journal.append({'index': i, 'job_id': job['id'], 'placements': placements}):
+        print(f"  💾 Checkpoint saved ({journal.entries} jobs processed)")
+    return journal.last_offset, len(placements)
+
+
+def select_jobs(jobs_to_check: List[Dict], completed: Dict[str, JournalLocation]) -> Tuple[List[Tuple[int, Dict]], List[Tuple[int, Dict]]]:
+    """Split (index, job) pairs into all jobs with an ID and those still to fetch"""
+    jobs = [(i, job_data.get('job', {})) for i, job_data in enumerate(jobs_to_check, 1)]
+    jobs = [(i, job) for i, job in jobs if job.get('id')]
+    pending = [(i, job) for i, job in jobs if str(job['id']) not in completed]
+    if completed:
+        print(f"  Resuming: {len(jobs) - len(pending)} jobs from checkpoint, {len(pending)} to fetch")
+    return jobs, pending
+
+
+def iter_placements(journal: CheckpointJournal, jobs: List[Tuple[int, Dict]], completed: Dict[str, JournalLocation],
+                    partial: Dict[str, List[Dict]]) -> Iterator[Dict]:
+    """Placements in job order, then placement reference order within each job
+
+    Checkpointed jobs are read back from the journal one job at a time.
+    `partial` holds the placements fetched for jobs where some detail call
+    failed: they are written out like the rest, but those jobs stay out of
+    the checkpoint.
+    """
+    try:
+        for _, job in jobs:
+            job_id = str(job['id'])
+            if job_id in completed:
+                yield from journal.read_at(completed[job_id][0])['placements']
+            else:
+                yield from partial.get(job_id, [])
+    finally:
+        journal.close()
+
+
+def finish_fetch(journal: CheckpointJournal, jobs_to_check: List[Dict], jobs: List[Tuple[int, Dict]],
+                 completed: Dict[str, JournalLocation], partial: Dict[str, List[Dict]],
+                 errors: int) -> Tuple[Iterator[Dict], int, int]:
+    """Close the journal, print totals and return (placements, placement count, failed jobs)"""
+    journal.close()
+    counts = {job_id: count for job_id, (_, count) in completed.items()}
+    counts.update((job_id, len(placements)) for job_id, placements in partial.items())
+    found = sum(counts.get(str(job['id']), 0) for _, job in jobs)
+    jobs_with_placements = sum(1 for _, job in jobs if counts.get(str(job['id'])))
+    print_fetch_stats(len(jobs_to_check), jobs_with_placements, found, errors)
+    return iter_placements(journal, jobs, completed, partial), found, len(jobs) - len(completed)
+
+
+def list_placement_refs(client: VincereClient, job: Dict) -> List[Dict]:
+    """Placement references of one job (those with a placement_id)"""
+    placements_list = client.get(f"/position/{job['id']}/placements")
+    if not isinstance(placements_list, list):
+        return []
+    return [ref for ref in placements_list if ref.get('placement_id')]
 
-        # Handle token expiration - retry once with fresh token
-        if response.status_code == 401 and retry_on_auth_error:
-            self.id_token = None
-            self.token_expires_at = 0
-            return self.request(method, endpoint, data, retry_on_auth_error=False)
 
-        if not response.ok:
-            raise Exception(f'Vincere API error: {response.status_code} {response.reason} - {response.text}')
+def fetch_placement(client: VincereClient, job: Dict, placement_ref: Dict) -> Optional[Dict]:
+    """Full details of one placement, with job context added"""
+    placement_details = client.get(f"/placement/{placement_ref['placement_id']}")
+    return enrich_placement(placement_details, job, placement_ref) if placement_details else None
 
-        text = response.text
-        if not text:
-            return {}
 
-        return response.json()
+# A job's placement references, each paired with a callable returning its details
+FanOut = List[Tuple[Dict, Callable[[], Optional[Dict]]]]
 
-    def get(self, endpoint: str) -> Any:
-        """GET request helper"""
-        return self.request('GET', endpoint)
 
+def collect_job_placements(i: int, job: Dict, fan_out: Callable[[], FanOut]) -> Tuple[int, Dict, Optional[List[Dict]], int]:
+    """Resolve one job's placements in reference order
 
-def fetch_all_placements(client: VincereClient, jobs_file: str, limit: Optional[int] = None, all_jobs: bool = False) -> List[Dict]:
-    """Fetch all placements from jobs
+    Returns (index, job, placements, errors); placements is None when the
+    job's placement list itself could not be fetched.
+    """
+    try:
+        refs = fan_out()
+    except Exception as e:
+        # 429s are retried inside the client; anything left is a real failure
+        print(f"    Error fetching placements for job {job['id']}: {e}")
+        return i, job, None, 1
 
-    Args:
-        all_jobs: If True, check ALL jobs for placements. If False, only check filled jobs (status_id=2).
+    placements = []
+    errors = 0
+    for placement_ref, details in refs:
+        try:
+            placement = details()
+        except Exception as e:
+            print(f"    Error fetching placement {placement_ref['placement_id']}: {e}")
+            errors += 1
+            continue
+        if placement:
+            placements.append(placement)
+    return i, job, placements, errors
+
+
+def iter_job_placements(
+    client: VincereClient,
+    jobs: List[Tuple[int, Dict]],
+    workers: int = 1,
+) -> Iterator[Tuple[int, Dict, Optional[List[Dict]], int]]:
+    """Fetch placements for (index, job) pairs, yielding results in input order.
+
+    With workers > 1, placement lists and placement details are fetched on
+    two separate thread pools: as soon as a job's list arrives its detail
+    fetches are queued, while the list pool moves on to the next jobs. All
+    requests share the client's rate limiter. At most workers * 2 jobs are
+    in flight, and results are yielded in the same order as `jobs`.
     """
-    print("Loading jobs from raw data...")
+    if workers <= 1:
+        for i, job in jobs:
+            yield collect_job_placements(i, job, lambda job=job: [
+                (ref, lambda ref=ref: fetch_placement(client, job, ref))
+                for ref in list_placement_refs(client, job)
+            ])
+        return
 
-    if not os.path.exists(jobs_file):
-        print(f"  Jobs file not found: {jobs_file}")
-        return []
+    max_in_flight = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='list') as list_pool, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='detail') as detail_pool:
 
-    with open(jobs_file, 'r') as f:
-        jobs = json.load(f)
+        def list_and_fan_out(job: Dict) -> FanOut:
+            return [
+                (ref, detail_pool.submit(fetch_placement, client, job, ref).result)
+                for ref in list_placement_refs(client, job)
+            ]
 
-    if all_jobs:
-        # Check ALL jobs for placements
-        jobs_to_check = jobs
-        print(f"  Checking ALL {len(jobs)} jobs for placements")
-    else:
-        # Filter to filled jobs (status_id=2) only
-        jobs_to_check = [j for j in jobs if j.get('job', {}).get('status_id') == 2]
-        print(f"  Found {len(jobs_to_check)} filled jobs out of {len(jobs)} total")
+        in_flight = deque()
+        for i, job in jobs:
+            in_flight.append((i, job, list_pool.submit(list_and_fan_out, job).result))
+            if len(in_flight) >= max_in_flight:
+                yield collect_job_placements(*in_flight.popleft())
+        while in_flight:
+            yield collect_job_placements(*in_flight.popleft())
 
-    if limit:
-        jobs_to_check = jobs_to_check[:limit]
-        print(f"  Limited to {len(jobs_to_check)} jobs")
 
-    all_placements = []
-    jobs_with_placements = 0
+def fetch_all_placements(client: VincereClient, jobs_file: str, journal: CheckpointJournal, limit: Optional[int] = None,
+                         all_jobs: bool = False, workers: int = 1,
+                         resume: bool = False) -> Tuple[Iterator[Dict], int, int]:
+    """Fetch all placements from jobs
+
+    Returns (placements, number of placements, number of jobs that failed
+    and were not checkpointed). Placements are yielded lazily from the
+    journal (see iter_placements), so consume them before removing it.
+
+    Args:
+        journal: Checkpoint journal for completed jobs; with `resume`, jobs already in it are skipped.
+        all_jobs: If True, check ALL jobs for placements. If False, only check filled jobs (status_id=2).
+        workers: Concurrent fetches per pool (see iter_job_placements). Output order doesn't depend on it.
+    """
+    jobs_to_check = load_jobs_to_check(jobs_file, limit, all_jobs)
+    if not jobs_to_check:
+        return iter(()), 0, 0
+
+    completed = load_checkpoint(journal, resume)
+    jobs, pending = select_jobs(jobs_to_check, completed)
+    found = sum(count for _, count in completed.values())
+    partial = {}
     errors = 0
 
-    print(f"\nFetching placements for jobs...")
-    for i, job_data in enumerate(jobs_to_check, 1):
-        job = job_data.get('job', {})
-        job_id = job.get('id')
+    print(f"\nFetching placements for jobs ({max(1, workers)} worker(s))...")
+    for i, job, placements, job_errors in iter_job_placements(client, pending, workers):
+        if i % 100 == 1 or i == len(jobs_to_check):
+            print(f"  [{i}/{len(jobs_to_check)}] Processed job {job['id']}... (found {found} placements)")
 
-        if not job_id:
+        errors += job_errors
+        if placements is None:
+            continue
+        found += len(placements)
+        if job_errors:
+            # Written out, but not checkpointed, so --resume fetches this job again
+            partial[str(job['id'])] = placements
             continue
+        completed[str(job['id'])] = checkpoint_job(journal, i, job, placements)
 
-        if i % 100 == 1 or i == len(jobs_to_check):
-            print(f"  [{i}/{len(jobs_to_check)}] Processing job {job_id}... (found {len(all_placements)} placements)")
+    return finish_fetch(journal, jobs_to_check, jobs, completed, partial, errors)
 
-        try:
-            # Get placements for this position
-            placements_url = f'/position/{job_id}/placements'
-            placements_list = client.get(placements_url)
-
-            if isinstance(placements_list, list) and placements_list:
-                jobs_with_placements += 1
-
-                for placement_ref in placements_list:
-                    placement_id = placement_ref.get('placement_id')
-                    if not placement_id:
-                        continue
-
-                    try:
-                        # Get full placement details
-                        placement_details = client.get(f'/placement/{placement_id}')
-                        if placement_details:
-                            # Add job context
-                            placement_details['_job_id'] = job_id
-                            placement_details['_job_title'] = job.get('job_title')
-                            placement_details['_company_id'] = job.get('company_id')
-                            placement_details['_company_name'] = job.get('company_name')
-                            placement_details['_contact_id'] = job.get('contact_id')
-                            # IMPORTANT: Get candidate_id from placement reference, not full details
-                            # The full details has application_source_id which is different
-                            placement_details['_candidate_id'] = placement_ref.get('candidate_id')
-                            all_placements.append(placement_details)
-                    except Exception as e:
-                        if '429' in str(e) or 'rate' in str(e).lower():
-                            print(f"    Rate limited, waiting 2s...")
-                            time.sleep(2)
-                        errors += 1
 
-        except Exception as e:
-            if '429' in str(e) or 'rate' in str(e).lower():
-                print(f"    Rate limited at job {job_id}, waiting 2s...")
-                time.sleep(2)
-            errors += 1
-            continue
+async def fetch_all_placements_async(client: AsyncVincereClient, jobs_file: str, journal: CheckpointJournal,
+                                     limit: Optional[int] = None, all_jobs: bool = False,
+                                     resume: bool = False) -> Tuple[Iterator[Dict], int, int]:
+    """Async variant of fetch_all_placements
 
-        # Small delay to avoid rate limiting
-        if i % 10 == 0:
-            time.sleep(0.1)
+    Up to client.max_in_flight jobs are scheduled at a time; each fetches
+    its placement list, then all of its placement details concurrently.
+    Output keeps job order, then placement reference order within each job.
+    Jobs are journaled as they complete.
+    """
+    jobs_to_check = load_jobs_to_check(jobs_file, limit, all_jobs)
+    if not jobs_to_check:
+        return iter(()), 0, 0
 
-    print(f"\n{'='*60}")
-    print(f"FETCH COMPLETE")
-    print(f"{'='*60}")
-    print(f"Jobs processed: {len(jobs_to_check)}")
-    print(f"Jobs with placements: {jobs_with_placements}")
-    print(f"Total placements found: {len(all_placements)}")
-    print(f"Errors: {errors}")
+    completed = load_checkpoint(journal, resume)
+    jobs, pending = select_jobs(jobs_to_check, completed)
+    partial = {}
+    errors = 0
+    done = 0
+
+    async def fetch_detail(job: Dict, placement_ref: Dict) -> Optional[Dict]:
+        placement_details = await client.get(f"/placement/{placement_ref['placement_id']}")
+        return enrich_placement(placement_details, job, placement_ref) if placement_details else None
 
-    return all_placements
+    async def fetch_job(i: int, job: Dict):
+        nonlocal errors, done
+        try:
+            placements_list = await client.get(f"/position/{job['id']}/placements")
+        except Exception as e:
+            # 429s are retried inside the client; anything left is a real failure
+            print(f"    Error fetching placements for job {job['id']}: {e}")
+            errors += 1
+            return
+        finally:
+            done += 1
+            if done % 100 == 0 or done == len(pending):
+                print(f"  [{done}/{len(pending)}] Job placement lists fetched")
+
+        if not isinstance(placements_list, list):
+            placements_list = []
+        refs = [ref for ref in placements_list if ref.get('placement_id')]
+        details = await asyncio.gather(*(fetch_detail(job, ref) for ref in refs), return_exceptions=True)
+        for ref, d in zip(refs, details):
+            if isinstance(d, Exception):
+                print(f"    Error fetching placement {ref['placement_id']}: {d}")
+        job_errors = sum(1 for d in details if isinstance(d, Exception))
+        errors += job_errors
+        placements = [d for d in details if d and not isinstance(d, Exception)]
+        if job_errors:
+            # Written out, but not checkpointed, so --resume fetches this job again
+            partial[str(job['id'])] = placements
+            return
+        completed[str(job['id'])] = checkpoint_job(journal, i, job, placements)
+
+    print(f"\nFetching placements for jobs (async, {client.max_in_flight} in flight)...")
+    in_flight = deque()
+    for i, job in pending:
+        in_flight.append(asyncio.ensure_future(fetch_job(i, job)))
+        if len(in_flight) >= client.max_in_flight:
+            await in_flight.popleft()
+    while in_flight:
+        await in_flight.popleft()
+
+    return finish_fetch(journal, jobs_to_check, jobs, completed, partial, errors)
+
+
+def build_summary_row(p: Dict) -> Dict:
+    """Build one vincere-placements-summary.csv row from a raw placement"""
+    return {
+        'placement_id': str(p.get('id', '')),
+        'job_id': str(p.get('position_id') or p.get('_job_id', '')),
+        'job_title': p.get('_job_title', ''),
+        'company_id': str(p.get('_company_id', '')),
+        'company_name': p.get('_company_name', ''),
+        'candidate_id': str(p.get('application_source_id', '')),  # This is actually candidate_id
+        'application_id': str(p.get('application_id', '')),
+        'status': 'placed' if p.get('placement_status') == 1 else 'other',
+        'start_date': p.get('start_date', ''),
+        'end_date': p.get('end_date', ''),
+        'currency': p.get('currency', 'eur'),
+        'annual_salary': p.get('annual_salary') or 0,
+        'monthly_salary': p.get('salary_rate_per_month', ''),
+        'fee_profit': p.get('profit') or 0,
+        'job_type': p.get('job_type', ''),
+        'employment_type': p.get('employment_type', ''),
+        'placed_by': str(p.get('placed_by', '')),
+        'created_at': p.get('insert_timestamp', ''),
+    }
+
+
+PLACEMENT_COLUMNS = [
+    ('placement_id', 'int'),
+    ('job_id', 'int'),
+    ('job_title', 'str'),
+    ('company_id', 'int'),
+    ('company_name', 'str'),
+    ('contact_id', 'int'),
+    ('candidate_id', 'int'),
+    ('application_source_id', 'int'),
+    ('application_id', 'int'),
+    ('placement_status', 'int'),
+    ('start_date', 'timestamp'),
+    ('end_date', 'timestamp'),
+    ('currency', 'str'),
+    ('annual_salary', 'float'),
+    ('monthly_salary', 'float'),
+    ('fee_profit', 'float'),
+    ('job_type', 'str'),
+    ('employment_type', 'str'),
+    ('placed_by', 'int'),
+    ('created_at', 'timestamp'),
+]
 
 
-def save_results(placements: List[Dict], output_dir: str = 'output'):
-    """Save results to files"""
+def build_columnar_row(p: Dict) -> Dict:
+    """Build one vincere-placements.parquet row (values are coerced by ColumnarWriter)"""
+    return {
+        'placement_id': p.get('id'),
+        'job_id': p.get('position_id') or p.get('_job_id'),
+        'job_title': p.get('_job_title'),
+        'company_id': p.get('_company_id'),
+        'company_name': p.get('_company_name'),
+        'contact_id': p.get('_contact_id'),
+        'candidate_id': p.get('_candidate_id'),
+        'application_source_id': p.get('application_source_id'),
+        'application_id': p.get('application_id'),
+        'placement_status': p.get('placement_status'),
+        'start_date': p.get('start_date'),
+        'end_date': p.get('end_date'),
+        'currency': p.get('currency'),
+        'annual_salary': p.get('annual_salary'),
+        'monthly_salary': p.get('salary_rate_per_month'),
+        'fee_profit': p.get('profit'),
+        'job_type': p.get('job_type'),
+        'employment_type': p.get('employment_type'),
+        'placed_by': p.get('placed_by'),
+        'created_at': p.get('insert_timestamp'),
+    }
+
+
+def save_results(placements: Iterable[Dict], output_dir: str = 'output') -> int:
+    """Save results to files
+
+    Streams each placement to the raw JSON, the summary CSV and (with
+    pyarrow) the Parquet table in one pass. Returns the number of summary
+    rows written.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
-    # 1. Save raw JSON
     raw_file = os.path.join(output_dir, 'vincere-placements-raw.json')
-    with open(raw_file, 'w', encoding='utf-8') as f:
-        json.dump(placements, f, indent=2, ensure_ascii=False, default=str)
-    print(f"\nSaved raw data to {raw_file}")
-
-    if not placements:
-        print("No placements to summarize")
-        return
-
-    # 2. Create summary CSV
     csv_file = os.path.join(output_dir, 'vincere-placements-summary.csv')
+    parquet_file = os.path.join(output_dir, 'vincere-placements.parquet')
 
-    summary_rows = []
+    rows_written = 0
     total_fees = 0
     total_salary = 0
+    csv_writer = None
+    parquet_writer = None
+
+    with ExitStack() as outputs:
+        raw_writer = outputs.enter_context(RawRecordWriter(raw_file))
+        if columnar_available():
+            parquet_writer = outputs.enter_context(ColumnarWriter(parquet_file, PLACEMENT_COLUMNS))
+
+        for p in placements:
+            # 1. Raw JSON
+            raw_writer.write(p)
+            if not p:
+                continue
+
+            # 2. Summary CSV
+            row = build_summary_row(p)
+            if row['fee_profit']:
+                total_fees += float(row['fee_profit'])
+            if row['annual_salary']:
+                total_salary += float(row['annual_salary'])
+
+            if csv_writer is None:
+                csv_handle = outputs.enter_context(open(csv_file, 'w', newline='', encoding='utf-8'))
+                csv_writer = csv.DictWriter(csv_handle, fieldnames=list(row.keys()))
+                csv_writer.writeheader()
+            csv_writer.writerow(row)
+            rows_written += 1
+
+            # 3. Typed columnar table
+            if parquet_writer is not None:
+                parquet_writer.write(build_columnar_row(p))
 
-    for p in placements:
-        if not p:
-            continue
-
-        fee = p.get('profit') or 0
-        salary = p.get('annual_salary') or 0
+    print(f"\nSaved raw data to {raw_file}")
 
-        if fee:
-            total_fees += float(fee)
-        if salary:
-            total_salary += float(salary)
+    if raw_writer.count == 0:
+        print("No placements to summarize")
+        return 0
 
-        row = {
-            'placement_id': str(p.get('id', '')),
-            'job_id': str(p.get('position_id') or p.get('_job_id', '')),
-            'job_title': p.get('_job_title', ''),
-            'company_id': str(p.get('_company_id', '')),
-            'company_name': p.get('_company_name', ''),
-            'candidate_id': str(p.get('application_source_id', '')),  # This is actually candidate_id
-            'application_id': str(p.get('application_id', '')),
-            'status': 'placed' if p.get('placement_status') == 1 else 'other',
-            'start_date': p.get('start_date', ''),
-            'end_date': p.get('end_date', ''),
-            'currency': p.get('currency', 'eur'),
-            'annual_salary': salary,
-            'monthly_salary': p.get('salary_rate_per_month', ''),
-            'fee_profit': fee,
-            'job_type': p.get('job_type', ''),
-            'employment_type': p.get('employment_type', ''),
-            'placed_by': str(p.get('placed_by', '')),
-            'created_at': p.get('insert_timestamp', ''),
-        }
-        summary_rows.append(row)
-
-    # Write CSV
-    if summary_rows:
-        fieldnames = list(summary_rows[0].keys())
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(summary_rows)
+    if rows_written:
         print(f"Saved summary CSV to {csv_file}")
 
+    if parquet_writer is not None:
+        print(f"Saved Parquet table to {parquet_file}")
+    else:
+        print("Skipped Parquet export (pip install pyarrow to enable)")
+
     print(f"\nTotal annual salary across all placements: EUR {total_salary:,.2f}")
     print(f"Total fees/profit across all placements: EUR {total_fees:,.2f}")
 
-    return summary_rows
+    return rows_written
 
 
-def print_summary(placements: List[Dict]):
-    """Print summary statistics"""
+def print_summary(placements: Iterable[Dict]):
+    """Print summary statistics (one pass, so `placements` can be streamed)"""
     print("\n" + "="*60)
     print("PLACEMENT SUMMARY")
     print("="*60)
 
-    if not placements:
-        print("No placements found")
-        return
-
+    placement_count = 0
     total_fee = 0
     total_salary = 0
     fee_count = 0
@@ -311,6 +545,8 @@ def print_summary(placements: List[Dict]):
     year_stats = {}
 
     for p in placements:
+        placement_count += 1
+
         # Sum fees
         fee = p.get('profit') or 0
         salary = p.get('annual_salary') or 0
@@ -344,12 +580,15 @@ def print_summary(placements: List[Dict]):
             except:
                 pass
 
-    print(f"\nTotal placements: {len(placements)}")
+    if not placement_count:
+        print("No placements found")
+        return
+
+    print(f"\nTotal placements: {placement_count}")
     print(f"Placements with fees: {fee_count}")
     print(f"Total annual salaries: EUR {total_salary:,.2f}")
     print(f"Total fees/profit: EUR {total_fee:,.2f}")
-    if len(placements) > 0:
-        print(f"Average salary: EUR {total_salary / len(placements):,.2f}")
+    print(f"Average salary: EUR {total_salary / placement_count:,.2f}")
 
     print(f"\nTop 15 companies by placements:")
     top_companies = sorted(company_stats.items(), key=lambda x: x[1]['count'], reverse=True)[:15]
@@ -364,6 +603,27 @@ def print_summary(placements: List[Dict]):
     print("\n" + "="*60)
 
 
+async def pull_placements_async(args, journal: CheckpointJournal,
+                                cache: Optional[ResponseCache] = None) -> Tuple[Iterator[Dict], int, int]:
+    """Authenticate and fetch all placements on one event loop"""
+    try:
+        client = AsyncVincereClient(max_in_flight=args.concurrency,
+                                    rate_limiter=AdaptiveRateLimiter(initial_rate=args.initial_rate, max_rate=args.max_rate), cache=cache)
+        print("\nAuthenticating with Vincere...")
+        await client.get_token()
+        print("Authenticated successfully!\n")
+    except Exception as e:
+        print(f"Error initializing Vincere client: {e}")
+        return iter(()), 0, 0
+
+    try:
+        with phase(DETAIL):
+            return await fetch_all_placements_async(client, args.jobs_file, journal, args.limit,
+                                                    all_jobs=args.all_jobs, resume=args.resume)
+    finally:
+        await client.close()
+
+
 def main():
     """Main execution"""
     parser = argparse.ArgumentParser(description='Pull all placements from Vincere with fee details')
@@ -371,34 +631,77 @@ def main():
     parser.add_argument('--jobs-file', default='output/vincere-jobs-raw.json', help='Path to raw jobs JSON file')
     parser.add_argument('--limit', type=int, help='Limit number of jobs to process')
     parser.add_argument('--all-jobs', action='store_true', help='Check ALL jobs for placements, not just filled ones')
+    parser.add_argument('--resume', action='store_true', help='Resume from checkpoint if available')
+    parser.add_argument('--checkpoint-file', default='.vincere-placements-checkpoint.jsonl', help='Checkpoint journal path (JSONL), relative to --output-dir')
+    parser.add_argument('--workers', type=int, default=1, help='Concurrent placement list and detail fetches (default: 1)')
+    parser.add_argument('--pool-size', type=int, help=f'Max keep-alive connections per host (default: max(2 * workers, {DEFAULT_POOL_MAXSIZE}))')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio client (requires aiohttp)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_IN_FLIGHT, help=f'Max in-flight requests in --async mode (default: {DEFAULT_MAX_IN_FLIGHT})')
+    parser.add_argument('--http-cache', nargs='?', const=DEFAULT_RESPONSE_CACHE, metavar='DIR',
+                        help=f'Cache GET responses on disk (default dir: {DEFAULT_RESPONSE_CACHE}; also enabled by VINCERE_HTTP_CACHE)')
+    parser.add_argument('--cache-ttl', action='append', metavar='PATTERN=SECONDS',
+                        help="Override how long responses whose URL matches PATTERN (regex) are served from the cache; 'none' disables caching for it. Repeatable")
+    parser.add_argument('--initial-rate', type=float, default=DEFAULT_INITIAL_RATE, help=f'Starting request rate, req/s; it doubles every second until the first 429 (default: {DEFAULT_INITIAL_RATE:g})')
+    parser.add_argument('--max-rate', type=float, default=DEFAULT_MAX_RATE, help=f'Upper bound for the adaptive request rate, req/s (default: {DEFAULT_MAX_RATE:g})')
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profile(args.profile)
+
+    try:
+        cache = open_response_cache(args.http_cache, args.cache_ttl)
+    except ValueError as e:
+        parser.error(str(e))
 
     print("="*60)
     print("Vincere Placement Pull Script")
     print("="*60)
 
-    # Initialize client
-    try:
-        client = VincereClient()
-        print("\nAuthenticating with Vincere...")
-        client.authenticate()
-        print("Authenticated successfully!\n")
-    except Exception as e:
-        print(f"Error initializing Vincere client: {e}")
-        return
+    journal = CheckpointJournal(os.path.join(args.output_dir, args.checkpoint_file))
 
-    # Fetch all placements
-    all_placements = fetch_all_placements(client, args.jobs_file, args.limit, all_jobs=args.all_jobs)
+    if args.use_async:
+        placements, found, failed_jobs = asyncio.run(pull_placements_async(args, journal, cache))
+    else:
+        # Initialize client
+        try:
+            pool_size = args.pool_size or max(2 * args.workers, DEFAULT_POOL_MAXSIZE)
+            client = VincereClient(pool_maxsize=pool_size,
+                                   rate_limiter=AdaptiveRateLimiter(initial_rate=args.initial_rate, max_rate=args.max_rate), cache=cache)
+            print("\nAuthenticating with Vincere...")
+            client.get_token()
+            print("Authenticated successfully!\n")
+        except Exception as e:
+            print(f"Error initializing Vincere client: {e}")
+            return
+
+        # Fetch all placements
+        with phase(DETAIL):
+            placements, found, failed_jobs = fetch_all_placements(
+                client, args.jobs_file, journal, args.limit, all_jobs=args.all_jobs,
+                workers=args.workers, resume=args.resume,
+            )
+
+    if cache:
+        print(cache.summary())
 
-    if not all_placements:
+    if not found:
         print("No placements found.")
         return
 
-    # Save results
-    save_results(all_placements, args.output_dir)
-
-    # Print summary
-    print_summary(all_placements)
+    # Save results (streamed from the checkpoint journal)
+    with phase(MAPPING):
+        save_results(placements, args.output_dir)
+
+    if failed_jobs:
+        # Keep the journal so a rerun only fetches the jobs that failed
+        print(f"\n⚠ {failed_jobs} jobs had errors; kept checkpoint {journal.path}")
+        print(f"  Rerun with --resume to fetch only those jobs")
+    elif journal.exists():
+        # Remove checkpoint journal on successful completion
+        journal.remove()
+        print(f"\n✓ Removed checkpoint file (completed successfully)")
+
+    # Print summary, reading the saved placements back one at a time
+    print_summary(iter_records(os.path.join(args.output_dir, 'vincere-placements-raw.json')))
 
     print("\nDone!")
 
@@ -0,0 +1,126 @@
+"""
+Streaming reader/writer for the raw Vincere dumps
+
+vincere-jobs-raw.json and vincere-placements-raw.json stay plain JSON arrays,
+because other tools (e.g. apps/web/scripts/import-vincere-contacts.ts) parse
+them as JSON. They are written one record per line and read back one record
+at a time, so neither side ever holds the whole file in memory.
+
+iter_records() accepts any JSON array, including the older indent=2 dumps.
+"""
+
+import os
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+READ_CHUNK_SIZE = 1 << 16  # 64 KiB
+
+
+class RawRecordWriter:
+    """Write records to a JSON array file, one record per line
+
+    Writes go to a temp file, which replaces the target on a clean close.
+
+        with RawRecordWriter(path) as writer:
+            for record in records:
+                writer.write(record)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = path + '.tmp'
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'RawRecordWriter':
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._file = open(self.temp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+        return self
+
+    def write(self, record: Any):
+        separator = '\n' if self.count == 0 else ',\n'
+        self._file.write(separator + json.dumps(record, ensure_ascii=False, default=str))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self.temp_path)
+            return False
+        self._file.write('\n]\n')
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+        return False
+
+
+def write_records(path: str, records: Iterable[Any]) -> int:
+    """Stream records into a JSON array file. Returns the number written."""
+    with RawRecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+def iter_records(path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill(min_size: int) -> bool:
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            # Drop consumed text so the buffer only holds the current record
+            buffer = buffer[pos:]
+            pos = 0
+            chunk = f.read(max(chunk_size, min_size))
+            if not chunk:
+                eof = True
+                return False
+            buffer += chunk
+            return True
+
+        def skip(chars: str) -> Optional[str]:
+            """Advance past `chars`; return the next character (None at EOF)"""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill(chunk_size):
+                    return None
+
+        if skip(' \t\r\n\ufeff') != '[':
+            raise ValueError(f'{path} is not a JSON array')
+        pos += 1
+
+        while True:
+            next_char = skip(' \t\r\n,')
+            if next_char is None:
+                raise ValueError(f'{path}: unexpected end of file')
+            if next_char == ']':
+                return
+
+            want = chunk_size
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                    # A scalar that ends exactly at the buffer edge may be cut short
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                if not fill(want):
+                    continue
+                want *= 2  # Grow reads geometrically for very large records
+
+            pos = end
+            yield record
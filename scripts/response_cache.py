@@ -0,0 +1,179 @@
+"""
+On-disk HTTP response cache for Vincere GETs
+
+Used by VincereClient / AsyncVincereClient when a ResponseCache is passed in
+(the pull scripts' --http-cache option, or VINCERE_HTTP_CACHE). Each cached
+response is one JSON file under the cache directory, named by a hash of the
+URL, holding the body and the ETag / Last-Modified validators.
+
+How long a response may be served without asking Vincere depends on the
+first TTL pattern matching the URL (see DEFAULT_TTLS). Once that expires, the
+next GET is sent with If-None-Match / If-Modified-Since when validators were
+stored; a 304 refreshes the entry without transferring the body. Patterns
+with a TTL of None are never cached (search results drive incremental
+syncs and must always be live).
+
+Entries are written atomically, so one cache directory can be shared by
+concurrent threads and runs. Delete the directory to clear it.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_RESPONSE_CACHE = '~/.cache/lighthouse-network/vincere-responses'
+
+DAY = 24 * 60 * 60
+
+# (URL regex, seconds a response is served without revalidation); first match wins
+DEFAULT_TTLS: List[Tuple[str, Optional[float]]] = [
+    (r'/position/search', None),  # Listing pages shift as jobs change
+    (r'/placement/\d+$', 7 * DAY),  # Historic placements are effectively immutable
+    (r'/position/\d+/placements$', DAY),
+    (r'/position/\d+/customfields$', DAY),
+    (r'/position/\d+$', DAY),
+]
+DEFAULT_TTL: Optional[float] = 0  # Anything else: always revalidate
+
+
+class CachedResponse:
+    """One stored response"""
+
+    def __init__(self, url: str, entry: Dict[str, Any], ttl: float):
+        self.url = url
+        self.entry = entry
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.entry['stored_at'] < self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this response"""
+        headers = {}
+        if self.entry.get('etag'):
+            headers['If-None-Match'] = self.entry['etag']
+        if self.entry.get('last_modified'):
+            headers['If-Modified-Since'] = self.entry['last_modified']
+        return headers
+
+    def json(self) -> Any:
+        text = self.entry['body']
+        return json.loads(text) if text else {}
+
+
+class ResponseCache:
+    """URL-keyed response store with per-pattern TTLs"""
+
+    def __init__(self, directory: str, ttls: Sequence[Tuple[str, Optional[float]]] = DEFAULT_TTLS,
+                 default_ttl: Optional[float] = DEFAULT_TTL):
+        self.directory = os.path.expanduser(directory)
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.default_ttl = default_ttl
+        self.hits = 0  # Served without a request
+        self.revalidated = 0  # 304 Not Modified
+        self.stored = 0  # Full responses written
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Stored response for a cacheable URL (fresh or not), or None"""
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return None
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url:
+            return None
+        return CachedResponse(url, entry, ttl)
+
+    def hit(self, cached: CachedResponse) -> Any:
+        """Serve a fresh response"""
+        with self._lock:
+            self.hits += 1
+        return cached.json()
+
+    def store(self, url: str, body: str, headers: Mapping[str, str]):
+        """Save a 200 response, unless the URL isn't cacheable or the server forbids it"""
+        if self.ttl_for(url) is None or 'no-store' in headers.get('Cache-Control', ''):
+            return
+        self._write(url, {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body': body,
+        })
+        with self._lock:
+            self.stored += 1
+
+    def refresh(self, cached: CachedResponse, headers: Mapping[str, str]) -> Any:
+        """Handle a 304: restart the entry's TTL and serve the stored body"""
+        entry = dict(cached.entry, stored_at=time.time())
+        entry['etag'] = headers.get('ETag') or entry.get('etag')
+        entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+        self._write(cached.url, entry)
+        with self._lock:
+            self.revalidated += 1
+        return cached.json()
+
+    def expire(self, url: str):
+        """Force the next GET of `url` to revalidate (e.g. the resource is known to have changed)"""
+        cached = self.lookup(url)
+        if cached is not None:
+            self._write(url, dict(cached.entry, stored_at=0))
+
+    def _write(self, url: str, entry: Dict[str, Any]):
+        path = self._path(url)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_file = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_file, path)
+        except OSError as e:
+            print(f"  Warning: Could not write response cache entry {path}: {e}")
+
+    def summary(self) -> str:
+        return (f"HTTP cache: {self.hits} served locally, {self.revalidated} revalidated (304), "
+                f"{self.stored} fetched and stored")
+
+
+def parse_ttl_overrides(values: Optional[List[str]]) -> List[Tuple[str, Optional[float]]]:
+    """Parse --cache-ttl PATTERN=SECONDS options ('none' disables caching for a pattern)"""
+    overrides = []
+    for value in values or []:
+        pattern, sep, seconds = value.rpartition('=')
+        if not sep or not pattern:
+            raise ValueError(f'Expected PATTERN=SECONDS, got {value!r}')
+        overrides.append((pattern, None if seconds.lower() == 'none' else float(seconds)))
+    return overrides
+
+
+def open_response_cache(directory: Optional[str], ttl_overrides: Optional[List[str]] = None) -> Optional[ResponseCache]:
+    """Cache for the pull scripts' --http-cache / --cache-ttl options
+
+    Falls back to VINCERE_HTTP_CACHE when no directory is given; returns None
+    (caching off) when neither is set. Overrides are checked before the
+    default patterns.
+    """
+    directory = directory or os.getenv('VINCERE_HTTP_CACHE')
+    if not directory:
+        return None
+    return ResponseCache(directory, parse_ttl_overrides(ttl_overrides) + DEFAULT_TTLS)
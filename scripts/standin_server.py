@@ -0,0 +1,1394 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Vincere API and Supabase, for offline load tests
+
+One local port serves everything the pull scripts and Bubble importers talk to:
+
+    POST /oauth2/token                       Vincere auth (any credentials work)
+    GET  /api/v2/position/search/...         Vincere job search
+    GET  /api/v2/position/{id}               ... job detail, /customfields, /placements
+    GET  /api/v2/placement/{id}
+    GET  /api/v2/candidate/search/...
+    *    /rest/v1/{table}                    PostgREST subset (candidates, documents)
+    POST /rest/v1/rpc/{function}             bulk_upsert_bubble_candidates, is_document_file_shared
+    POST /storage/v1/object/list/{bucket}    Storage listing
+    POST /storage/v1/object/{bucket}/{path}  Storage upload
+    *    /storage/v1/upload/resumable[/id]   TUS uploads (resumable_upload.py)
+    GET  /cdn/{bytes}/{name}                 Bubble file downloads (filler bytes)
+    GET  /cdn/jpeg/{w}x{h}/{name}            ... or a real JPEG (needs Pillow)
+    GET  /__stats                            Request counts, latency, injected faults, bytes in/out
+
+Start it and export the variables it prints (VINCERE_AUTH_URL,
+VINCERE_API_BASE_URL, NEXT_PUBLIC_SUPABASE_URL, ...); the scripts then run
+unchanged against it:
+
+    python scripts/standin_server.py --jobs 10000 --seed-db 5000 --latency 40 --rate-429 0.02
+
+Vincere responses come from one of:
+
+  - a synthetic dataset generated from --seed, sized by --jobs / --candidates
+    (the same seed always produces the same data), or
+  - --replay DIR: responses captured earlier with --record DIR, which proxies
+    every Vincere call to the real API using the caller's own credentials and
+    saves each successful GET (tokens are never written to disk).
+
+Supabase is emulated in memory rather than replayed: the importers read back
+what they wrote (existence checks, keyset pagination, upserts), so it needs
+state. That state lasts as long as the process. --seed-db pre-fills the
+candidates table with synthetic_email() addresses, the same ones the
+synthetic Vincere candidates use.
+
+Faults: --latency / --jitter delay every request; --rate-429 and --rate-401
+make that fraction of requests fail with 429 (and Retry-After) or 401;
+--token-ttl expires issued Vincere tokens. --faults-on picks which services
+the injected failures apply to (Vincere only by default).
+
+Standard library only. StandinServer can also be started in-process.
+"""
+
+import io
+import os
+import re
+import csv
+import json
+import time
+import uuid
+import bisect
+import base64
+import random
+import shlex
+import hashlib
+import argparse
+import mimetypes
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+try:
+    from PIL import Image
+except ImportError:  # Only needed for /cdn/jpeg/
+    Image = None
+
+DEFAULT_PORT = 8787
+DEFAULT_JOBS = 500
+DEFAULT_CANDIDATES = 1000
+DEFAULT_TOKEN_TTL = 3600
+DEFAULT_RETRY_AFTER = 1  # Seconds, sent with injected 429s
+MAX_SEARCH_PAGE_SIZE = 100
+
+UPSTREAM_AUTH_URL = 'https://id.vincere.io/oauth2/token'
+UPSTREAM_API_BASE_URL = 'https://lighthouse-careers.vincere.io/api/v2'
+UPSTREAM_TIMEOUT = 60
+
+VINCERE_PREFIX = '/api/v2'
+FAULT_SERVICES = ('vincere', 'supabase', 'storage', 'cdn')
+
+# Every synthetic date is relative to this, so a seed always yields the same data
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+POSITIONS = [
+    'Captain', 'Chief Officer', 'Second Officer', 'Bosun', 'Deckhand', 'Chief Engineer',
+    'Second Engineer', 'ETO', 'Chief Stewardess', 'Stewardess', 'Head Chef', 'Sous Chef',
+    'Crew Chef', 'Purser', 'Masseuse', 'Nanny',
+]
+YACHTS = [
+    'M/Y Aurora', 'M/Y Solaris', 'S/Y Meltemi', 'M/Y Odyssey', 'M/Y Calypso', 'S/Y Zephyr',
+    'M/Y Halcyon', 'M/Y Serenity', 'M/Y Polaris', 'S/Y Mistral', 'M/Y Artemis', 'M/Y Leviathan',
+]
+JOB_STATUSES = {1: 'Draft', 2: 'Open', 3: 'Closed', 4: 'Filled'}
+
+# Same keys as KNOWN_JOB_FIELD_KEYS in pull-vincere-jobs.py
+CUSTOM_FIELDS = [
+    ('f8b2c1ddc995fb699973598e449193c3', 'Yacht', 'TEXT'),
+    ('3c580f529de2e205114090aa08e10f7a', 'Requirements', 'TEXT'),
+    ('9a214be2a25d61d1add26dca93aef45a', 'Start Date', 'DATE'),
+    ('b8a75c8b68fb5c85fb083aac4bbbed94', 'Itinerary', 'TEXT'),
+    ('035ca080627c6bac4e59e6fc6750a5b6', 'Salary', 'TEXT'),
+    ('24a44070b5d77ce92fb018745ddbe374', 'Program', 'COMBO_BOX'),
+    ('ecac1d20eb2b26a248837610935d9b92', 'Holiday Package', 'TEXT'),
+    ('c980a4f92992081ead936fb8a358fb79', 'Contract Type', 'COMBO_BOX'),
+]
+
+
+def synthetic_email(i: int) -> str:
+    """Email of synthetic candidate i (1-based), shared by Vincere, --seed-db and benchmark CSVs"""
+    return f'candidate{i}@example.com'
+
+
+def fake_service_key(role: str = 'service_role') -> str:
+    """A JWT-shaped key: supabase-py checks the format but the stand-in never verifies it"""
+    def part(obj: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b'=').decode()
+    return f"{part({'alg': 'HS256', 'typ': 'JWT'})}.{part({'iss': 'standin', 'role': role})}.standin"
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Reply:
+    """One HTTP response"""
+
+    def __init__(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    @classmethod
+    def json(cls, status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> 'Reply':
+        return cls(status, json.dumps(obj).encode(), {'Content-Type': 'application/json', **(headers or {})})
+
+
+# ============================================================================
+# VINCERE
+# ============================================================================
+
+def _search_fields(path: str) -> Optional[List[str]]:
+    """The fl= list of a /search/fl=a,b;sort=... path, or None for all fields"""
+    match = re.search(r'/fl=([^;/?]+)', path)
+    return match.group(1).split(',') if match else None
+
+
+def _page(query: Dict[str, str], total: int) -> range:
+    start = max(0, int(query.get('start') or 0))
+    limit = min(MAX_SEARCH_PAGE_SIZE, max(1, int(query.get('limit') or 25)))
+    return range(start, min(total, start + limit))
+
+
+class SyntheticVincere:
+    """Deterministic fake Vincere data: `jobs` positions and `candidates` candidates"""
+
+    def __init__(self, jobs: int = DEFAULT_JOBS, candidates: int = DEFAULT_CANDIDATES, seed: int = 0):
+        self.jobs = jobs
+        self.candidates = candidates
+        self.seed = seed
+
+    def _rng(self, kind: str, i: int) -> random.Random:
+        return random.Random(f'{self.seed}:{kind}:{i}')
+
+    def job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        if not 1 <= job_id <= self.jobs:
+            return None
+        rng = self._rng('job', job_id)
+        status_id = 2 if rng.random() < 0.6 else rng.choice([1, 3, 4])
+        company = rng.randrange(len(YACHTS))
+        created = EPOCH + timedelta(days=rng.randrange(700), seconds=rng.randrange(86400))
+        opened = created + timedelta(days=rng.randrange(14))
+        return {
+            'id': job_id,
+            'job_title': rng.choice(POSITIONS),
+            'company_id': 1000 + company,
+            'company_name': YACHTS[company],
+            'contact_id': 5000 + rng.randrange(200),
+            'status_id': status_id,
+            'status': JOB_STATUSES[status_id],
+            'job_status': JOB_STATUSES[status_id].upper(),
+            'open_date': _iso(opened) if status_id != 1 else None,
+            'close_date': _iso(opened + timedelta(days=90)) if status_id in (3, 4) else None,
+            'closed_job': status_id in (3, 4),
+            'private_job': rng.random() < 0.1,
+            'industry_id': 28884,
+            'created_date': _iso(created),
+            'last_update': _iso(created + timedelta(days=rng.randrange(60), seconds=rng.randrange(86400))),
+        }
+
+    def custom_fields(self, job_id: int) -> List[Dict[str, Any]]:
+        rng = self._rng('customfields', job_id)
+        fields = []
+        for key, name, field_type in CUSTOM_FIELDS:
+            if rng.random() < 0.2:
+                continue  # Not every job fills every field
+            field = {'key': key, 'name': name, 'type': field_type}
+            if field_type == 'DATE':
+                field['date_value'] = _iso(EPOCH + timedelta(days=rng.randrange(900)))
+            elif field_type == 'COMBO_BOX':
+                field['field_values'] = sorted(rng.sample(range(1, 12), rng.randint(1, 3)))
+            else:
+                field['field_value'] = f'{name} for job {job_id}'
+            fields.append(field)
+        return fields
+
+    def placement_count(self, job_id: int) -> int:
+        job = self.job(job_id)
+        if not job or job['status_id'] != 2:
+            return 0
+        return self._rng('placements', job_id).choice([0, 0, 1, 1, 2, 3])
+
+    def placement_refs(self, job_id: int) -> List[Dict[str, Any]]:
+        rng = self._rng('placements', job_id)
+        return [
+            {'placement_id': job_id * 10 + k, 'position_id': job_id,
+             'candidate_id': 1 + rng.randrange(max(1, self.candidates))}
+            for k in range(self.placement_count(job_id))
+        ]
+
+    def placement(self, placement_id: int) -> Optional[Dict[str, Any]]:
+        job_id, k = divmod(placement_id, 10)
+        if k >= self.placement_count(job_id):
+            return None
+        ref = self.placement_refs(job_id)[k]
+        rng = self._rng('placement', placement_id)
+        start = EPOCH + timedelta(days=rng.randrange(900))
+        salary = rng.randrange(30, 180) * 1000
+        return {
+            'id': placement_id,
+            'position_id': job_id,
+            'application_source_id': ref['candidate_id'],
+            'application_id': placement_id * 3,
+            'placement_status': 1,
+            'start_date': _iso(start),
+            'end_date': _iso(start + timedelta(days=365)) if rng.random() < 0.5 else None,
+            'currency': rng.choice(['eur', 'eur', 'usd', 'gbp']),
+            'annual_salary': salary,
+            'salary_rate_per_month': round(salary / 12, 2),
+            'profit': round(salary * 0.1, 2),
+            'job_type': 'PERMANENT',
+            'employment_type': 'FULL_TIME',
+            'placed_by': 100 + rng.randrange(8),
+            'insert_timestamp': _iso(start - timedelta(days=30)),
+        }
+
+    def candidate(self, candidate_id: int) -> Dict[str, Any]:
+        rng = self._rng('candidate', candidate_id)
+        return {
+            'id': candidate_id,
+            'primary_email': synthetic_email(candidate_id),
+            'first_name': f'First{candidate_id}',
+            'last_name': f'Last{candidate_id}',
+            'created_date': _iso(EPOCH + timedelta(seconds=candidate_id * 600 + rng.randrange(600))),
+        }
+
+    def _search(self, path: str, query: Dict[str, str], total: int, item: Callable[[int], Dict]) -> Reply:
+        fields = _search_fields(path)
+        items = []
+        for i in _page(query, total):
+            record = item(i)
+            items.append({k: record.get(k) for k in fields} if fields else record)
+        return Reply.json(200, {'result': {'start': int(query.get('start') or 0), 'total': total, 'items': items}})
+
+    def handle(self, method: str, path: str, query_string: str, headers, body: bytes) -> Reply:
+        if method != 'GET':
+            return Reply.json(405, {'error': f'{method} not supported'})
+        query = dict(parse_qsl(query_string))
+
+        if path.startswith('/position/search'):
+            return self._search(path, query, self.jobs, lambda i: self.job(i + 1))
+        if path.startswith('/candidate/search'):
+            # Newest first, as sort=created_date desc asks
+            return self._search(path, query, self.candidates, lambda i: self.candidate(self.candidates - i))
+
+        match = re.fullmatch(r'/position/(\d+)(/customfields|/placements)?', path)
+        if match:
+            job_id = int(match.group(1))
+            if self.job(job_id) is None:
+                return Reply.json(404, {'errors': [f'Position {job_id} not found']})
+            if match.group(2) == '/customfields':
+                return Reply.json(200, self.custom_fields(job_id))
+            if match.group(2) == '/placements':
+                return Reply.json(200, self.placement_refs(job_id))
+            return Reply.json(200, self.job(job_id))
+
+        match = re.fullmatch(r'/placement/(\d+)', path)
+        if match:
+            placement = self.placement(int(match.group(1)))
+            if placement is None:
+                return Reply.json(404, {'errors': [f'Placement {match.group(1)} not found']})
+            return Reply.json(200, placement)
+
+        return Reply.json(404, {'errors': [f'No stand-in route for {path}']})
+
+
+class Recordings:
+    """Recorded Vincere GET responses, one JSON file per path+query"""
+
+    KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}.json')
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('key') == key else None
+
+    def save(self, key: str, reply: Reply):
+        path = self._path(key)
+        entry = {
+            'key': key,
+            'status': reply.status,
+            'headers': {k: v for k, v in reply.headers.items() if k in self.KEPT_HEADERS},
+            'body': reply.body.decode('utf-8', errors='replace'),
+            'recorded_at': _now(),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_file = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_file, path)
+
+
+def _recording_key(path: str, query_string: str) -> str:
+    return f'{path}?{query_string}' if query_string else path
+
+
+class ReplayVincere:
+    """Serves responses saved by RecordingVincere"""
+
+    def __init__(self, recordings: Recordings):
+        self.recordings = recordings
+        self.missing = 0
+
+    def handle(self, method: str, path: str, query_string: str, headers, body: bytes) -> Reply:
+        entry = self.recordings.load(_recording_key(path, query_string)) if method == 'GET' else None
+        if entry is None:
+            self.missing += 1
+            return Reply.json(404, {'errors': [f'Not recorded: {method} {path}']})
+        return Reply(entry['status'], entry['body'].encode(), entry['headers'])
+
+
+class RecordingVincere:
+    """Proxies to the real Vincere API and saves every successful GET"""
+
+    HOP_HEADERS = {'host', 'connection', 'keep-alive', 'accept-encoding', 'content-length',
+                   'transfer-encoding', 'te', 'upgrade', 'proxy-connection'}
+
+    def __init__(self, recordings: Recordings, api_base_url: str = UPSTREAM_API_BASE_URL,
+                 auth_url: str = UPSTREAM_AUTH_URL):
+        self.recordings = recordings
+        self.api_base_url = api_base_url.rstrip('/')
+        self.auth_url = auth_url
+        self.recorded = 0
+
+    def forward(self, method: str, url: str, headers, body: bytes) -> Reply:
+        request = urllib.request.Request(
+            url,
+            data=body if method in ('POST', 'PUT', 'PATCH') else None,
+            method=method,
+            headers={k: v for k, v in headers.items() if k.lower() not in self.HOP_HEADERS},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as resp:
+                return Reply(resp.status, resp.read(), dict(resp.headers))
+        except urllib.error.HTTPError as e:
+            return Reply(e.code, e.read(), dict(e.headers))
+        except urllib.error.URLError as e:
+            return Reply.json(502, {'errors': [f'Upstream unreachable: {e.reason}']})
+
+    def authenticate(self, headers, body: bytes) -> Reply:
+        return self.forward('POST', self.auth_url, headers, body)
+
+    def handle(self, method: str, path: str, query_string: str, headers, body: bytes) -> Reply:
+        key = _recording_key(path, query_string)
+        reply = self.forward(method, f'{self.api_base_url}{key}', headers, body)
+        if method == 'GET' and reply.status == 200:
+            self.recordings.save(key, reply)
+            self.recorded += 1
+        return reply
+
+
+class TokenIssuer:
+    """Tokens handed out by the stand-in's /oauth2/token"""
+
+    def __init__(self, ttl: float = DEFAULT_TOKEN_TTL):
+        self.ttl = ttl
+        self._issued: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def issue(self) -> Dict[str, Any]:
+        token = f'standin-{uuid.uuid4().hex}'
+        with self._lock:
+            self._issued[token] = time.time()
+        return {'id_token': token, 'access_token': token, 'token_type': 'Bearer', 'expires_in': int(self.ttl)}
+
+    def valid(self, token: Optional[str]) -> bool:
+        with self._lock:
+            issued_at = self._issued.get(token or '')
+        return issued_at is not None and time.time() - issued_at < self.ttl
+
+
+# ============================================================================
+# SUPABASE: POSTGREST SUBSET
+# ============================================================================
+
+class RestError(Exception):
+    """A PostgREST-style error response"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+
+    def reply(self) -> Reply:
+        return Reply.json(self.status, {'code': self.code, 'details': self.details, 'hint': None, 'message': self.message})
+
+
+def _text(value: Any) -> Optional[str]:
+    """A value as PostgREST compares it: text, with JSON for objects"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _compare(a: str, b: str) -> int:
+    try:
+        x, y = float(a), float(b)
+    except ValueError:
+        x, y = a, b
+    return (x > y) - (x < y)
+
+
+def _like(pattern: str, flags: int = 0) -> 're.Pattern':
+    regex = ''.join(
+        '.*' if ch in '*%' else '.' if ch == '_' else re.escape(ch)
+        for ch in pattern
+    )
+    return re.compile(regex, flags | re.DOTALL)
+
+
+class Column:
+    """A column reference: 'email', 'metadata->>source', 'metadata->tags'"""
+
+    def __init__(self, ref: str):
+        parts = re.split(r'(->>|->)', ref)
+        self.ref = ref
+        self.name = parts[0]
+        self.keys = parts[2::2]
+        self.as_text = len(parts) > 1 and parts[-2] == '->>'
+
+    @property
+    def alias(self) -> str:
+        return self.keys[-1] if self.keys else self.name
+
+    def value(self, row: Dict[str, Any]) -> Any:
+        value = row.get(self.name)
+        for key in self.keys:
+            value = value.get(key) if isinstance(value, dict) else None
+        return _text(value) if self.as_text else value
+
+
+OPERATORS: Dict[str, Callable[[str, Any], bool]] = {
+    'eq': lambda a, b: a == b,
+    'neq': lambda a, b: a != b,
+    'gt': lambda a, b: _compare(a, b) > 0,
+    'gte': lambda a, b: _compare(a, b) >= 0,
+    'lt': lambda a, b: _compare(a, b) < 0,
+    'lte': lambda a, b: _compare(a, b) <= 0,
+    'like': lambda a, b: b.fullmatch(a) is not None,
+    'ilike': lambda a, b: b.fullmatch(a) is not None,
+    'in': lambda a, b: a in b,
+}
+
+
+class Filter:
+    """One `column=[not.]op.value` query parameter"""
+
+    def __init__(self, column: str, expression: str):
+        self.column = Column(column)
+        self.negate = expression.startswith('not.')
+        if self.negate:
+            expression = expression[4:]
+        self.op, _, value = expression.partition('.')
+        if self.op != 'is' and self.op not in OPERATORS:
+            raise RestError(400, 'PGRST100', f'"{self.op}" is not an operator the stand-in supports')
+        self.raw = value
+        if self.op == 'in':
+            inner = value[1:-1] if value.startswith('(') and value.endswith(')') else value
+            self.value = set(next(csv.reader([inner]), []))
+        elif self.op == 'like':
+            self.value = _like(value)
+        elif self.op == 'ilike':
+            self.value = _like(value, re.IGNORECASE)
+        else:
+            self.value = value
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        value = self.column.value(row)
+        if self.op == 'is':
+            if self.value == 'null':
+                result = value is None
+            elif self.value in ('true', 'false'):
+                result = _text(value) == self.value
+            else:
+                result = False
+            return result != self.negate
+        if value is None:
+            return False  # SQL NULL: neither matches nor fails to match
+        return OPERATORS[self.op](_text(value), self.value) != self.negate
+
+    def index_keys(self) -> Optional[List[str]]:
+        """Lower-cased values an index lookup can narrow this filter to, if any"""
+        if self.negate or self.column.keys:
+            return None
+        if self.op == 'eq':
+            return [self.raw.lower()]
+        if self.op == 'ilike' and not re.search(r'[*%_]', self.raw):
+            return [self.raw.lower()]
+        if self.op == 'in':
+            return [v.lower() for v in self.value]
+        return None
+
+
+class Query:
+    """Parsed PostgREST query string"""
+
+    RESERVED = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+    def __init__(self, params: Sequence[Tuple[str, str]]):
+        self.select: Optional[List[Tuple[str, Column]]] = None  # None: all columns
+        self.filters: List[Filter] = []
+        self.order: List[Tuple[Column, bool]] = []
+        self.limit: Optional[int] = None
+        self.offset = 0
+
+        for key, value in params:
+            if key == 'select':
+                self.select = self._parse_select(value)
+            elif key == 'order':
+                self.order = self._parse_order(value)
+            elif key == 'limit':
+                self.limit = int(value)
+            elif key == 'offset':
+                self.offset = int(value)
+            elif key in ('or', 'and', 'not.or', 'not.and'):
+                raise RestError(400, 'PGRST100', f'Logical "{key}" filters are not supported by the stand-in')
+            elif key not in self.RESERVED:
+                self.filters.append(Filter(key, value))
+
+    @staticmethod
+    def _parse_select(value: str) -> Optional[List[Tuple[str, Column]]]:
+        columns = []
+        for item in value.split(','):
+            item = item.strip()
+            if item == '*':
+                return None
+            if '(' in item:
+                raise RestError(400, 'PGRST100', f'Embedded resources are not supported by the stand-in: {item}')
+            alias, _, ref = item.rpartition(':')
+            column = Column(ref)
+            columns.append((alias or column.alias, column))
+        return columns
+
+    @staticmethod
+    def _parse_order(value: str) -> List[Tuple[Column, bool]]:
+        order = []
+        for item in value.split(','):
+            ref, *modifiers = item.split('.')
+            order.append((Column(ref), 'desc' in modifiers))
+        return order
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        return all(f.matches(row) for f in self.filters)
+
+    def project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self.select is None:
+            return dict(row)
+        return {alias: column.value(row) for alias, column in self.select}
+
+    @property
+    def id_order(self) -> bool:
+        """Results come back in id order (the default, or order=id.asc)"""
+        return not self.order or (len(self.order) == 1 and self.order[0][0].ref == 'id' and not self.order[0][1])
+
+
+class Table:
+    """An in-memory table with lower-cased value indexes and an optional unique key"""
+
+    def __init__(self, name: str, tag: int, indexed: Sequence[str] = (),
+                 unique: Optional[Tuple[str, Callable[[Dict[str, Any]], Optional[str]]]] = None):
+        self.name = name
+        self.tag = tag  # Keeps generated ids distinct between tables
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.ids: List[str] = []  # Sorted
+        self.indexes: Dict[str, Dict[str, set]] = {column: {} for column in ('id', *indexed)}
+        self.unique = unique
+        self.unique_keys: Dict[str, str] = {}
+        self._counter = 0
+
+    def new_id(self) -> str:
+        # Monotonic ids, so insertion order is id order like a time-ordered UUID
+        self._counter += 1
+        return str(uuid.UUID(int=(self.tag << 96) | self._counter))
+
+    def _index(self, row: Dict[str, Any]):
+        for column, index in self.indexes.items():
+            value = _text(row.get(column))
+            if value is not None:
+                index.setdefault(value.lower(), set()).add(row['id'])
+        key = self.unique[1](row) if self.unique else None
+        if key is not None:
+            self.unique_keys[key] = row['id']
+
+    def _unindex(self, row: Dict[str, Any]):
+        for column, index in self.indexes.items():
+            value = _text(row.get(column))
+            if value is not None:
+                index.get(value.lower(), set()).discard(row['id'])
+        key = self.unique[1](row) if self.unique else None
+        if key is not None and self.unique_keys.get(key) == row['id']:
+            del self.unique_keys[key]
+
+    def _check_unique(self, rows: Iterable[Dict[str, Any]]):
+        """Raise 23505 if any row collides with a stored row or another row in `rows`"""
+        if not self.unique:
+            return
+        name, key_of = self.unique
+        seen: Dict[str, str] = {}
+        for row in rows:
+            key = key_of(row)
+            if key is None:
+                continue
+            owner = self.unique_keys.get(key)
+            if (owner is not None and owner != row.get('id')) or key in seen:
+                raise RestError(409, '23505', f'duplicate key value violates unique constraint "{name}"',
+                                f'Key ({key}) already exists.')
+            seen[key] = row.get('id')
+
+    def insert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        now = _now()
+        new_rows = [{'id': self.new_id(), 'created_at': now, 'updated_at': now, **row} for row in rows]
+        for row in new_rows:
+            if row['id'] in self.rows:
+                raise RestError(409, '23505', f'duplicate key value violates unique constraint "{self.name}_pkey"')
+        self._check_unique(new_rows)
+        for row in new_rows:
+            self.rows[row['id']] = row
+            bisect.insort(self.ids, row['id'])
+            self._index(row)
+        return new_rows
+
+    def update(self, rows: List[Dict[str, Any]], values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        now = _now()
+        updated = [{**row, 'updated_at': now, **values, 'id': row['id']} for row in rows]
+        self._check_unique(updated)
+        for old, new in zip(rows, updated):
+            self._unindex(old)
+            self.rows[new['id']] = new
+            self._index(new)
+        return updated
+
+    def delete(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for row in rows:
+            self._unindex(row)
+            del self.rows[row['id']]
+            del self.ids[bisect.bisect_left(self.ids, row['id'])]
+        return rows
+
+    def _scan(self, query: Query) -> Iterable[Dict[str, Any]]:
+        """Rows that may match, in id order, narrowed by an index or an id lower bound"""
+        for f in query.filters:
+            keys = f.index_keys() if f.column.name in self.indexes else None
+            if keys is not None:
+                index = self.indexes[f.column.name]
+                ids = sorted(set().union(*(index.get(key, ()) for key in keys)))
+                return (self.rows[i] for i in ids)
+        start = 0
+        for f in query.filters:
+            if f.column.ref == 'id' and not f.negate and f.op in ('gt', 'gte'):
+                find = bisect.bisect_right if f.op == 'gt' else bisect.bisect_left
+                start = max(start, find(self.ids, f.raw))
+        return (self.rows[i] for i in self.ids[start:])
+
+    def select(self, query: Query, count: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Matching rows (unprojected) after order/offset/limit, and the total if `count`"""
+        matches = (row for row in self._scan(query) if query.matches(row))
+        if query.id_order and not count:
+            end = None if query.limit is None else query.offset + query.limit
+            rows = []
+            for i, row in enumerate(matches):
+                if end is not None and i >= end:
+                    break
+                if i >= query.offset:
+                    rows.append(row)
+            return rows, None
+
+        rows = list(matches)
+        for column, desc in reversed(query.order):
+            rows.sort(key=lambda row: (column.value(row) is None, _text(column.value(row)) or ''), reverse=desc)
+        total = len(rows)
+        end = None if query.limit is None else query.offset + query.limit
+        return rows[query.offset:end], total if count else None
+
+
+def _candidate_email_key(row: Dict[str, Any]) -> Optional[str]:
+    """candidates_email_unique_idx: LOWER(email) among live rows with an email"""
+    email = row.get('email')
+    if not email or row.get('deleted_at') is not None:
+        return None
+    return email.lower()
+
+
+class Database:
+    """The Supabase tables and RPC functions the import scripts use"""
+
+    def __init__(self):
+        self.tables = {
+            'candidates': Table('candidates', 1, indexed=('email', 'vincere_id'),
+                                unique=('candidates_email_unique_idx', _candidate_email_key)),
+            'documents': Table('documents', 2, indexed=('file_path', 'entity_id')),
+        }
+        self.functions: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'bulk_upsert_bubble_candidates': self.bulk_upsert_bubble_candidates,
+            'is_document_file_shared': self.is_document_file_shared,
+        }
+        self.lock = threading.Lock()  # One statement at a time, like a single connection
+
+    def table(self, name: str) -> Table:
+        if name not in self.tables:
+            raise RestError(404, '42P01', f'relation "public.{name}" does not exist')
+        return self.tables[name]
+
+    def seed_candidates(self, count: int):
+        """Pre-fill candidates 1..count with synthetic_email() addresses"""
+        self.tables['candidates'].insert([
+            {'email': synthetic_email(i), 'first_name': f'First{i}', 'last_name': f'Last{i}',
+             'vincere_id': str(i), 'photo_url': None, 'source': 'standin'}
+            for i in range(1, count + 1)
+        ])
+
+    def bulk_upsert_bubble_candidates(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Same contract as migration 080"""
+        table = self.tables['candidates']
+        rows = [dict(row, email=row['email'].lower()) for row in args.get('p_rows') or [] if row.get('email')]
+        emails = [row['email'] for row in rows]
+        if len(set(emails)) != len(emails):
+            raise RestError(500, '21000', 'ON CONFLICT DO UPDATE command cannot affect row a second time')
+
+        inserts, updates, results = [], [], []
+        for row in rows:
+            existing_id = table.unique_keys.get(row['email'])
+            if existing_id is None:
+                inserts.append(row)
+                continue
+            existing = table.rows[existing_id]
+            values = {k: v for k, v in row.items() if k not in ('id', 'email', 'created_at', 'deleted_at')}
+            values['vincere_id'] = row.get('vincere_id') or existing.get('vincere_id')
+            updates.append((existing, values))
+
+        inserted = table.insert(inserts)
+        for existing, values in updates:
+            table.update([existing], values)
+        by_email = {row['email']: (row['id'], 'inserted') for row in inserted}
+        by_email.update({existing['email'].lower(): (existing['id'], 'updated') for existing, _ in updates})
+        for email in emails:
+            candidate_id, operation = by_email[email]
+            results.append({'candidate_email': email, 'candidate_id': candidate_id, 'operation': operation})
+        return results
+
+    def is_document_file_shared(self, args: Dict[str, Any]) -> bool:
+        documents = self.tables['documents']
+        ids = documents.indexes['file_path'].get((args.get('p_file_path') or '').lower(), ())
+        return any(
+            documents.rows[i]['file_path'] == args.get('p_file_path')
+            and i != args.get('p_document_id')
+            and documents.rows[i].get('deleted_at') is None
+            for i in ids
+        )
+
+    def handle(self, method: str, path: str, params: Sequence[Tuple[str, str]], headers, body: bytes) -> Reply:
+        try:
+            with self.lock:
+                return self._handle(method, path, params, headers, body)
+        except RestError as e:
+            return e.reply()
+        except (ValueError, KeyError, TypeError) as e:
+            return RestError(400, 'PGRST102', f'Bad request: {e}').reply()
+
+    def _handle(self, method: str, path: str, params, headers, body: bytes) -> Reply:
+        name = path[len('/rest/v1/'):]
+        prefer = headers.get('Prefer', '')
+        payload = json.loads(body) if body else None
+
+        if name.startswith('rpc/'):
+            function = self.functions.get(name[4:])
+            if function is None or method != 'POST':
+                raise RestError(404, 'PGRST202', f'Could not find the function public.{name[4:]}')
+            return Reply.json(200, function(payload or {}))
+
+        table = self.table(name)
+        query = Query(params)
+        if method in ('GET', 'HEAD'):
+            rows, total = table.select(query, count='count=' in prefer)
+            return self._rows_reply(200, [query.project(row) for row in rows], query, headers, total)
+
+        if method == 'POST':
+            if 'resolution=' in prefer:
+                raise RestError(400, 'PGRST100', 'Upserts are not supported by the stand-in')
+            rows = table.insert(payload if isinstance(payload, list) else [payload])
+        elif method in ('PATCH', 'DELETE'):
+            if not query.filters:
+                # Supabase runs PostgREST with pg-safeupdate
+                raise RestError(400, '21000', f"{'UPDATE' if method == 'PATCH' else 'DELETE'} requires a WHERE clause")
+            matched = table.select(query)[0]
+            rows = table.update(matched, payload or {}) if method == 'PATCH' else table.delete(matched)
+        else:
+            raise RestError(405, 'PGRST117', f'{method} is not supported')
+
+        status = 201 if method == 'POST' else 200
+        if 'return=representation' not in prefer:
+            return Reply(201 if method == 'POST' else 204)
+        return self._rows_reply(status, [query.project(row) for row in rows], query, headers, None)
+
+    @staticmethod
+    def _rows_reply(status: int, rows: List[Dict[str, Any]], query: Query, headers, total: Optional[int]) -> Reply:
+        content_range = f'{query.offset}-{query.offset + len(rows) - 1}' if rows else '*'
+        range_header = {'Content-Range': f"{content_range}/{'*' if total is None else total}"}
+        if 'vnd.pgrst.object' in headers.get('Accept', ''):
+            if len(rows) != 1:
+                raise RestError(406, 'PGRST116', 'JSON object requested, multiple (or no) rows returned',
+                                f'The result contains {len(rows)} rows')
+            return Reply.json(status, rows[0], range_header)
+        return Reply.json(status, rows, range_header)
+
+
+# ============================================================================
+# SUPABASE: STORAGE
+# ============================================================================
+
+def _upload_payload(content_type: str, body: bytes) -> Tuple[bytes, str]:
+    """The file bytes and type of an upload, unwrapping storage3's multipart form"""
+    if not content_type.startswith('multipart/form-data'):
+        return body, content_type or 'application/octet-stream'
+    message = BytesParser(policy=default_policy).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+    )
+    for part in message.iter_parts():
+        if part.get_filename() is not None:
+            return part.get_payload(decode=True) or b'', part.get_content_type()
+    return body, 'application/octet-stream'
+
+
+class Storage:
+    """Buckets of object metadata (sizes and hashes; contents aren't kept)"""
+
+    def __init__(self):
+        # bucket → folder prefix ('' for the root) → {name: object metadata, or None for a subfolder}
+        self.folders: Dict[str, Dict[str, Dict[str, Optional[Dict[str, Any]]]]] = {}
+        self.uploads: Dict[str, Dict[str, Any]] = {}  # TUS upload id → state
+        self.lock = threading.Lock()
+
+    def _get(self, bucket: str, path: str) -> Optional[Dict[str, Any]]:
+        folder, _, name = path.rpartition('/')
+        return self.folders.get(bucket, {}).get(folder, {}).get(name)
+
+    def _put(self, bucket: str, path: str, size: int, sha256: str, content_type: str):
+        folders = self.folders.setdefault(bucket, {})
+        folder, _, name = path.rpartition('/')
+        now = _now()
+        folders.setdefault(folder, {})[name] = {
+            'id': str(uuid.uuid4()),
+            'created_at': now,
+            'updated_at': now,
+            'last_accessed_at': now,
+            'metadata': {'size': size, 'mimetype': content_type, 'eTag': f'"{sha256[:32]}"',
+                         'cacheControl': 'max-age=3600', 'contentLength': size, 'httpStatusCode': 200},
+        }
+        # Register the folder chain up to the root
+        while folder:
+            parent, _, child = folder.rpartition('/')
+            folders.setdefault(parent, {}).setdefault(child, None)
+            folder = parent
+
+    def list(self, bucket: str, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        prefix = (options.get('prefix') or '').strip('/')
+        limit = int(options.get('limit') or 100)
+        offset = int(options.get('offset') or 0)
+        sort = options.get('sortBy') or {}
+        with self.lock:
+            entries = dict(self.folders.get(bucket, {}).get(prefix, {}))
+        names = sorted(entries, reverse=sort.get('order') == 'desc')
+        listing = []
+        for name in names[offset:offset + limit]:
+            meta = entries[name]
+            if meta is None:
+                listing.append({'name': name, 'id': None, 'updated_at': None, 'created_at': None,
+                                'last_accessed_at': None, 'metadata': None})
+            else:
+                listing.append({'name': name, **meta})
+        return listing
+
+    def upload(self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool) -> Reply:
+        with self.lock:
+            if self._get(bucket, path) is not None and not upsert:
+                return Reply.json(400, {'statusCode': '409', 'error': 'Duplicate',
+                                        'message': 'The resource already exists'})
+            self._put(bucket, path, len(data), hashlib.sha256(data).hexdigest(), content_type)
+        return Reply.json(200, {'Key': f'{bucket}/{path}', 'Id': str(uuid.uuid4())})
+
+    def objects(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            totals = {}
+            for bucket, folders in self.folders.items():
+                metas = [meta for entries in folders.values() for meta in entries.values() if meta]
+                totals[bucket] = {'objects': len(metas), 'bytes': sum(m['metadata']['size'] for m in metas)}
+            return totals
+
+    # TUS (https://tus.io/protocols/resumable-upload) as Supabase serves it
+
+    def tus_create(self, base_url: str, headers) -> Reply:
+        metadata = {}
+        for pair in (headers.get('Upload-Metadata') or '').split(','):
+            key, _, value = pair.strip().partition(' ')
+            if key:
+                metadata[key] = base64.b64decode(value).decode() if value else ''
+        bucket, path = metadata.get('bucketName'), metadata.get('objectName')
+        length = headers.get('Upload-Length')
+        if not bucket or not path or length is None:
+            return Reply.json(400, {'error': 'Upload-Length and bucketName/objectName metadata are required'})
+        with self.lock:
+            if self._get(bucket, path) is not None and headers.get('x-upsert') != 'true':
+                return Reply.json(409, {'error': 'Duplicate', 'message': 'The resource already exists'})
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {
+                'bucket': bucket, 'path': path, 'length': int(length), 'offset': 0,
+                'content_type': metadata.get('contentType') or 'application/octet-stream',
+                'hasher': hashlib.sha256(),
+            }
+        return Reply(201, headers={'Location': f'{base_url}/storage/v1/upload/resumable/{upload_id}',
+                                   'Tus-Resumable': '1.0.0'})
+
+    def tus_offset(self, upload_id: str) -> Reply:
+        with self.lock:
+            upload = self.uploads.get(upload_id)
+        if upload is None:
+            return Reply(404)
+        return Reply(200, headers={'Upload-Offset': str(upload['offset']), 'Upload-Length': str(upload['length']),
+                                   'Tus-Resumable': '1.0.0', 'Cache-Control': 'no-store'})
+
+    def tus_patch(self, upload_id: str, headers, chunk: bytes) -> Reply:
+        with self.lock:
+            upload = self.uploads.get(upload_id)
+            if upload is None:
+                return Reply(404)
+            if int(headers.get('Upload-Offset', -1)) != upload['offset']:
+                return Reply(409, headers={'Upload-Offset': str(upload['offset'])})
+            if upload['offset'] + len(chunk) > upload['length']:
+                return Reply(413)
+            upload['hasher'].update(chunk)
+            upload['offset'] += len(chunk)
+            if upload['offset'] == upload['length']:
+                self._put(upload['bucket'], upload['path'], upload['length'],
+                          upload['hasher'].hexdigest(), upload['content_type'])
+            return Reply(204, headers={'Upload-Offset': str(upload['offset']), 'Tus-Resumable': '1.0.0'})
+
+
+# ============================================================================
+# BUBBLE CDN
+# ============================================================================
+
+_jpeg_cache: Dict[Tuple[int, int], bytes] = {}
+
+
+def filler(name: str, size: int) -> bytes:
+    """`size` deterministic, poorly compressible bytes for a file name"""
+    block = b''.join(hashlib.sha256(f'{name}:{i}'.encode()).digest() for i in range(256))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def jpeg_available() -> bool:
+    return Image is not None
+
+
+def synthetic_jpeg(width: int, height: int) -> bytes:
+    key = (width, height)
+    if key not in _jpeg_cache:
+        img = Image.new('RGB', (width, height), (32, 96, 160))
+        for y in range(0, height, 16):
+            img.paste((y * 7 % 256, 128, 255 - y % 256), (0, y, width, min(height, y + 8)))
+        out = io.BytesIO()
+        img.save(out, 'JPEG', quality=90)
+        _jpeg_cache[key] = out.getvalue()
+    return _jpeg_cache[key]
+
+
+def cdn_reply(path: str) -> Reply:
+    match = re.fullmatch(r'/cdn/jpeg/(\d+)x(\d+)/(.+)', path)
+    if match:
+        if not jpeg_available():
+            return Reply.json(501, {'error': 'Pillow is not installed (pip install Pillow)'})
+        return Reply(200, synthetic_jpeg(int(match.group(1)), int(match.group(2))), {'Content-Type': 'image/jpeg'})
+    match = re.fullmatch(r'/cdn/(\d+)/(.+)', path)
+    if not match:
+        return Reply.json(404, {'error': f'No stand-in route for {path}'})
+    name = match.group(2)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    return Reply(200, filler(name, int(match.group(1))), {'Content-Type': content_type})
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class Faults:
+    """Injected latency and failures"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, rate_429: float = 0, rate_401: float = 0,
+                 retry_after: float = DEFAULT_RETRY_AFTER, services: Sequence[str] = ('vincere',), seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_401 = rate_401
+        self.retry_after = retry_after
+        self.services = set(services)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + self.jitter_ms * self._random()) / 1000)
+
+    def inject(self, service: str) -> Optional[Reply]:
+        """A failure to return instead of handling the request, or None"""
+        if service not in self.services:
+            return None
+        roll = self._random()
+        if roll < self.rate_429:
+            return Reply.json(429, {'message': 'Too many requests (injected)'},
+                              {'Retry-After': f'{self.retry_after:g}'})
+        if roll < self.rate_429 + self.rate_401:
+            return Reply.json(401, {'message': 'Unauthorized (injected)'})
+        return None
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (0 when empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+SERVICES = [
+    ('/oauth2/token', 'auth'),
+    (VINCERE_PREFIX + '/', 'vincere'),
+    ('/rest/v1/', 'supabase'),
+    ('/storage/v1/', 'storage'),
+    ('/cdn/', 'cdn'),
+    ('/__stats', 'stats'),
+]
+
+
+def service_for(path: str) -> Optional[str]:
+    for prefix, service in SERVICES:
+        if path.startswith(prefix):
+            return service
+    return None
+
+
+class StandinServer:
+    """The stand-in backend on a ThreadingHTTPServer"""
+
+    def __init__(self, vincere=None, database: Optional[Database] = None, storage: Optional[Storage] = None,
+                 faults: Optional[Faults] = None, tokens: Optional[TokenIssuer] = None,
+                 host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+        self.vincere = vincere or SyntheticVincere()
+        self.database = database or Database()
+        self.storage = storage or Storage()
+        self.faults = faults or Faults()
+        self.tokens = tokens or TokenIssuer()
+        self.httpd = ThreadingHTTPServer((host, port), StandinHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.standin = self
+        self.requests: Dict[str, int] = {}
+        self.injected: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latencies: Dict[str, List[float]] = {}  # Service → seconds per request, as handled here
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def recording(self) -> bool:
+        return isinstance(self.vincere, RecordingVincere)
+
+    def env(self) -> Dict[str, str]:
+        """Environment that points the pull and import scripts at this server"""
+        env = {
+            'VINCERE_AUTH_URL': f'{self.url}/oauth2/token',
+            'VINCERE_API_BASE_URL': f'{self.url}{VINCERE_PREFIX}',
+            'NEXT_PUBLIC_SUPABASE_URL': self.url,
+            'SUPABASE_SERVICE_ROLE_KEY': fake_service_key(),
+        }
+        if not self.recording:
+            # Recording forwards the caller's real credentials; otherwise any will do
+            env.update({
+                'VINCERE_CLIENT_ID': 'standin',
+                'VINCERE_API_KEY': 'standin',
+                'VINCERE_REFRESH_TOKEN': 'standin',
+                'VINCERE_TOKEN_CACHE': '',  # Keep stand-in tokens out of the real token cache
+            })
+        return env
+
+    def count(self, service: str):
+        with self._lock:
+            self.requests[service] = self.requests.get(service, 0) + 1
+
+    def count_fault(self, service: str, status: int):
+        key = f'{service}_{status}'
+        with self._lock:
+            self.injected[key] = self.injected.get(key, 0) + 1
+
+    def finished(self, service: Optional[str], seconds: float, bytes_in: int, bytes_out: int):
+        with self._lock:
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            if service and service != 'stats':
+                self.latencies.setdefault(service, []).append(seconds)
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Request count and p50/p99 latency in ms, per service and for 'all'"""
+        with self._lock:
+            samples = {service: sorted(values) for service, values in self.latencies.items()}
+        samples['all'] = sorted(v for values in samples.values() for v in values)
+        return {
+            service: {'count': len(values), 'p50_ms': percentile(values, 50) * 1000,
+                      'p99_ms': percentile(values, 99) * 1000}
+            for service, values in samples.items() if values
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                'requests': dict(self.requests),
+                'injected': dict(self.injected),
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+            }
+        stats['latency'] = self.latency_summary()
+        with self.database.lock:
+            stats['rows'] = {name: len(table.rows) for name, table in self.database.tables.items()}
+        stats['storage'] = self.storage.objects()
+        if isinstance(self.vincere, ReplayVincere):
+            stats['not_recorded'] = self.vincere.missing
+        if isinstance(self.vincere, RecordingVincere):
+            stats['recorded'] = self.vincere.recorded
+        return stats
+
+    def start(self) -> 'StandinServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='standin-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StandinServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def handle(self, method: str, target: str, headers, body: bytes) -> Reply:
+        url = urlsplit(target)
+        path = url.path
+        service = service_for(path)
+        if service is None:
+            return Reply.json(404, {'error': f'No stand-in route for {path}'})
+        self.count(service)
+        if service == 'stats':
+            return Reply.json(200, self.stats())
+
+        self.faults.delay()
+        if self.recording and service in ('auth', 'vincere'):
+            if service == 'auth':
+                return self.vincere.authenticate(headers, body)
+            return self.vincere.handle(method, path[len(VINCERE_PREFIX):], url.query, headers, body)
+
+        fault = self.faults.inject(service)
+        if fault is not None:
+            self.count_fault(service, fault.status)
+            return fault
+
+        if service == 'auth':
+            return Reply.json(200, self.tokens.issue())
+        if service == 'vincere':
+            token = headers.get('id-token') or (headers.get('Authorization') or '').replace('Bearer ', '')
+            if not self.tokens.valid(token):
+                return Reply.json(401, {'message': 'Invalid or expired token'})
+            return self.vincere.handle(method, path[len(VINCERE_PREFIX):], url.query, headers, body)
+        if service == 'supabase':
+            return self.database.handle(method, path, parse_qsl(url.query, keep_blank_values=True), headers, body)
+        if service == 'storage':
+            return self._storage(method, path, headers, body)
+        return cdn_reply(path)
+
+    def _storage(self, method: str, path: str, headers, body: bytes) -> Reply:
+        if path.startswith('/storage/v1/upload/resumable'):
+            upload_id = path[len('/storage/v1/upload/resumable'):].strip('/')
+            if not upload_id and method == 'POST':
+                return self.storage.tus_create(self.url, headers)
+            if upload_id and method == 'HEAD':
+                return self.storage.tus_offset(upload_id)
+            if upload_id and method == 'PATCH':
+                return self.storage.tus_patch(upload_id, headers, body)
+        match = re.fullmatch(r'/storage/v1/object/list/([^/]+)', path)
+        if match and method == 'POST':
+            return Reply.json(200, self.storage.list(match.group(1), json.loads(body or b'{}')))
+        match = re.fullmatch(r'/storage/v1/object/([^/]+)/(.+)', path)
+        if match and method in ('POST', 'PUT'):
+            data, content_type = _upload_payload(headers.get('Content-Type', ''), body)
+            upsert = method == 'PUT' or headers.get('x-upsert') == 'true'
+            return self.storage.upload(match.group(1), match.group(2), data, content_type, upsert)
+        return Reply.json(404, {'statusCode': '404', 'error': 'not_found', 'message': f'No stand-in route for {method} {path}'})
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, as the clients' pooled sessions expect
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body.extend(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self):
+        started = time.perf_counter()
+        standin = self.server.standin
+        body = self._read_body()
+        try:
+            reply = standin.handle(self.command, self.path, self.headers, body)
+        except Exception as e:  # A stand-in bug shouldn't look like a dropped connection
+            reply = Reply.json(500, {'error': f'{type(e).__name__}: {e}'})
+
+        etag = reply.headers.get('ETag')
+        if reply.status == 200 and self.command == 'GET' and reply.body:
+            if etag is None and reply.headers.get('Content-Type') == 'application/json':
+                etag = reply.headers['ETag'] = f'"{hashlib.md5(reply.body).hexdigest()}"'
+            if etag is not None and self.headers.get('If-None-Match') == etag:
+                reply = Reply(304, headers={'ETag': etag})
+
+        self.send_response(reply.status)
+        for key, value in reply.headers.items():
+            if key.lower() not in ('content-length', 'transfer-encoding', 'connection'):
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(reply.body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(reply.body)
+        standin.finished(service_for(urlsplit(self.path).path), time.perf_counter() - started,
+                         len(body), len(reply.body))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Vincere API and Supabase')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT}; 0 picks a free one)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic data and injected faults')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help=f'Synthetic Vincere jobs (default: {DEFAULT_JOBS})')
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES,
+                        help=f'Synthetic Vincere candidates (default: {DEFAULT_CANDIDATES})')
+    parser.add_argument('--seed-db', type=int, default=0, metavar='N',
+                        help='Pre-fill the Supabase candidates table with synthetic candidates 1..N')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='DIR', help='Proxy Vincere calls to the real API and save the responses in DIR')
+    mode.add_argument('--replay', metavar='DIR', help='Serve Vincere responses recorded with --record')
+    parser.add_argument('--upstream-api-url', default=UPSTREAM_API_BASE_URL, help='Vincere API to record from')
+    parser.add_argument('--upstream-auth-url', default=UPSTREAM_AUTH_URL, help='Vincere auth endpoint to record from')
+    parser.add_argument('--latency', type=float, default=0, metavar='MS', help='Delay added to every request')
+    parser.add_argument('--jitter', type=float, default=0, metavar='MS', help='Extra random delay, up to MS')
+    parser.add_argument('--rate-429', type=float, default=0, metavar='P', help='Fraction of requests answered 429')
+    parser.add_argument('--rate-401', type=float, default=0, metavar='P', help='Fraction of requests answered 401')
+    parser.add_argument('--retry-after', type=float, default=DEFAULT_RETRY_AFTER,
+                        help=f'Retry-After seconds sent with injected 429s (default: {DEFAULT_RETRY_AFTER})')
+    parser.add_argument('--token-ttl', type=float, default=DEFAULT_TOKEN_TTL,
+                        help=f'Seconds an issued Vincere token stays valid (default: {DEFAULT_TOKEN_TTL})')
+    parser.add_argument('--faults-on', default='vincere',
+                        help=f'Comma-separated services that get injected 429s/401s: {",".join(FAULT_SERVICES)} (default: vincere)')
+    args = parser.parse_args()
+
+    services = [s.strip() for s in args.faults_on.split(',') if s.strip()]
+    unknown = set(services) - set(FAULT_SERVICES)
+    if unknown:
+        parser.error(f'Unknown --faults-on service(s): {", ".join(sorted(unknown))}')
+
+    if args.record:
+        vincere = RecordingVincere(Recordings(args.record), args.upstream_api_url, args.upstream_auth_url)
+        source = f'recording to {args.record} from {args.upstream_api_url}'
+    elif args.replay:
+        vincere = ReplayVincere(Recordings(args.replay))
+        source = f'replaying {args.replay}'
+    else:
+        vincere = SyntheticVincere(args.jobs, args.candidates, args.seed)
+        source = f'synthetic: {args.jobs} jobs, {args.candidates} candidates, seed {args.seed}'
+
+    database = Database()
+    if args.seed_db:
+        database.seed_candidates(args.seed_db)
+
+    faults = Faults(args.latency, args.jitter, args.rate_429, args.rate_401, args.retry_after, services, args.seed)
+    server = StandinServer(vincere, database, Storage(), faults, TokenIssuer(args.token_ttl), args.host, args.port)
+
+    print("=" * 60)
+    print("STAND-IN SERVER")
+    print("=" * 60)
+    print(f"Listening on {server.url}")
+    print(f"Vincere: {source}")
+    print(f"Supabase: in memory, {args.seed_db} seeded candidates")
+    print(f"Faults: {args.latency:g}ms + up to {args.jitter:g}ms latency, "
+          f"429 {args.rate_429:.1%}, 401 {args.rate_401:.1%} on {', '.join(services) or 'nothing'}")
+    print(f"Stats: {server.url}/__stats")
+    print("\nPoint the scripts at it with:\n")
+    for key, value in server.env().items():
+        print(f"export {key}={shlex.quote(value)}")
+    print(flush=True)
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,606 @@
+"""
+Shared Vincere API client for the pull scripts
+
+Used by pull-vincere-jobs.py and pull-vincere-placements.py. All requests go
+through one requests.Session, so connections to lighthouse-careers.vincere.io
+are kept alive and reused instead of paying a TCP+TLS handshake per call.
+
+AsyncVincereClient is the asyncio counterpart used by the --async mode of the
+pull scripts. It requires aiohttp (pip install aiohttp).
+
+Both clients pace requests through an AdaptiveRateLimiter, which is also used
+by the Vincere client in apps/web/scripts/bubble_import.py.
+
+Either client can take a ResponseCache (response_cache.py): GETs are then
+served from disk while fresh and revalidated with ETag / Last-Modified
+after that.
+
+Tokens are held in a TokenStore shared by every client in the process, so a
+refresh is single-flight: one caller hits id.vincere.io and the others wait
+for its result. The token is also cached on disk (VINCERE_TOKEN_CACHE,
+default ~/.cache/lighthouse-network/vincere-token.json; set it to an empty
+string to disable), so back-to-back runs skip the auth round-trip.
+"""
+
+import os
+import json
+import time
+import hashlib
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Any, Mapping
+import requests
+from requests.adapters import HTTPAdapter
+
+from profiling import AUTH, phase
+from response_cache import ResponseCache
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for AsyncVincereClient
+    aiohttp = None
+
+# Vincere API URLs (overridable to point the scripts at scripts/standin_server.py)
+AUTH_URL = os.getenv('VINCERE_AUTH_URL') or 'https://id.vincere.io/oauth2/token'
+API_BASE_URL = os.getenv('VINCERE_API_BASE_URL') or 'https://lighthouse-careers.vincere.io/api/v2'
+
+REQUEST_TIMEOUT = 30  # Seconds
+
+# Connection pool defaults
+DEFAULT_POOL_CONNECTIONS = 4  # Number of distinct hosts to keep pools for
+DEFAULT_POOL_MAXSIZE = 10  # Max keep-alive connections per host
+DEFAULT_MAX_IN_FLIGHT = 100  # Max concurrent requests for AsyncVincereClient
+
+# Rate limiting defaults (requests per second)
+DEFAULT_INITIAL_RATE = 10.0
+DEFAULT_MIN_RATE = 0.5
+DEFAULT_MAX_RATE = 100.0
+MAX_RATE_LIMIT_RETRIES = 5  # Retries for a single request that keeps getting 429
+
+TOKEN_REFRESH_MARGIN = 300  # Refresh tokens 5 minutes before they expire
+DEFAULT_TOKEN_CACHE = '~/.cache/lighthouse-network/vincere-token.json'
+
+
+def url_for(endpoint: str) -> str:
+    """Absolute URL for an API endpoint (full URLs are passed through)"""
+    return endpoint if endpoint.startswith('http') else f'{API_BASE_URL}{endpoint}'
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to server feedback (AIMD)
+
+    - Every request takes one token; callers wait when the bucket is empty.
+    - Until the first 429 the limiter is in slow start: each successful
+      response adds 1 request/second, which doubles the rate every second
+      of traffic, so it finds the server's limit (or max_rate) quickly.
+    - After that, each successful response raises the rate additively, by
+      about `increase` requests/second per second of traffic.
+    - A 429 multiplies the rate by `decrease` and pauses all callers for
+      Retry-After (or one token interval when the header is missing).
+    - X-RateLimit-Remaining: 0 with an X-RateLimit-Reset header also pauses
+      callers until the reset.
+
+    Thread-safe, and usable from coroutines via acquire_async(). One
+    instance can be shared by several clients.
+    """
+
+    def __init__(self, initial_rate: float = DEFAULT_INITIAL_RATE, min_rate: float = DEFAULT_MIN_RATE,
+                 max_rate: float = DEFAULT_MAX_RATE, increase: float = 0.5, decrease: float = 0.5,
+                 burst: Optional[float] = None, slow_start: bool = True):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_start = slow_start
+        self.burst = burst or max(1.0, self.rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled_count = 0
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token if a request may be sent now (returns 0), else return how long to wait first
+
+        Nothing is reserved while waiting: a 429 or quota reset that arrives
+        in the meantime applies to sleeping callers too, because they check
+        again when they wake.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # No credit builds up during a pause, so it doesn't end in a burst
+            refill_from = max(self.updated, min(self.blocked_until, now))
+            self.tokens = min(self.burst, self.tokens + (now - refill_from) * self.rate)
+            self.updated = now
+            if self.blocked_until > now:
+                return self.blocked_until - now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent"""
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def on_success(self, headers: Optional[Mapping[str, str]] = None):
+        """Record a successful response: ramp the rate back up"""
+        with self._lock:
+            if self.slow_start:
+                self.rate = min(self.max_rate, self.rate + 1.0)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self.burst = max(1.0, self.rate)
+            self._apply_quota_headers(headers)
+
+    def on_throttle(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Record a 429: back off multiplicatively. Returns the pause in seconds."""
+        with self._lock:
+            self.throttled_count += 1
+            self.slow_start = False
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.burst = max(1.0, self.rate)
+            self.tokens = min(self.tokens, 0.0)
+            retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self._apply_quota_headers(headers)
+            return pause
+
+    def _apply_quota_headers(self, headers: Optional[Mapping[str, str]]):
+        """Pause until the quota window resets when the server says none is left"""
+        if not headers:
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            if int(float(remaining)) > 0:
+                return
+            reset_value = float(reset)
+        except ValueError:
+            return
+        # Reset is either seconds-until-reset or an epoch timestamp
+        seconds = reset_value - time.time() if reset_value > 1e9 else reset_value
+        if seconds > 0:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                   pool_block: bool = False) -> requests.Session:
+    """Create a requests.Session with a keep-alive connection pool
+
+    Args:
+        pool_connections: Number of per-host pools to cache.
+        pool_maxsize: Max connections kept open per host. Should be at least
+            the number of concurrent workers, otherwise extra connections are
+            opened and discarded.
+        pool_block: If True, callers wait for a free connection instead of
+            opening a throwaway one when the per-host limit is reached.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class TokenStore:
+    """Process-wide holder for one Vincere token, optionally persisted to disk
+
+    `lock` serializes refreshes across threads. Callers re-check
+    valid_token() after acquiring it, so only the first waiter refreshes.
+    """
+
+    def __init__(self, cache_key: str, cache_path: Optional[str] = None):
+        self.cache_key = cache_key
+        self.cache_path = Path(cache_path).expanduser() if cache_path else None
+        self.token: Optional[str] = None
+        self.expires_at: float = 0  # Epoch seconds, already minus the refresh margin
+        self.lock = threading.Lock()
+        self._load()
+
+    def valid_token(self) -> Optional[str]:
+        """Return the cached token if it has not expired"""
+        if self.token and time.time() < self.expires_at:
+            return self.token
+        return None
+
+    def set(self, token: str, expires_in: int):
+        """Store a freshly issued token"""
+        self.token = token
+        self.expires_at = time.time() + expires_in - TOKEN_REFRESH_MARGIN
+        self._save()
+
+    def invalidate(self, stale_token: Optional[str]):
+        """Drop the token after a 401, unless another caller already replaced it"""
+        with self.lock:
+            if self.token == stale_token:
+                self.token = None
+                self.expires_at = 0
+                self._save()
+
+    def _read_cache_file(self) -> Dict:
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        if not self.cache_path:
+            return
+        entry = self._read_cache_file().get(self.cache_key) or {}
+        self.token = entry.get('token')
+        self.expires_at = entry.get('expires_at', 0)
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        try:
+            cache = self._read_cache_file()
+            cache[self.cache_key] = {'token': self.token, 'expires_at': self.expires_at}
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per writer: several processes may share the cache file
+            temp_file = f'{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.replace(temp_file, self.cache_path)
+        except OSError as e:
+            print(f"  Warning: Could not write token cache {self.cache_path}: {e}")
+
+
+_token_stores: Dict[str, TokenStore] = {}
+_token_stores_lock = threading.Lock()
+
+
+def get_token_store(*credentials: str) -> TokenStore:
+    """Get the shared TokenStore for a set of credentials
+
+    The cache key is a hash of the credentials, so the raw refresh token is
+    never written to disk.
+    """
+    cache_key = hashlib.sha256('\0'.join(credentials).encode()).hexdigest()[:32]
+    with _token_stores_lock:
+        if cache_key not in _token_stores:
+            cache_path = os.getenv('VINCERE_TOKEN_CACHE', DEFAULT_TOKEN_CACHE)
+            _token_stores[cache_key] = TokenStore(cache_key, cache_path or None)
+        return _token_stores[cache_key]
+
+
+class VincereClient:
+    """Vincere API client with authentication"""
+
+    def __init__(self, client_id: Optional[str] = None, api_key: Optional[str] = None, refresh_token: Optional[str] = None,
+                 session: Optional[requests.Session] = None, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 timeout: int = REQUEST_TIMEOUT, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.client_id = client_id or os.getenv('VINCERE_CLIENT_ID')
+        self.api_key = api_key or os.getenv('VINCERE_API_KEY')
+        self.refresh_token = refresh_token or os.getenv('VINCERE_REFRESH_TOKEN')
+
+        if not self.client_id or not self.api_key or not self.refresh_token:
+            raise ValueError(
+                'Missing required Vincere configuration. '
+                'Ensure VINCERE_CLIENT_ID, VINCERE_API_KEY, and VINCERE_REFRESH_TOKEN are set.'
+            )
+
+        self.session = session or create_session(pool_maxsize=pool_maxsize)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.cache = cache
+        self.tokens = get_token_store(self.client_id, self.refresh_token, 'id_token')
+
+    def close(self):
+        """Close the underlying connection pool"""
+        self.session.close()
+
+    def authenticate(self) -> str:
+        """Authenticate with Vincere using OAuth2 refresh token flow"""
+        data = {
+            'client_id': self.client_id,
+            'grant_type': 'refresh_token',
+            'refresh_token': self.refresh_token,
+        }
+
+        with phase(AUTH):
+            response = self.session.post(AUTH_URL, data=data, timeout=self.timeout)
+
+        if not response.ok:
+            raise Exception(f'Vincere authentication failed: {response.status_code} {response.text}')
+
+        result = response.json()
+
+        if 'id_token' not in result:
+            raise Exception('No id_token returned from Vincere authentication')
+
+        # Token expires in 1 hour, but refresh 5 minutes early
+        self.tokens.set(result['id_token'], result.get('expires_in', 3600))
+
+        return result['id_token']
+
+    def get_token(self) -> str:
+        """Get a valid token, refreshing if necessary (single-flight across threads)"""
+        token = self.tokens.valid_token()
+        if token:
+            return token
+        with self.tokens.lock:
+            # Another thread may have refreshed while we waited
+            return self.tokens.valid_token() or self.authenticate()
+
+    def request(self, method: str, endpoint: str, data: Optional[Dict] = None, retry_on_auth_error: bool = True) -> Any:
+        """Make an authenticated request to the Vincere API"""
+        url = url_for(endpoint)
+
+        cached = self.cache.lookup(url) if self.cache and method == 'GET' else None
+        if cached and cached.fresh:
+            return self.cache.hit(cached)
+
+        token = self.get_token()
+
+        headers = {
+            'accept': 'application/json',
+            'id-token': token,
+            'x-api-key': self.api_key,
+        }
+        if cached:
+            headers.update(cached.validators())
+
+        kwargs = {}
+        if data and method in ('POST', 'PUT', 'PATCH'):
+            headers['Content-Type'] = 'application/json'
+            kwargs['json'] = data
+
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            response = self.session.request(method, url, headers=headers, timeout=self.timeout, **kwargs)
+            if response.status_code != 429:
+                break
+            # Rate limited - back off and retry
+            self.rate_limiter.on_throttle(response.headers)
+
+        if response.status_code != 429:
+            self.rate_limiter.on_success(response.headers)
+
+        # Handle token expiration - retry once with fresh token
+        if response.status_code == 401 and retry_on_auth_error:
+            self.tokens.invalidate(token)
+            return self.request(method, endpoint, data, retry_on_auth_error=False)
+
+        if response.status_code == 304 and cached:
+            return self.cache.refresh(cached, response.headers)
+
+        if not response.ok:
+            raise Exception(f'Vincere API error: {response.status_code} {response.reason} - {response.text}')
+
+        text = response.text
+        if self.cache and method == 'GET':
+            self.cache.store(url, text, response.headers)
+
+        # Handle empty responses
+        if not text:
+            return {}
+
+        return response.json()
+
+    def get(self, endpoint: str) -> Any:
+        """GET request helper"""
+        return self.request('GET', endpoint)
+
+    def post(self, endpoint: str, data: Optional[Dict] = None) -> Any:
+        """POST request helper"""
+        return self.request('POST', endpoint, data)
+
+
+class AsyncVincereClient:
+    """Asyncio Vincere API client with the same surface as VincereClient
+
+    All coroutines must run on the same event loop. The aiohttp session is
+    created lazily on first use, and the number of concurrent requests is
+    capped by max_in_flight.
+    """
+
+    def __init__(self, client_id: Optional[str] = None, api_key: Optional[str] = None, refresh_token: Optional[str] = None,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, timeout: int = REQUEST_TIMEOUT,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None, cache: Optional[ResponseCache] = None):
+        if aiohttp is None:
+            raise RuntimeError('aiohttp package not installed. Run: pip install aiohttp')
+
+        self.client_id = client_id or os.getenv('VINCERE_CLIENT_ID')
+        self.api_key = api_key or os.getenv('VINCERE_API_KEY')
+        self.refresh_token = refresh_token or os.getenv('VINCERE_REFRESH_TOKEN')
+
+        if not self.client_id or not self.api_key or not self.refresh_token:
+            raise ValueError(
+                'Missing required Vincere configuration. '
+                'Ensure VINCERE_CLIENT_ID, VINCERE_API_KEY, and VINCERE_REFRESH_TOKEN are set.'
+            )
+
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.cache = cache
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.tokens = get_token_store(self.client_id, self.refresh_token, 'id_token')
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.max_in_flight)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self.session
+
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _request_token(self) -> Dict:
+        """POST the OAuth2 refresh token flow and return the token response"""
+        data = {
+            'client_id': self.client_id,
+            'grant_type': 'refresh_token',
+            'refresh_token': self.refresh_token,
+        }
+
+        with phase(AUTH):
+            async with self._get_session().post(AUTH_URL, data=data) as response:
+                text = await response.text()
+                if response.status >= 400:
+                    raise Exception(f'Vincere authentication failed: {response.status} {text}')
+
+        result = json.loads(text)
+
+        if 'id_token' not in result:
+            raise Exception('No id_token returned from Vincere authentication')
+
+        return result
+
+    async def authenticate(self) -> str:
+        """Authenticate with Vincere using OAuth2 refresh token flow"""
+        result = await self._request_token()
+        # Token expires in 1 hour, but refresh 5 minutes early (the cache write runs off the loop)
+        await asyncio.to_thread(self.tokens.set, result['id_token'], result.get('expires_in', 3600))
+        return result['id_token']
+
+    async def get_token(self) -> str:
+        """Get a valid token, refreshing if necessary (single-flight across coroutines and threads)
+
+        The re-check and refresh run in a worker thread under the TokenStore
+        lock, the same critical section VincereClient uses, so sync and async
+        clients sharing a store refresh once between them and the token
+        cache file I/O stays off the event loop. The token request itself
+        still runs on this loop.
+        """
+        token = self.tokens.valid_token()
+        if token:
+            return token
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        # Only one coroutine per client occupies a thread waiting for the store lock
+        async with self._refresh_lock:
+            return await asyncio.to_thread(self._refresh_token_locked, asyncio.get_running_loop())
+
+    def _refresh_token_locked(self, loop: asyncio.AbstractEventLoop) -> str:
+        """Worker-thread half of get_token(): re-check, request and save under the store lock"""
+        with self.tokens.lock:
+            # Another client or coroutine may have refreshed while we waited
+            token = self.tokens.valid_token()
+            if token:
+                return token
+            result = asyncio.run_coroutine_threadsafe(self._request_token(), loop).result()
+            # Token expires in 1 hour, but refresh 5 minutes early
+            self.tokens.set(result['id_token'], result.get('expires_in', 3600))
+            return result['id_token']
+
+    async def request(self, method: str, endpoint: str, data: Optional[Dict] = None, retry_on_auth_error: bool = True) -> Any:
+        """Make an authenticated request to the Vincere API"""
+        url = url_for(endpoint)
+
+        cached = self.cache.lookup(url) if self.cache and method == 'GET' else None
+        if cached and cached.fresh:
+            return self.cache.hit(cached)
+
+        token = await self.get_token()
+
+        headers = {
+            'accept': 'application/json',
+            'id-token': token,
+            'x-api-key': self.api_key,
+        }
+        if cached:
+            headers.update(cached.validators())
+
+        kwargs = {}
+        if data and method in ('POST', 'PUT', 'PATCH'):
+            headers['Content-Type'] = 'application/json'
+            kwargs['json'] = data
+
+        session = self._get_session()
+        for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire_async()
+            async with self._semaphore:
+                async with session.request(method, url, headers=headers, **kwargs) as response:
+                    status = response.status
+                    reason = response.reason
+                    response_headers = response.headers
+                    text = await response.text()
+            if status != 429:
+                break
+            # Rate limited - back off and retry
+            self.rate_limiter.on_throttle(response_headers)
+
+        if status != 429:
+            self.rate_limiter.on_success(response_headers)
+
+        # Handle token expiration - retry once with fresh token
+        if status == 401 and retry_on_auth_error:
+            await asyncio.to_thread(self.tokens.invalidate, token)
+            return await self.request(method, endpoint, data, retry_on_auth_error=False)
+
+        if status == 304 and cached:
+            return self.cache.refresh(cached, response_headers)
+
+        if status >= 400:
+            raise Exception(f'Vincere API error: {status} {reason} - {text}')
+
+        if self.cache and method == 'GET':
+            self.cache.store(url, text, response_headers)
+
+        # Handle empty responses
+        if not text:
+            return {}
+
+        return json.loads(text)
+
+    async def get(self, endpoint: str) -> Any:
+        """GET request helper"""
+        return await self.request('GET', endpoint)
+
+    async def post(self, endpoint: str, data: Optional[Dict] = None) -> Any:
+        """POST request helper"""
+        return await self.request('POST', endpoint, data)
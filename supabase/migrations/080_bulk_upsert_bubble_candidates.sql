@@ -0,0 +1,156 @@
+-- ============================================================================
+-- BULK UPSERT FOR BUBBLE CANDIDATE IMPORTS
+-- Migration: 080_bulk_upsert_bubble_candidates.sql
+-- Description: Upsert a batch of candidates in one statement, keyed on
+--              candidates_email_unique_idx (migration 023)
+-- ============================================================================
+-- PostgREST's upsert can only target plain column constraints, not the
+-- LOWER(email) partial index, so apps/web/scripts/bubble_import.py calls this
+-- function once per batch instead of doing a SELECT + INSERT/UPDATE per row.
+--
+-- p_rows is a JSON array of candidate objects as built by
+-- map_bubble_to_candidate(). Emails must be unique within a batch (ON CONFLICT
+-- cannot touch the same row twice in one statement).
+--
+-- Returns one row per input row: the lowercased email, the candidate id, and
+-- whether it was inserted or updated. Any failing row aborts the whole
+-- statement; the caller retries that batch row by row to attribute the error.
+
+CREATE OR REPLACE FUNCTION bulk_upsert_bubble_candidates(p_rows JSONB)
+RETURNS TABLE (
+  candidate_email TEXT,
+  candidate_id UUID,
+  operation TEXT
+) AS $$
+BEGIN
+  RETURN QUERY
+  INSERT INTO candidates AS c (
+    vincere_id,
+    first_name,
+    last_name,
+    email,
+    phone,
+    date_of_birth,
+    gender,
+    nationality,
+    second_nationality,
+    marital_status,
+    primary_position,
+    position_category,
+    preferred_regions,
+    preferred_contract_types,
+    preferred_yacht_types,
+    preferred_yacht_size_min,
+    preferred_yacht_size_max,
+    desired_salary_min,
+    desired_salary_max,
+    salary_currency,
+    has_stcw,
+    has_eng1,
+    highest_license,
+    second_license,
+    has_b1b2,
+    has_schengen,
+    is_smoker,
+    has_visible_tattoos,
+    tattoo_description,
+    is_couple,
+    partner_name,
+    partner_position,
+    couple_position,
+    availability_status,
+    available_from,
+    source
+  )
+  SELECT
+    r.vincere_id,
+    r.first_name,
+    r.last_name,
+    LOWER(r.email),
+    r.phone,
+    r.date_of_birth,
+    r.gender,
+    r.nationality,
+    r.second_nationality,
+    r.marital_status,
+    r.primary_position,
+    r.position_category,
+    r.preferred_regions,
+    r.preferred_contract_types,
+    r.preferred_yacht_types,
+    r.preferred_yacht_size_min,
+    r.preferred_yacht_size_max,
+    r.desired_salary_min,
+    r.desired_salary_max,
+    r.salary_currency,
+    r.has_stcw,
+    r.has_eng1,
+    r.highest_license,
+    r.second_license,
+    r.has_b1b2,
+    r.has_schengen,
+    r.is_smoker,
+    r.has_visible_tattoos,
+    r.tattoo_description,
+    r.is_couple,
+    r.partner_name,
+    r.partner_position,
+    r.couple_position,
+    r.availability_status,
+    r.available_from,
+    r.source
+  FROM jsonb_populate_recordset(NULL::candidates, p_rows) AS r
+  WHERE r.email IS NOT NULL
+    AND r.email != ''
+  ON CONFLICT ((LOWER(email)))
+    WHERE email IS NOT NULL
+      AND email != ''
+      AND deleted_at IS NULL
+  DO UPDATE SET
+    -- Don't overwrite vincere_id if already set; email is the conflict key
+    vincere_id = COALESCE(EXCLUDED.vincere_id, c.vincere_id),
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    phone = EXCLUDED.phone,
+    date_of_birth = EXCLUDED.date_of_birth,
+    gender = EXCLUDED.gender,
+    nationality = EXCLUDED.nationality,
+    second_nationality = EXCLUDED.second_nationality,
+    marital_status = EXCLUDED.marital_status,
+    primary_position = EXCLUDED.primary_position,
+    position_category = EXCLUDED.position_category,
+    preferred_regions = EXCLUDED.preferred_regions,
+    preferred_contract_types = EXCLUDED.preferred_contract_types,
+    preferred_yacht_types = EXCLUDED.preferred_yacht_types,
+    preferred_yacht_size_min = EXCLUDED.preferred_yacht_size_min,
+    preferred_yacht_size_max = EXCLUDED.preferred_yacht_size_max,
+    desired_salary_min = EXCLUDED.desired_salary_min,
+    desired_salary_max = EXCLUDED.desired_salary_max,
+    salary_currency = EXCLUDED.salary_currency,
+    has_stcw = EXCLUDED.has_stcw,
+    has_eng1 = EXCLUDED.has_eng1,
+    highest_license = EXCLUDED.highest_license,
+    second_license = EXCLUDED.second_license,
+    has_b1b2 = EXCLUDED.has_b1b2,
+    has_schengen = EXCLUDED.has_schengen,
+    is_smoker = EXCLUDED.is_smoker,
+    has_visible_tattoos = EXCLUDED.has_visible_tattoos,
+    tattoo_description = EXCLUDED.tattoo_description,
+    is_couple = EXCLUDED.is_couple,
+    partner_name = EXCLUDED.partner_name,
+    partner_position = EXCLUDED.partner_position,
+    couple_position = EXCLUDED.couple_position,
+    availability_status = EXCLUDED.availability_status,
+    available_from = EXCLUDED.available_from,
+    source = EXCLUDED.source,
+    updated_at = NOW()
+  -- xmax is 0 only for freshly inserted tuples
+  RETURNING
+    LOWER(c.email),
+    c.id,
+    CASE WHEN c.xmax = 0 THEN 'inserted' ELSE 'updated' END::TEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_upsert_bubble_candidates IS
+  'Batch insert-or-update of Bubble candidates keyed on candidates_email_unique_idx. Returns candidate_email, candidate_id and operation per row.';
@@ -0,0 +1,35 @@
+-- ============================================================================
+-- SHARED DOCUMENT FILES
+-- Migration: 081_shared_document_files.sql
+-- Description: Support several documents rows pointing at one storage object
+-- ============================================================================
+-- apps/web/scripts/bubble_import_documents.py dedupes imported files by
+-- SHA-256: identical bytes are uploaded once and later rows point their
+-- file_path at the existing object. Deleting one of those documents must not
+-- remove the object from storage while other live rows still use it.
+
+-- Lookups by file_path (import existence checks, shared-file checks)
+CREATE INDEX IF NOT EXISTS idx_documents_file_path ON documents(file_path);
+
+-- ============================================================================
+-- HELPER FUNCTION: Is this document's file used by another live document?
+-- ============================================================================
+-- SECURITY DEFINER so the answer doesn't depend on which rows the caller can
+-- see under RLS (a candidate can't see other candidates' documents).
+
+CREATE OR REPLACE FUNCTION is_document_file_shared(
+  p_file_path TEXT,
+  p_document_id UUID
+)
+RETURNS BOOLEAN AS $$
+  SELECT EXISTS (
+    SELECT 1
+    FROM documents
+    WHERE file_path = p_file_path
+      AND id != p_document_id
+      AND deleted_at IS NULL
+  );
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+COMMENT ON FUNCTION is_document_file_shared IS
+  'True if another non-deleted document uses the same file_path. Check before removing a document''s storage object.';